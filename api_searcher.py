@@ -2,21 +2,28 @@ import os
 import re
 import json
 import asyncio
+import hashlib
+import logging
+import threading
+from metadata_cache import PROVIDER_TTLS, cached
 from xai_sdk import Client
 from xai_sdk.chat import user, system
 
+logger = logging.getLogger("bot.api")
+
 try:
     from googletrans import Translator
 except Exception as e:
-    print(f"[WARN] googletrans import failed; translation fallback disabled: {e}")
+    logger.warning("googletrans import failed; translation fallback disabled: %s", e)
     Translator = None
 
 TMDB_API_KEY = os.getenv("TMDB_API")
 GROK_API_KEY = os.getenv("GROK_API_KEY")
+GROK_MODEL = os.getenv("GROK_MODEL", "grok-3-mini-fast")
 try:
     translator = Translator() if Translator else None
 except Exception as e:
-    print(f"[WARN] googletrans init failed; translation fallback disabled: {e}")
+    logger.warning("googletrans init failed; translation fallback disabled: %s", e)
     translator = None
 
 MUSICBRAINZ_BASE_URL = "https://musicbrainz.org/ws/2"
@@ -45,7 +52,7 @@ async def translate_to_korean(text):
         result = await translator.translate(text, dest='ko')
         return result.text
     except Exception as e:
-        print(f"Google Translate failed: {e}")
+        logger.warning("Google Translate failed: %s", e)
         # 번역 실패 시 원본 반환
         return text
     
@@ -59,15 +66,17 @@ async def translate_to_english(text):
         result = await translator.translate(text, dest='en')
         return result.text
     except Exception as e:
-        print(f"Google Translate failed: {e}")
+        logger.warning("Google Translate failed: %s", e)
         # 번역 실패 시 원본 반환
         return text
 
 class ContentSearcher:
     _musicbrainz_lock = asyncio.Lock()
     _musicbrainz_last_request = 0.0
+    _tmdb_semaphore = asyncio.Semaphore(5)
 
     @staticmethod
+    @cached('tmdb_search')
     async def _search_tmdb_direct(session, name):
         """TMDB에서 직접 검색 (내부용)"""
         search_url = f"https://api.themoviedb.org/3/search/multi?api_key={TMDB_API_KEY}&query={name}&language=ko-KR"
@@ -165,9 +174,6 @@ class ContentSearcher:
                 title = item.get('name', name)
                 year = item['first_air_date'][:4] if item.get('first_air_date') else "N/A"
 
-            if not await is_korean(title):
-                title = await translate_to_korean(title)
-
             poster_path = item.get('poster_path')
             img_url = f"https://image.tmdb.org/t/p/w500{poster_path}" if poster_path else None
 
@@ -181,44 +187,105 @@ class ContentSearcher:
                 'media_type': media_type
             })
 
+        # 후보 제목 번역은 동시에 처리
+        titles = await asyncio.gather(*(translate_to_korean(movie['title']) for movie in movies))
+        for movie, title in zip(movies, titles):
+            movie['title'] = title
+
         return movies
 
     @staticmethod
+    async def _fetch_tmdb_details(session, tmdb_id, media_type):
+        """상세 + 크레딧 + 시청 가능 OTT를 append_to_response로 한 번에 조회.
+        Returns: {'director', 'watch_providers'} 또는 None
+        """
+        endpoint = 'movie' if media_type == 'movie' else 'tv'
+        append = 'credits,watch/providers' if media_type == 'movie' else 'watch/providers'
+        url = (
+            f"https://api.themoviedb.org/3/{endpoint}/{tmdb_id}"
+            f"?api_key={TMDB_API_KEY}&language=ko-KR&append_to_response={append}"
+        )
+        try:
+            async with ContentSearcher._tmdb_semaphore:
+                async with session.get(url) as response:
+                    if response.status != 200:
+                        logger.warning(
+                            "_fetch_tmdb_details() status=%s, tmdb_id=%s",
+                            response.status, tmdb_id
+                        )
+                        return None
+                    details = await response.json()
+        except Exception as e:
+            logger.error("_fetch_tmdb_details() 실패: %s", e)
+            return None
+
+        director = None
+        if media_type == 'movie':
+            crew = (details.get('credits') or {}).get('crew', [])
+            director_info = next((member for member in crew if member.get('job') == 'Director'), None)
+            if director_info:
+                director = director_info.get('name')
+        else:
+            creators = details.get('created_by', [])
+            if creators:
+                director = creators[0]['name']
+
+        return {
+            'director': director or "정보 없음",
+            'watch_providers': ContentSearcher._parse_watch_providers(details.get('watch/providers') or {}),
+        }
+
+    @staticmethod
+    async def hydrate_tmdb_results(session, movies):
+        """검색 후보 전체의 감독/제작자와 OTT 정보를 동시에 채운다."""
+        details = await asyncio.gather(*(
+            ContentSearcher._fetch_tmdb_details(session, movie['tmdb_id'], movie['media_type'])
+            for movie in movies
+        ))
+        for movie, detail in zip(movies, details):
+            if detail:
+                movie['director'] = detail['director']
+                movie['watch_providers'] = detail['watch_providers']
+        return movies
+
+    @staticmethod
+    @cached('tmdb_search')
     async def search_tmdb_multiple(session, name):
         """TMDB에서 최대 5개 검색 결과 반환"""
-        print(f"[DEBUG] search_tmdb_multiple() 시작 - name: {name}")
+        logger.debug("search_tmdb_multiple() 시작 - name: %s", name)
 
         # 1차: 직접 검색
-        print(f"[DEBUG] search_tmdb_multiple() [1차] TMDB 직접 검색 시도...")
+        logger.debug("search_tmdb_multiple() [1차] TMDB 직접 검색 시도...")
         movies = await ContentSearcher._search_tmdb_multi_direct(session, name)
 
         if movies:
-            print(f"[DEBUG] search_tmdb_multiple() [1차] 성공 - {len(movies)}개 결과 반환")
-            return movies
+            logger.debug("search_tmdb_multiple() [1차] 성공 - %s개 결과 반환", len(movies))
+            return await ContentSearcher.hydrate_tmdb_results(session, movies)
 
-        print(f"[DEBUG] search_tmdb_multiple() [1차] 실패")
+        logger.debug("search_tmdb_multiple() [1차] 실패")
 
         # 2차: 번역 후 재검색
-        print(f"[DEBUG] search_tmdb_multiple() [2차] 영문 번역 시도...")
+        logger.debug("search_tmdb_multiple() [2차] 영문 번역 시도...")
         translated = await translate_to_english(name)
         if translated and translated != name:
-            print(f"[DEBUG] search_tmdb_multiple() [2차] 번역 성공: {translated} -> TMDB 재검색...")
+            logger.debug("search_tmdb_multiple() [2차] 번역 성공: %s -> TMDB 재검색...", translated)
             movies = await ContentSearcher._search_tmdb_multi_direct(session, translated)
             if movies:
-                print(f"[DEBUG] search_tmdb_multiple() [2차] 성공 - {len(movies)}개 결과 반환")
-                return movies
-            print(f"[DEBUG] search_tmdb_multiple() [2차] TMDB 재검색 실패")
+                logger.debug("search_tmdb_multiple() [2차] 성공 - %s개 결과 반환", len(movies))
+                return await ContentSearcher.hydrate_tmdb_results(session, movies)
+            logger.debug("search_tmdb_multiple() [2차] TMDB 재검색 실패")
         else:
-            print(f"[DEBUG] search_tmdb_multiple() [2차] 번역 실패 또는 동일: {translated}")
+            logger.debug("search_tmdb_multiple() [2차] 번역 실패 또는 동일: %s", translated)
 
-        print(f"[DEBUG] search_tmdb_multiple() 완료 - 반환값 없음")
+        logger.debug("search_tmdb_multiple() 완료 - 반환값 없음")
         return []
 
     @staticmethod
+    @cached('tmdb_credits')
     async def _fetch_director_info(session, tmdb_id, media_type):
         """특정 TMDB ID의 감독/제작자 정보 조회"""
         try:
-            print(f"[DEBUG] _fetch_director_info() 시작 - tmdb_id: {tmdb_id}, media_type: {media_type}")
+            logger.debug("_fetch_director_info() 시작 - tmdb_id: %s, media_type: %s", tmdb_id, media_type)
 
             if media_type == 'movie':
                 credits_url = f"https://api.themoviedb.org/3/movie/{tmdb_id}/credits?api_key={TMDB_API_KEY}&language=ko-KR"
@@ -228,7 +295,7 @@ class ContentSearcher:
 
                 if director_info:
                     director = director_info.get('name')
-                    print(f"[DEBUG] _fetch_director_info() 감독 발견: {director}")
+                    logger.debug("_fetch_director_info() 감독 발견: %s", director)
                     return director
             else:
                 details_url = f"https://api.themoviedb.org/3/tv/{tmdb_id}?api_key={TMDB_API_KEY}&language=ko-KR"
@@ -237,22 +304,28 @@ class ContentSearcher:
                 creators = details.get('created_by', [])
                 if creators:
                     director = creators[0]['name']
-                    print(f"[DEBUG] _fetch_director_info() 제작자 발견: {director}")
+                    logger.debug("_fetch_director_info() 제작자 발견: %s", director)
                     return director
 
-            print(f"[DEBUG] _fetch_director_info() 정보 없음")
+            logger.debug("_fetch_director_info() 정보 없음")
             return "정보 없음"
         except Exception as e:
-            print(f"[ERROR] _fetch_director_info() 실패: {e}")
+            logger.error("_fetch_director_info() 실패: %s", e)
             return "정보 없음"
 
     @staticmethod
+    @cached('tmdb_providers')
     async def fetch_watch_providers(session, tmdb_id, media_type):
         """TMDB Watch Providers API로 한국(KR) OTT 정보 조회"""
         endpoint = 'movie' if media_type == 'movie' else 'tv'
         url = f"https://api.themoviedb.org/3/{endpoint}/{tmdb_id}/watch/providers?api_key={TMDB_API_KEY}"
         async with session.get(url) as response:
             data = await response.json()
+        return ContentSearcher._parse_watch_providers(data)
+
+    @staticmethod
+    def _parse_watch_providers(data):
+        """watch/providers 응답에서 한국(KR) OTT 정보만 추출."""
         kr_data = data.get('results', {}).get('KR')
         if not kr_data:
             return None
@@ -318,24 +391,28 @@ class ContentSearcher:
                     if response.status in (429, 503):
                         retry_after = response.headers.get('Retry-After')
                         delay = int(retry_after) if retry_after and retry_after.isdigit() else 2
-                        print(f"[WARN] MusicBrainz rate/temporary error {response.status}; retry after {delay}s")
+                        logger.warning(
+                            "MusicBrainz rate/temporary error %s; retry after %ss",
+                            response.status, delay
+                        )
                         await asyncio.sleep(delay)
                     else:
-                        print(f"[WARN] MusicBrainz API error: status {response.status}")
+                        logger.warning("MusicBrainz API error: status %s", response.status)
                         return None
 
                 async with session.get(url, params=request_params, headers=headers) as retry_response:
                     ContentSearcher._musicbrainz_last_request = loop.time()
                     if retry_response.status == 200:
                         return await retry_response.json()
-                    print(f"[WARN] MusicBrainz retry failed: status {retry_response.status}")
+                    logger.warning("MusicBrainz retry failed: status %s", retry_response.status)
                     return None
             except Exception as e:
                 ContentSearcher._musicbrainz_last_request = loop.time()
-                print(f"[ERROR] MusicBrainz API request failed: {e}")
+                logger.error("MusicBrainz API request failed: %s", e)
                 return None
 
     @staticmethod
+    @cached('coverart')
     async def fetch_music_cover_art(session, release_group_id=None, release_id=None):
         """Cover Art Archive에서 대표 커버 URL을 가져온다."""
         candidates = []
@@ -351,7 +428,7 @@ class ContentSearcher:
                     if response.status == 404:
                         continue
                     if response.status != 200:
-                        print(f"[WARN] Cover Art Archive error: status {response.status}")
+                        logger.warning("Cover Art Archive error: status %s", response.status)
                         continue
 
                     data = await response.json()
@@ -368,7 +445,7 @@ class ContentSearcher:
                         if img_url:
                             return img_url
             except Exception as e:
-                print(f"[WARN] Cover Art Archive request failed: {e}")
+                logger.warning("Cover Art Archive request failed: %s", e)
         return None
 
     @staticmethod
@@ -431,6 +508,7 @@ class ContentSearcher:
         return []
 
     @staticmethod
+    @cached('musicbrainz')
     async def search_music_track_multiple(session, name, artist=None):
         """MusicBrainz에서 곡(recording) 후보를 검색한다."""
         title_query = ContentSearcher._musicbrainz_query_phrase(name)
@@ -515,6 +593,7 @@ class ContentSearcher:
         return None
 
     @staticmethod
+    @cached('mangadex')
     async def _fetch_manga_by_id(session, manga_id):
         """MangaDex ID로 직접 만화 정보 조회"""
         url = f"https://api.mangadex.org/manga/{manga_id}?includes[]=author&includes[]=cover_art"
@@ -522,7 +601,7 @@ class ContentSearcher:
         try:
             async with session.get(url) as response:
                 if response.status != 200:
-                    print(f"❌ MangaDex API error: status {response.status}")
+                    logger.error("❌ MangaDex API error: status %s", response.status)
                     return None, None, None, None, None
 
                 data = await response.json()
@@ -573,14 +652,17 @@ class ContentSearcher:
                     filename = cover_attrs.get('fileName')
                     if filename:
                         img_url = f"https://uploads.mangadex.org/covers/{manga_id}/{filename}"
-                        print(f"이미지 정보: {img_url}")
+                        logger.debug("이미지 정보: %s", img_url)
                     break
 
-            print(f"MangaDex ID로 가져온 정보 - 제목: {title}, 년도: {year}, 작가: {author}, ID: {manga_id}")
+            logger.debug(
+                "MangaDex ID로 가져온 정보 - 제목: %s, 년도: %s, 작가: %s, ID: %s",
+                title, year, author, manga_id
+            )
             return title, year, author, img_url, manga_id
 
         except Exception as e:
-            print(f"❌ MangaDex API error: {e}")
+            logger.error("❌ MangaDex API error: %s", e)
             return None, None, None, None, None
 
     @staticmethod
@@ -637,47 +719,51 @@ class ContentSearcher:
                         filename = cover_attrs.get('fileName')
                         if filename:
                             img_url = f"https://uploads.mangadex.org/covers/{manga_id}/{filename}"
-                            print(f"이미지 정보: {img_url}")
+                            logger.debug("이미지 정보: %s", img_url)
                         break
-                print(f"망가덱스에서 가져온 정보 - 제목: {title}, 년도: {year}, 작가: {author}, ID: {manga_id}")
+                logger.debug("망가덱스에서 가져온 정보 - 제목: %s, 년도: %s, 작가: %s, ID: %s", title, year, author, manga_id)
                 return title, year, author, img_url, manga_id
 
         except Exception as e:
-            print(f"❌ MangaDex API error: {e}")
+            logger.error("❌ MangaDex API error: %s", e)
 
         return None, None, None, None, None
 
     @staticmethod
+    @cached('mangadex')
     async def search_manga(session, name):
         """MangaDex에서 만화 검색 (URL 또는 제목으로 검색)
         Returns: (title, year, author, img_url, mangadex_id)
         """
-        print(f"[DEBUG] search_manga() 시작 - name: {name}")
+        logger.debug("search_manga() 시작 - name: %s", name)
 
         # 0차: MangaDex URL인지 확인
         manga_id = ContentSearcher._extract_mangadex_id(name)
         if manga_id:
-            print(f"[DEBUG] search_manga() MangaDex URL 감지 - ID: {manga_id}")
+            logger.debug("search_manga() MangaDex URL 감지 - ID: %s", manga_id)
             result = await ContentSearcher._fetch_manga_by_id(session, manga_id)
             if result[0] is not None:
-                print(f"[DEBUG] search_manga() URL로 조회 성공 - title={result[0]}")
+                logger.debug("search_manga() URL로 조회 성공 - title=%s", result[0])
                 return result
-            print(f"[DEBUG] search_manga() URL로 조회 실패")
+            logger.debug("search_manga() URL로 조회 실패")
             return None, None, None, None, None
 
         # 1차: 영어로 번역 후 검색
-        print(f"[DEBUG] search_manga() [1차] 영문 번역 시도...")
+        logger.debug("search_manga() [1차] 영문 번역 시도...")
         translated_name = await translate_to_english(name)
-        print(f"[DEBUG] search_manga() [1차] 번역됨: {translated_name}")
+        logger.debug("search_manga() [1차] 번역됨: %s", translated_name)
         result = await ContentSearcher._search_manga_direct(session, translated_name)
-        print(f"[DEBUG] search_manga() [1차] MangaDex 검색 결과: {result}")
+        logger.debug("search_manga() [1차] MangaDex 검색 결과: %s", result)
 
         # 한국어 제목이 있으면 반환
         if result[0] is not None and await is_korean(result[0]):
-            print(f"[DEBUG] search_manga() [1차] 한국어 제목 발견 - 반환: title={result[0]}, year={result[1]}, author={result[2]}, id={result[4]}")
+            logger.debug(
+                "search_manga() [1차] 한국어 제목 발견 - 반환: title=%s, year=%s, author=%s, id=%s",
+                result[0], result[1], result[2], result[4]
+            )
             return result
 
-        print(f"[DEBUG] search_manga() [1차] 한국어 제목 없음")
+        logger.debug("search_manga() [1차] 한국어 제목 없음")
         return None, None, None, None, None
 
     @staticmethod
@@ -685,20 +771,20 @@ class ContentSearcher:
         """네이버 웹툰에서 직접 검색 (내부용)
         Returns: (title, platform, author, img_url, naver_title_id)
         """
-        print(f"[DEBUG] _search_naver_webtoon() 시작 - name: {name}")
+        logger.debug("_search_naver_webtoon() 시작 - name: %s", name)
         headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
         }
 
         try:
             search_url = f"https://comic.naver.com/api/search/all?keyword={name}"
-            print(f"[DEBUG] _search_naver_webtoon() 검색 URL: {search_url}")
+            logger.debug("_search_naver_webtoon() 검색 URL: %s", search_url)
             async with session.get(search_url, headers=headers) as response:
-                print(f"[DEBUG] _search_naver_webtoon() 응답 상태: {response.status}")
+                logger.debug("_search_naver_webtoon() 응답 상태: %s", response.status)
                 if response.status == 200:
                     data = await response.json()
                     webtoons = data.get('searchWebtoonResult', {}).get('searchViewList', [])
-                    print(f"[DEBUG] _search_naver_webtoon() 검색 결과 개수: {len(webtoons)}")
+                    logger.debug("_search_naver_webtoon() 검색 결과 개수: %s", len(webtoons))
 
                     if webtoons:
                         webtoon = webtoons[0]
@@ -706,53 +792,40 @@ class ContentSearcher:
                         author = webtoon.get('displayAuthor')
                         img_url = webtoon.get('thumbnailUrl')
                         title_id = str(webtoon.get('titleId')) if webtoon.get('titleId') else None
-                        print(f"[DEBUG] _search_naver_webtoon() 완료 - title: {title}, author: {author}, titleId: {title_id}")
+                        logger.debug(
+                            "_search_naver_webtoon() 완료 - title: %s, author: %s, titleId: %s",
+                            title, author, title_id
+                        )
 
                         return title, "네이버웹툰", author, img_url, title_id
                 else:
-                    print(f"[DEBUG] _search_naver_webtoon() 상태 오류: {response.status}")
+                    logger.debug("_search_naver_webtoon() 상태 오류: %s", response.status)
         except Exception as e:
-            print(f"[ERROR] _search_naver_webtoon() 실패: {e}")
+            logger.error("_search_naver_webtoon() 실패: %s", e)
 
-        print(f"[DEBUG] _search_naver_webtoon() 반환값 없음")
+        logger.debug("_search_naver_webtoon() 반환값 없음")
         return None, None, None, None, None
 
     @staticmethod
+    @cached('naver_webtoon')
     async def search_webtoon(session, name):
         """웹툰 검색 (네이버 → 카카오 → Google 스크래핑)
         Returns: (title, platform, author, img_url, naver_title_id)
         """
-        print(f"[DEBUG] search_webtoon() 시작 - name: {name}")
+        logger.debug("search_webtoon() 시작 - name: %s", name)
 
         # 1차: 네이버 웹툰 검색
-        print(f"[DEBUG] search_webtoon() [1차] 네이버 웹툰 검색...")
+        logger.debug("search_webtoon() [1차] 네이버 웹툰 검색...")
         result = await ContentSearcher._search_naver_webtoon(session, name)
         if result[0] is not None:
-            print(f"[DEBUG] search_webtoon() [1차] 성공 - 반환: {result}")
+            logger.debug("search_webtoon() [1차] 성공 - 반환: %s", result)
             return result
 
-        print(f"[DEBUG] search_webtoon() [1차] 실패")
+        logger.debug("search_webtoon() [1차] 실패")
         return None, None, None, None, None
 
 
-class GrokSearcher:
-    """Grok AI API로 레거시 리뷰 메시지를 파싱하는 클래스 (마이그레이션용)"""
-
-    @staticmethod
-    def _parse_legacy_review_sync(message_content: str, author_name: str) -> dict:
-        """동기 함수 - 레거시 리뷰 메시지를 LLM으로 파싱"""
-        if not GROK_API_KEY:
-            print("[ERROR] GROK_API_KEY가 설정되지 않았습니다.")
-            return None
-
-        client = Client(
-            api_key=GROK_API_KEY,
-            timeout=60,
-        )
-
-        chat = client.chat.create(model="grok-3-mini-fast")
-
-        chat.append(system("""You are a parser that extracts review information from unstructured text messages.
+LEGACY_REVIEW_SYSTEM_PROMPT = """You are a parser that extracts review information from unstructured text messages.
 Extract the following fields and return ONLY valid JSON (no markdown, no explanation):
 - title: The title of the content being reviewed (movie, drama, anime, manga, webtoon, webnovel, album, track)
 - score: Rating score (convert to 0-5 scale, e.g. "8/10" → 4.0, "A+" → 5.0, "별 4개" → 4.0)
@@ -762,55 +835,301 @@ Extract the following fields and return ONLY valid JSON (no markdown, no explana
 - year: Release year if mentioned (otherwise null)
 - director: Director, author, or artist name if mentioned (otherwise null)
 
-If you cannot extract meaningful review information, return {"error": "not_a_review"}"""))
+If you cannot extract meaningful review information, return {"error": "not_a_review"}"""
 
-        chat.append(user(f"""Parse this message and extract review information:
+LEGACY_REVIEW_BATCH_PROMPT = LEGACY_REVIEW_SYSTEM_PROMPT + """
+
+You will receive several messages, each wrapped in <message index="N"> tags.
+Parse every message independently and return ONLY a JSON array with one object per message.
+Every object must include "index" (the N of its message). For a message that is not a review,
+return {"index": N, "error": "not_a_review"}."""
+
+LEGACY_REVIEW_USER_TEMPLATE = """Parse this message and extract review information:
 
 Message author: {author_name}
 Message content:
 {message_content}
 
-Return only JSON."""))
+Return only JSON."""
+
+LEGACY_REVIEW_BATCH_USER_TEMPLATE = """Parse these {count} messages:
+
+{blocks}
+
+Return only a JSON array with {count} objects."""
+
+LEGACY_REVIEW_MESSAGE_BLOCK = '<message index="{index}" author="{author_name}">\n{message_content}\n</message>'
+
+# 파싱 결과 캐시 키에 넣는 프롬프트 버전 (위 프롬프트/템플릿 중 하나라도 고치면 키가 바뀌어 다시 파싱한다)
+LEGACY_REVIEW_PROMPT_VERSION = hashlib.sha256("\0".join([
+    LEGACY_REVIEW_SYSTEM_PROMPT,
+    LEGACY_REVIEW_BATCH_PROMPT,
+    LEGACY_REVIEW_USER_TEMPLATE,
+    LEGACY_REVIEW_BATCH_USER_TEMPLATE,
+    LEGACY_REVIEW_MESSAGE_BLOCK,
+]).encode("utf-8")).hexdigest()[:12]
+LEGACY_REVIEW_CACHE_PROVIDER = 'grok_legacy_review'
+# 리뷰가 아닌 메시지도 저장해 두고 다시 묻지 않는다
+NOT_A_REVIEW = {"error": "not_a_review"}
+
+
+class GrokParseError(RuntimeError):
+    """Grok 요청/응답 오류 (타임아웃, 레이트 리밋, gRPC 오류 등) - 리뷰가 아닌 메시지와 구분해 나중에 다시 시도한다"""
+
+
+class GrokSearcher:
+    """Grok AI API로 레거시 리뷰 메시지를 파싱하는 클래스 (마이그레이션용)"""
+
+    _client = None
+    _client_lock = threading.Lock()
+    # 파싱 결과 영구 캐시 (metadata_cache 테이블). attach_store()로 연결
+    _db = None
+    _cache_stats = {'hits': 0, 'misses': 0}
+
+    @staticmethod
+    def attach_store(db):
+        """파싱 결과 영구 캐시 연결. db는 AsyncDatabase."""
+        GrokSearcher._db = db
+
+    @staticmethod
+    def cache_key(message_content, author_name):
+        """메시지 내용 + 작성자 + 모델 + 프롬프트 버전 해시"""
+        source = json.dumps(
+            [GROK_MODEL, LEGACY_REVIEW_PROMPT_VERSION, author_name, message_content],
+            ensure_ascii=False
+        )
+        return hashlib.sha256(source.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def cache_stats():
+        return dict(GrokSearcher._cache_stats)
 
+    @staticmethod
+    async def _load_cached(messages):
+        """캐시된 파싱 결과 {index: 파싱 결과 dict 또는 None(리뷰 아님)}"""
+        if GrokSearcher._db is None or not messages:
+            return {}
+        keys = [GrokSearcher.cache_key(content, author) for content, author in messages]
         try:
-            print(f"[DEBUG] _parse_legacy_review_sync() API 호출 시작")
+            payloads = await GrokSearcher._db.get_metadata_cache_entries(LEGACY_REVIEW_CACHE_PROVIDER, keys)
+        except Exception as e:
+            logger.warning("Grok 파싱 캐시 조회 실패: %s", e)
+            return {}
+        cached_results = {}
+        for index, key in enumerate(keys):
+            if key in payloads:
+                payload = payloads[key]
+                cached_results[index] = None if payload.get("error") else payload
+        GrokSearcher._cache_stats['hits'] += len(cached_results)
+        GrokSearcher._cache_stats['misses'] += len(messages) - len(cached_results)
+        return cached_results
 
-            content = ""
-            for response, chunk in chat.stream():
-                if chunk.content:
-                    content += chunk.content
+    @staticmethod
+    async def _store_cached(messages, results):
+        """파싱에 성공한 결과만 저장 (None은 리뷰 아님으로 저장, 응답에서 빠진 메시지는 저장하지 않음)"""
+        if GrokSearcher._db is None:
+            return
+        entries = [
+            (GrokSearcher.cache_key(*messages[index]), NOT_A_REVIEW if parsed is None else parsed)
+            for index, parsed in results.items()
+        ]
+        try:
+            await GrokSearcher._db.save_metadata_cache_entries(
+                LEGACY_REVIEW_CACHE_PROVIDER, entries, PROVIDER_TTLS[LEGACY_REVIEW_CACHE_PROVIDER]
+            )
+        except Exception as e:
+            logger.warning("Grok 파싱 캐시 저장 실패: %s", e)
 
-            print(f"[DEBUG] _parse_legacy_review_sync() 응답: {content[:200]}...")
+    @staticmethod
+    def _get_client():
+        """xai Client는 gRPC 채널을 열어 두므로 한 번만 만들어 모든 스레드에서 재사용"""
+        with GrokSearcher._client_lock:
+            if GrokSearcher._client is None:
+                GrokSearcher._client = Client(
+                    api_key=GROK_API_KEY,
+                    timeout=60,
+                )
+            return GrokSearcher._client
+
+    @staticmethod
+    def _extract_json(content):
+        """응답에서 ```json 코드 블록을 벗겨내고 JSON 파싱"""
+        if "```json" in content:
+            json_start = content.find("```json") + 7
+            json_end = content.find("```", json_start)
+            content = content[json_start:json_end].strip()
+        elif "```" in content:
+            json_start = content.find("```") + 3
+            json_end = content.find("```", json_start)
+            content = content[json_start:json_end].strip()
+        return json.loads(content)
+
+    @staticmethod
+    def _parse_legacy_review_sync(message_content: str, author_name: str) -> dict:
+        """동기 함수 - 레거시 리뷰 메시지를 LLM으로 파싱
+
+        Returns:
+            dict: 파싱 결과, 리뷰가 아니면 NOT_A_REVIEW, 요청/응답 오류면 None
+        """
+        if not GROK_API_KEY:
+            logger.error("GROK_API_KEY가 설정되지 않았습니다.")
+            return None
+
+        try:
+            # 클라이언트 생성/인증 오류도 요청 오류로 처리 (parse_legacy_review가 GrokParseError로 바꾼다)
+            chat = GrokSearcher._get_client().chat.create(model=GROK_MODEL)
+            chat.append(system(LEGACY_REVIEW_SYSTEM_PROMPT))
+            chat.append(user(LEGACY_REVIEW_USER_TEMPLATE.format(
+                author_name=author_name, message_content=message_content
+            )))
+
+            logger.debug("_parse_legacy_review_sync() API 호출 시작")
+
+            # 마이그레이션은 응답을 한 번에 쓰므로 스트리밍하지 않는다
+            content = chat.sample().content or ""
+
+            logger.debug("_parse_legacy_review_sync() 응답: %s...", content[:200])
 
             if not content:
                 return None
 
-            # JSON 파싱
-            if "```json" in content:
-                json_start = content.find("```json") + 7
-                json_end = content.find("```", json_start)
-                content = content[json_start:json_end].strip()
-            elif "```" in content:
-                json_start = content.find("```") + 3
-                json_end = content.find("```", json_start)
-                content = content[json_start:json_end].strip()
+            result = GrokSearcher._extract_json(content)
 
-            result = json.loads(content)
-
-            if result.get("error"):
+            if not isinstance(result, dict):
                 return None
+            if result.get("error"):
+                return NOT_A_REVIEW
 
             return result
 
         except json.JSONDecodeError as e:
-            print(f"[ERROR] _parse_legacy_review_sync() JSON 파싱 실패: {e}")
+            logger.error("_parse_legacy_review_sync() JSON 파싱 실패: %s", e)
             return None
         except Exception as e:
-            print(f"[ERROR] _parse_legacy_review_sync() 예외 발생: {e}")
+            logger.error("_parse_legacy_review_sync() 예외 발생: %s", e)
             return None
 
     @staticmethod
     async def parse_legacy_review(message_content: str, author_name: str) -> dict:
-        """비동기 래퍼 - 레거시 리뷰 메시지 파싱"""
-        return await asyncio.to_thread(GrokSearcher._parse_legacy_review_sync, message_content, author_name)
+        """비동기 래퍼 - 레거시 리뷰 메시지 파싱 (캐시된 결과가 있으면 API를 호출하지 않음)
+
+        Returns:
+            dict: 파싱 결과, 리뷰가 아니면 None
+
+        Raises:
+            GrokParseError: 요청/응답 오류 (캐시하지 않음)
+        """
+        messages = [(message_content, author_name)]
+        cached_results = await GrokSearcher._load_cached(messages)
+        if 0 in cached_results:
+            return cached_results[0]
+
+        result = await asyncio.to_thread(GrokSearcher._parse_legacy_review_sync, message_content, author_name)
+        if result is None:
+            raise GrokParseError("Grok 레거시 리뷰 파싱 실패")
+        parsed = None if result is NOT_A_REVIEW else result
+        if parsed is not None and not GrokSearcher._is_valid_parse(parsed):
+            # 형식이 잘못된 응답은 캐시하지 않고 다음 실행에서 다시 묻는다
+            logger.debug("parse_legacy_review() 형식이 잘못된 응답 - 캐시하지 않음")
+            return parsed
+        await GrokSearcher._store_cached(messages, {0: parsed})
+        return parsed
+
+    @staticmethod
+    def _is_valid_parse(item):
+        """파싱 결과가 리뷰로 쓸 수 있는 형태인지 (제목/점수/한줄평)"""
+        if not isinstance(item.get("title"), str) or not item["title"].strip():
+            return False
+        if not isinstance(item.get("one_line_review"), str) or not item["one_line_review"].strip():
+            return False
+        try:
+            float(item.get("score"))
+        except (TypeError, ValueError):
+            return False
+        return True
+
+    @staticmethod
+    def _parse_legacy_reviews_batch_sync(messages: list) -> dict:
+        """동기 함수 - 여러 메시지를 한 번의 요청으로 파싱
+
+        Args:
+            messages: [(message_content, author_name)]
+
+        Returns:
+            dict: {index: 파싱 결과 dict 또는 None(리뷰 아님)}
+                  응답에서 빠졌거나 형식이 잘못된 index는 포함하지 않는다 (단건 파싱으로 재시도)
+        """
+        if not GROK_API_KEY:
+            logger.error("GROK_API_KEY가 설정되지 않았습니다.")
+            return {}
+
+        blocks = "\n".join(
+            LEGACY_REVIEW_MESSAGE_BLOCK.format(index=index, author_name=author_name, message_content=message_content)
+            for index, (message_content, author_name) in enumerate(messages)
+        )
+
+        try:
+            # 클라이언트 생성/인증 오류도 {}로 돌려 단건 파싱으로 넘긴다
+            chat = GrokSearcher._get_client().chat.create(model=GROK_MODEL)
+            chat.append(system(LEGACY_REVIEW_BATCH_PROMPT))
+            chat.append(user(LEGACY_REVIEW_BATCH_USER_TEMPLATE.format(count=len(messages), blocks=blocks)))
+
+            logger.debug("_parse_legacy_reviews_batch_sync() API 호출 시작 - %s개", len(messages))
+            content = chat.sample().content or ""
+            logger.debug("_parse_legacy_reviews_batch_sync() 응답: %s...", content[:200])
+            if not content:
+                return {}
+
+            items = GrokSearcher._extract_json(content)
+            if isinstance(items, dict):
+                # {"results": [...]}처럼 감싸서 돌려준 경우
+                items = next((value for value in items.values() if isinstance(value, list)), [])
+            if not isinstance(items, list):
+                return {}
+        except json.JSONDecodeError as e:
+            logger.error("_parse_legacy_reviews_batch_sync() JSON 파싱 실패: %s", e)
+            return {}
+        except Exception as e:
+            logger.error("_parse_legacy_reviews_batch_sync() 예외 발생: %s", e)
+            return {}
+
+        results = {}
+        for item in items:
+            if not isinstance(item, dict):
+                continue
+            index = item.get("index")
+            if isinstance(index, str) and index.isdigit():
+                index = int(index)
+            if not isinstance(index, int) or not 0 <= index < len(messages) or index in results:
+                continue
+            if item.get("error"):
+                results[index] = None
+            elif GrokSearcher._is_valid_parse(item):
+                results[index] = {key: value for key, value in item.items() if key != "index"}
+
+        if len(results) < len(messages):
+            logger.debug(
+                "_parse_legacy_reviews_batch_sync() %s/%s개만 유효 - 나머지는 단건 파싱",
+                len(results), len(messages)
+            )
+        return results
+
+    @staticmethod
+    async def parse_legacy_reviews_batch(messages: list) -> dict:
+        """비동기 래퍼 - 여러 레거시 리뷰 메시지를 한 번에 파싱 (반환 형식은 동기 함수와 같음)
+
+        캐시된 메시지는 빼고 나머지만 API로 보낸다.
+        """
+        results = await GrokSearcher._load_cached(messages)
+        pending = [index for index in range(len(messages)) if index not in results]
+        if not pending:
+            return results
+
+        parsed = await asyncio.to_thread(
+            GrokSearcher._parse_legacy_reviews_batch_sync, [messages[index] for index in pending]
+        )
+        fresh = {pending[position]: result for position, result in parsed.items()}
+        await GrokSearcher._store_cached(messages, fresh)
+        results.update(fresh)
+        return results
 
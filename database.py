@@ -1,345 +1,1150 @@
 import psycopg2
-from psycopg2.extras import RealDictCursor
+from psycopg2 import pool as pg_pool
+from psycopg2.extensions import TRANSACTION_STATUS_IDLE
+from psycopg2.extras import Json, RealDictCursor, execute_values
 # from db_config import DATABASE_URL
 import os
+import re
+import sys
+import asyncio
+import functools
+import logging
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from monitoring import format_duration, instrument_methods, metrics
+from title_index import TitleIndex
+from tracing import span
+
+logger = logging.getLogger("bot.db")
 
 DATABASE_URL = os.getenv("DATABASE_URL")
+DB_SSLMODE = os.getenv("DB_SSLMODE", "require")
+DB_POOL_MIN = int(os.getenv("DB_POOL_MIN", "1"))
+DB_POOL_MAX = int(os.getenv("DB_POOL_MAX", "10"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "10"))
+DB_POOL_IDLE_CHECK = float(os.getenv("DB_POOL_IDLE_CHECK", "300"))
+REVIEW_CACHE_SIZE = int(os.getenv("REVIEW_CACHE_SIZE", "1024"))
+REVIEW_CACHE_TTL = float(os.getenv("REVIEW_CACHE_TTL", "300"))
 
 _NO_SEASON_FILTER = object()
 
-def get_conn():
-    return psycopg2.connect(
-        DATABASE_URL,
-        sslmode="require"
-    )
 
+class ConnectionPool:
+    """스레드 안전한 psycopg2 연결 풀.
+
+    최대 연결 수를 넘는 요청은 DB_POOL_TIMEOUT 동안 대기하고,
+    끊어졌거나 오래 놀던 연결은 버리고 새로 연결한다.
+    """
+
+    def __init__(self, dsn, minconn, maxconn, timeout, idle_check, sslmode):
+        self._pool = pg_pool.ThreadedConnectionPool(minconn, maxconn, dsn, sslmode=sslmode)
+        self._slots = threading.BoundedSemaphore(maxconn)
+        self._lock = threading.Lock()
+        self._last_used = {}
+        self.minconn = minconn
+        self.maxconn = maxconn
+        self.timeout = timeout
+        self.idle_check = idle_check
+        self._stats = {
+            'checkouts': 0,
+            'waits': 0,
+            'timeouts': 0,
+            'recycled': 0,
+            'in_use': 0,
+            'wait_time_total': 0.0,
+            'wait_time_max': 0.0,
+        }
+
+    def getconn(self):
+        """연결 하나를 빌린다. 풀이 가득 차 있으면 반납될 때까지 대기."""
+        start = time.perf_counter()
+        waited = False
+        if not self._slots.acquire(blocking=False):
+            waited = True
+            if not self._slots.acquire(timeout=self.timeout):
+                with self._lock:
+                    self._stats['timeouts'] += 1
+                raise pg_pool.PoolError(
+                    f"connection pool exhausted (max={self.maxconn}, waited {self.timeout}s)"
+                )
+        wait_time = time.perf_counter() - start
+
+        try:
+            conn = self._checkout_healthy()
+        except Exception:
+            self._slots.release()
+            raise
+
+        with self._lock:
+            self._stats['checkouts'] += 1
+            self._stats['in_use'] += 1
+            if waited:
+                self._stats['waits'] += 1
+                self._stats['wait_time_total'] += wait_time
+                self._stats['wait_time_max'] = max(self._stats['wait_time_max'], wait_time)
+        metrics.record_pool_acquire(time.perf_counter() - start)
+        return conn
+
+    def _checkout_healthy(self):
+        conn = self._pool.getconn()
+        if not self._is_alive(conn):
+            self._discard(conn)
+            conn = self._pool.getconn()
+        return conn
+
+    def _is_alive(self, conn):
+        if conn.closed:
+            return False
+        last_used = self._last_used.get(id(conn))
+        if last_used is None or time.monotonic() - last_used < self.idle_check:
+            return True
+        # 오래 놀던 연결은 서버/프록시가 끊었을 수 있으므로 한 번 확인
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute("SELECT 1")
+            conn.rollback()
+            return True
+        except (psycopg2.OperationalError, psycopg2.InterfaceError):
+            return False
+
+    def _discard(self, conn):
+        self._last_used.pop(id(conn), None)
+        try:
+            self._pool.putconn(conn, close=True)
+        except Exception as e:
+            logger.warning("ConnectionPool failed to discard connection: %s", e)
+        with self._lock:
+            self._stats['recycled'] += 1
+
+    def putconn(self, conn, broken=False):
+        """연결 반납. broken이거나 이미 닫힌 연결은 폐기."""
+        try:
+            if broken or conn.closed:
+                self._discard(conn)
+                return
+
+            if conn.info.transaction_status != TRANSACTION_STATUS_IDLE:
+                try:
+                    conn.rollback()
+                except (psycopg2.OperationalError, psycopg2.InterfaceError):
+                    self._discard(conn)
+                    return
+
+            self._last_used[id(conn)] = time.monotonic()
+            self._pool.putconn(conn)
+        finally:
+            with self._lock:
+                self._stats['in_use'] -= 1
+            self._slots.release()
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+        stats['max_size'] = self.maxconn
+        stats['min_size'] = self.minconn
+        stats['wait_time_avg'] = (
+            stats['wait_time_total'] / stats['waits'] if stats['waits'] else 0.0
+        )
+        return stats
+
+    def closeall(self):
+        self._pool.closeall()
+        self._last_used.clear()
+
+
+class ReviewRowCache:
+    """message_id → 리뷰 row 캐시 (반응 버튼 클릭마다 DB를 조회하지 않도록).
+
+    리뷰 수정/삭제/메시지 변경 시 Database에서 무효화한다.
+    """
+
+    def __init__(self, max_size, ttl):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._rows = OrderedDict()
+        self._message_by_review = {}
+        self._lock = threading.Lock()
+
+    def get(self, message_id):
+        with self._lock:
+            entry = self._rows.get(message_id)
+            if entry is None:
+                return None
+            expires_at, row = entry
+            if expires_at <= time.monotonic():
+                self._pop(message_id)
+                return None
+            self._rows.move_to_end(message_id)
+            return dict(row)
+
+    def put(self, message_id, row):
+        with self._lock:
+            self._pop(message_id)
+            self._rows[message_id] = (time.monotonic() + self.ttl, dict(row))
+            self._message_by_review[row['id']] = message_id
+            while len(self._rows) > self.max_size:
+                self._pop(next(iter(self._rows)))
+
+    def invalidate_message(self, message_id):
+        with self._lock:
+            self._pop(message_id)
+
+    def invalidate_review(self, review_id):
+        with self._lock:
+            message_id = self._message_by_review.get(review_id)
+            if message_id is not None:
+                self._pop(message_id)
+
+    def _pop(self, message_id):
+        entry = self._rows.pop(message_id, None)
+        if entry is not None:
+            self._message_by_review.pop(entry[1]['id'], None)
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_pool():
+    """프로세스 전역 연결 풀 (최초 호출 시 생성)."""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ConnectionPool(
+                    DATABASE_URL,
+                    DB_POOL_MIN,
+                    max(DB_POOL_MIN, DB_POOL_MAX),
+                    DB_POOL_TIMEOUT,
+                    DB_POOL_IDLE_CHECK,
+                    DB_SSLMODE,
+                )
+    return _pool
 
+
+@contextmanager
+def get_conn():
+    """풀에서 연결을 빌려 블록 종료 시 commit(예외 시 rollback) 후 반납."""
+    pool = get_pool()
+    conn = pool.getconn()
+    broken = False
+    try:
+        yield conn
+        conn.commit()
+    except (psycopg2.OperationalError, psycopg2.InterfaceError):
+        broken = True
+        raise
+    except Exception:
+        try:
+            conn.rollback()
+        except (psycopg2.OperationalError, psycopg2.InterfaceError):
+            broken = True
+        raise
+    finally:
+        pool.putconn(conn, broken=broken)
+
+
+# 리뷰 제출을 한 번의 왕복으로 처리하는 함수 (migrations/006_submit_review_function.sql과 동일)
+SUBMIT_REVIEW_FUNCTIONS_SQL = r'''
+CREATE OR REPLACE FUNCTION find_content_id(
+    p_title TEXT,
+    p_category TEXT,
+    p_creator TEXT,
+    p_musicbrainz_id TEXT,
+    p_igdb_id INTEGER,
+    p_steam_appid INTEGER
+) RETURNS INTEGER
+LANGUAGE plpgsql STABLE AS $$
+DECLARE
+    v_id INTEGER;
+BEGIN
+    IF p_category = 'music_track' THEN
+        IF p_musicbrainz_id IS NOT NULL THEN
+            SELECT c.id INTO v_id FROM contents c
+            WHERE c.musicbrainz_id = p_musicbrainz_id AND c.category = p_category;
+        END IF;
+        IF v_id IS NULL THEN
+            SELECT c.id INTO v_id FROM contents c
+            WHERE c.title = p_title
+              AND c.category = p_category
+              AND COALESCE(c.creator, '') = COALESCE(p_creator, '');
+        END IF;
+    ELSIF p_category = 'game' THEN
+        IF p_igdb_id IS NOT NULL THEN
+            SELECT c.id INTO v_id FROM contents c
+            WHERE c.igdb_id = p_igdb_id AND c.category = p_category;
+        END IF;
+        IF v_id IS NULL AND p_steam_appid IS NOT NULL THEN
+            SELECT c.id INTO v_id FROM contents c
+            WHERE c.steam_appid = p_steam_appid AND c.category = p_category;
+        END IF;
+        IF v_id IS NULL THEN
+            SELECT c.id INTO v_id FROM contents c
+            WHERE c.title = p_title
+              AND c.category = p_category
+              AND COALESCE(c.creator, '') = COALESCE(p_creator, '');
+        END IF;
+    ELSE
+        SELECT c.id INTO v_id FROM contents c
+        WHERE c.title = p_title AND c.category = p_category;
+    END IF;
+    RETURN v_id;
+END;
+$$;
+
+CREATE OR REPLACE FUNCTION submit_review(
+    p_user_id BIGINT,
+    p_username TEXT,
+    p_title TEXT,
+    p_category TEXT,
+    p_score REAL,
+    p_one_line_review TEXT,
+    p_additional_comment TEXT,
+    p_year_or_platform TEXT DEFAULT NULL,
+    p_creator TEXT DEFAULT NULL,
+    p_img_url TEXT DEFAULT NULL,
+    p_tmdb_id INTEGER DEFAULT NULL,
+    p_mangadex_id TEXT DEFAULT NULL,
+    p_naver_title_id TEXT DEFAULT NULL,
+    p_musicbrainz_id TEXT DEFAULT NULL,
+    p_musicbrainz_type TEXT DEFAULT NULL,
+    p_igdb_id INTEGER DEFAULT NULL,
+    p_steam_appid INTEGER DEFAULT NULL,
+    p_unit_to INTEGER DEFAULT NULL,
+    p_season INTEGER DEFAULT NULL,
+    p_latest_units INTEGER DEFAULT NULL,
+    p_source_url TEXT DEFAULT NULL
+) RETURNS TABLE (status TEXT, content_id INTEGER, review_id INTEGER, unit_from INTEGER)
+LANGUAGE plpgsql AS $$
+#variable_conflict use_column
+DECLARE
+    v_content_id INTEGER;
+    v_review_id INTEGER;
+    v_max_unit INTEGER;
+    v_unit_from INTEGER;
+BEGIN
+    -- 1. 작품 조회 또는 생성 (get_or_create_content와 같은 식별 규칙)
+    v_content_id := find_content_id(
+        p_title, p_category, p_creator, p_musicbrainz_id, p_igdb_id, p_steam_appid
+    );
+
+    IF v_content_id IS NULL THEN
+        BEGIN
+            INSERT INTO contents
+            (title, category, year_or_platform, creator, img_url,
+             tmdb_id, mangadex_id, naver_title_id,
+             musicbrainz_id, musicbrainz_type, igdb_id, steam_appid)
+            VALUES (p_title, p_category, p_year_or_platform, p_creator, p_img_url,
+                    p_tmdb_id, p_mangadex_id, p_naver_title_id,
+                    p_musicbrainz_id, p_musicbrainz_type, p_igdb_id, p_steam_appid)
+            RETURNING id INTO v_content_id;
+        EXCEPTION WHEN unique_violation THEN
+            -- 다른 요청이 같은 작품을 먼저 만든 경우 다시 조회
+            v_content_id := find_content_id(
+                p_title, p_category, p_creator, p_musicbrainz_id, p_igdb_id, p_steam_appid
+            );
+        END;
+    END IF;
+
+    IF v_content_id IS NULL THEN
+        RAISE EXCEPTION 'submit_review: content lookup failed for %', p_title;
+    END IF;
+
+    UPDATE contents c
+    SET year_or_platform = COALESCE(c.year_or_platform, p_year_or_platform),
+        creator = COALESCE(c.creator, p_creator),
+        img_url = COALESCE(c.img_url, p_img_url),
+        tmdb_id = COALESCE(c.tmdb_id, p_tmdb_id),
+        mangadex_id = COALESCE(c.mangadex_id, p_mangadex_id),
+        naver_title_id = COALESCE(c.naver_title_id, p_naver_title_id),
+        musicbrainz_id = COALESCE(c.musicbrainz_id, p_musicbrainz_id),
+        musicbrainz_type = COALESCE(c.musicbrainz_type, p_musicbrainz_type),
+        igdb_id = COALESCE(c.igdb_id, p_igdb_id),
+        steam_appid = COALESCE(c.steam_appid, p_steam_appid)
+    WHERE c.id = v_content_id;
+
+    -- 2. 같은 유저/작품에 대한 동시 제출 직렬화 (트랜잭션 종료 시 자동 해제)
+    PERFORM pg_advisory_xact_lock(hashtext(p_user_id::TEXT || ':' || v_content_id::TEXT));
+
+    -- 3. 중복/회고 검사 + unit_from 계산
+    IF p_unit_to IS NULL THEN
+        IF EXISTS (
+            SELECT 1 FROM reviews r
+            WHERE r.user_id = p_user_id
+              AND r.content_id = v_content_id
+              AND r.unit_from IS NULL AND r.unit_to IS NULL
+              AND r.season IS NOT DISTINCT FROM p_season
+        ) THEN
+            RETURN QUERY SELECT 'duplicate'::TEXT, v_content_id, NULL::INTEGER, NULL::INTEGER;
+            RETURN;
+        END IF;
+    ELSE
+        SELECT MAX(r.unit_to) INTO v_max_unit
+        FROM reviews r
+        WHERE r.user_id = p_user_id
+          AND r.content_id = v_content_id
+          AND r.season IS NOT DISTINCT FROM p_season;
+
+        IF v_max_unit IS NOT NULL AND v_max_unit > 0 AND p_unit_to <= v_max_unit THEN
+            RETURN QUERY SELECT 'retro'::TEXT, v_content_id, NULL::INTEGER, NULL::INTEGER;
+            RETURN;
+        END IF;
+        v_unit_from := COALESCE(v_max_unit, 0) + 1;
+    END IF;
+
+    -- 4. 리뷰 저장 (레거시 컬럼은 contents 값으로 채움)
+    INSERT INTO reviews
+    (user_id, username, movie_title, movie_year, director,
+     category, img_url, content_id, unit_from, unit_to,
+     score, one_line_review, additional_comment,
+     season, latest_units, source_url)
+    SELECT p_user_id, p_username, c.title, c.year_or_platform, c.creator,
+           c.category, c.img_url, c.id, v_unit_from, p_unit_to,
+           p_score, p_one_line_review, p_additional_comment,
+           p_season, p_latest_units, p_source_url
+    FROM contents c
+    WHERE c.id = v_content_id
+    RETURNING id INTO v_review_id;
+
+    RETURN QUERY SELECT 'created'::TEXT, v_content_id, v_review_id, v_unit_from;
+END;
+$$;
+'''
+
+
+# 리뷰별 반응 수 집계 테이블 + 유지 트리거 (migrations/008_review_reaction_totals.sql과 동일)
+REVIEW_REACTION_TOTALS_SQL = r'''
+CREATE TABLE IF NOT EXISTS review_reaction_totals (
+    review_id INTEGER PRIMARY KEY REFERENCES reviews(id) ON DELETE CASCADE,
+    category TEXT,
+    review_created_at TIMESTAMP,
+    reaction_count INTEGER NOT NULL DEFAULT 0,
+    reaction_breakdown JSONB NOT NULL DEFAULT '{}'::jsonb,
+    updated_at TIMESTAMP NOT NULL DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS idx_reaction_totals_rank
+ON review_reaction_totals(reaction_count DESC, review_created_at DESC)
+WHERE reaction_count > 0;
+
+CREATE INDEX IF NOT EXISTS idx_reaction_totals_category_rank
+ON review_reaction_totals(category, reaction_count DESC, review_created_at DESC)
+WHERE reaction_count > 0;
+
+CREATE OR REPLACE FUNCTION bump_review_reaction_total(
+    p_review_id INTEGER,
+    p_reaction_type TEXT,
+    p_delta INTEGER
+) RETURNS VOID
+LANGUAGE plpgsql AS $$
+BEGIN
+    INSERT INTO review_reaction_totals AS t
+        (review_id, category, review_created_at, reaction_count, reaction_breakdown)
+    SELECT r.id,
+           COALESCE(c.category, r.category),
+           r.created_at,
+           GREATEST(p_delta, 0),
+           CASE WHEN p_delta > 0
+                THEN jsonb_build_object(p_reaction_type, p_delta)
+                ELSE '{}'::jsonb END
+    FROM reviews r
+    LEFT JOIN contents c ON c.id = r.content_id
+    WHERE r.id = p_review_id
+    ON CONFLICT (review_id) DO UPDATE
+    SET reaction_count = GREATEST(t.reaction_count + p_delta, 0),
+        reaction_breakdown = CASE
+            WHEN COALESCE((t.reaction_breakdown ->> p_reaction_type)::INTEGER, 0) + p_delta > 0
+            THEN t.reaction_breakdown || jsonb_build_object(
+                p_reaction_type,
+                COALESCE((t.reaction_breakdown ->> p_reaction_type)::INTEGER, 0) + p_delta
+            )
+            ELSE t.reaction_breakdown - p_reaction_type
+        END,
+        updated_at = NOW();
+END;
+$$;
+
+CREATE OR REPLACE FUNCTION review_reactions_sync_totals() RETURNS TRIGGER
+LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        PERFORM bump_review_reaction_total(NEW.review_id, NEW.reaction_type, 1);
+    ELSIF TG_OP = 'DELETE' THEN
+        PERFORM bump_review_reaction_total(OLD.review_id, OLD.reaction_type, -1);
+    ELSIF OLD.review_id IS DISTINCT FROM NEW.review_id
+       OR OLD.reaction_type IS DISTINCT FROM NEW.reaction_type THEN
+        PERFORM bump_review_reaction_total(OLD.review_id, OLD.reaction_type, -1);
+        PERFORM bump_review_reaction_total(NEW.review_id, NEW.reaction_type, 1);
+    END IF;
+    RETURN NULL;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS trg_review_reactions_sync_totals ON review_reactions;
+CREATE TRIGGER trg_review_reactions_sync_totals
+AFTER INSERT OR UPDATE OR DELETE ON review_reactions
+FOR EACH ROW EXECUTE FUNCTION review_reactions_sync_totals();
+
+CREATE OR REPLACE FUNCTION reviews_sync_reaction_category() RETURNS TRIGGER
+LANGUAGE plpgsql AS $$
+BEGIN
+    UPDATE review_reaction_totals t
+    SET category = COALESCE(
+            (SELECT c.category FROM contents c WHERE c.id = NEW.content_id),
+            NEW.category
+        ),
+        review_created_at = NEW.created_at
+    WHERE t.review_id = NEW.id;
+    RETURN NULL;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS trg_reviews_sync_reaction_category ON reviews;
+CREATE TRIGGER trg_reviews_sync_reaction_category
+AFTER UPDATE OF content_id, category, created_at ON reviews
+FOR EACH ROW EXECUTE FUNCTION reviews_sync_reaction_category();
+'''
+
+# 집계 테이블을 처음 만들 때 기존 반응을 채워 넣는 쿼리
+REVIEW_REACTION_TOTALS_BACKFILL_SQL = r'''
+LOCK TABLE review_reactions IN SHARE MODE;
+
+INSERT INTO review_reaction_totals
+    (review_id, category, review_created_at, reaction_count, reaction_breakdown)
+SELECT r.id,
+       COALESCE(c.category, r.category),
+       r.created_at,
+       agg.reaction_count,
+       agg.reaction_breakdown
+FROM (
+    SELECT review_id,
+           SUM(cnt)::INTEGER AS reaction_count,
+           jsonb_object_agg(reaction_type, cnt) AS reaction_breakdown
+    FROM (
+        SELECT review_id, reaction_type, COUNT(*) AS cnt
+        FROM review_reactions
+        GROUP BY review_id, reaction_type
+    ) per_type
+    GROUP BY review_id
+) agg
+JOIN reviews r ON r.id = agg.review_id
+LEFT JOIN contents c ON c.id = r.content_id
+ON CONFLICT (review_id) DO UPDATE
+SET category = EXCLUDED.category,
+    review_created_at = EXCLUDED.review_created_at,
+    reaction_count = EXCLUDED.reaction_count,
+    reaction_breakdown = EXCLUDED.reaction_breakdown,
+    updated_at = NOW();
+'''
+
+# 자주 실행되는 조회 SQL. 메서드와 check_query_plans()가 같은 문자열을 쓰므로 여기만 고치면 된다.
+# {season_clause}는 Database._build_season_clause(), 나머지 {..._clause}는 아래 *_CLAUSE로 채운다.
+MAX_UNIT_TO_SQL = '''
+    SELECT MAX(unit_to) FROM reviews
+    WHERE user_id = %s AND content_id = %s
+    {season_clause}
+'''
+
+USER_REVIEWS_SQL = '''
+    WITH joined_reviews AS (
+        SELECT
+            r.id,
+            r.user_id,
+            r.username,
+            COALESCE(c.title, r.movie_title) as movie_title,
+            COALESCE(c.category, r.category) as category,
+            COALESCE(c.year_or_platform, r.movie_year) as movie_year,
+            COALESCE(c.creator, r.director) as director,
+            r.score,
+            r.one_line_review,
+            r.additional_comment,
+            r.created_at,
+            COALESCE(c.img_url, r.img_url) as img_url,
+            r.message_id,
+            r.channel_id,
+            r.content_id,
+            r.unit_from,
+            r.unit_to,
+            r.latest_units,
+            r.source_url,
+            r.season,
+            c.title as content_title,
+            c.category as content_category,
+            c.year_or_platform,
+            c.creator,
+            c.img_url as content_img_url
+        FROM reviews r
+        LEFT JOIN contents c ON r.content_id = c.id
+        WHERE r.user_id = %s
+          {category_clause}
+    ),
+    latest_reviews AS (
+        SELECT
+            joined_reviews.*,
+            ROW_NUMBER() OVER (
+                PARTITION BY
+                    COALESCE(content_id::text, movie_title || '|' || COALESCE(category, '')),
+                    COALESCE(season, 0)
+                ORDER BY created_at DESC, id DESC
+            ) as rn
+        FROM joined_reviews
+    )
+    SELECT * FROM latest_reviews
+    WHERE rn = 1
+    ORDER BY created_at DESC, id DESC
+    LIMIT %s
+'''
+USER_REVIEWS_CATEGORY_CLAUSE = "AND (r.category = %s OR c.category = %s)"
+
+USER_REVIEW_SQL = '''
+    SELECT
+        r.*,
+        COALESCE(c.title, r.movie_title) as movie_title,
+        COALESCE(c.category, r.category) as category,
+        COALESCE(c.year_or_platform, r.movie_year) as movie_year,
+        COALESCE(c.creator, r.director) as director,
+        COALESCE(c.img_url, r.img_url) as img_url,
+        c.title as content_title,
+        c.category as content_category
+    FROM reviews r
+    JOIN contents c ON r.content_id = c.id
+    WHERE r.user_id = %s AND c.title = %s
+      {category_clause}
+      {season_clause}
+    ORDER BY r.created_at DESC
+    LIMIT 1
+'''
+
+DELETE_REVIEW_SQL = '''
+    WITH target AS (
+        SELECT r.id
+        FROM reviews r
+        JOIN contents c ON r.content_id = c.id
+        WHERE r.user_id = %s
+          AND c.title = %s
+          {category_clause}
+          {season_clause}
+        ORDER BY r.created_at DESC, r.id DESC
+        LIMIT 1
+    )
+    DELETE FROM reviews r
+    USING target
+    WHERE r.id = target.id
+    RETURNING r.id, r.message_id, r.content_id
+'''
+# get_user_review / delete_review의 카테고리 조건
+CONTENT_CATEGORY_CLAUSE = "AND c.category = %s"
+
+REVIEW_HISTORY_SQL = '''
+    SELECT
+        r.*,
+        COALESCE(c.title, r.movie_title) as movie_title,
+        COALESCE(c.category, r.category) as category,
+        COALESCE(c.year_or_platform, r.movie_year) as movie_year,
+        COALESCE(c.creator, r.director) as director,
+        COALESCE(c.img_url, r.img_url) as img_url
+    FROM reviews r
+    LEFT JOIN contents c ON r.content_id = c.id
+    WHERE r.user_id = %s
+      AND (
+          r.content_id IN (
+              SELECT id FROM contents WHERE title = %s {contents_category_clause}
+          )
+          OR (r.content_id IS NULL AND r.movie_title = %s {legacy_category_clause})
+      )
+      {season_clause}
+    ORDER BY r.created_at DESC, r.id DESC
+    LIMIT %s
+'''
+# get_review_history의 카테고리 조건 (contents 서브쿼리 / content_id가 없는 레거시 행)
+HISTORY_CONTENTS_CATEGORY_CLAUSE = "AND category = %s"
+HISTORY_LEGACY_CATEGORY_CLAUSE = "AND r.category = %s"
+
+REVIEW_LOGS_SQL = '''
+    SELECT *
+    FROM review_logs
+    WHERE {filters}
+      {season_clause}
+    ORDER BY created_at DESC, id DESC
+    LIMIT %s
+'''
+
+REVIEW_RANKING_SQL = '''
+    SELECT
+        r.*,
+        COALESCE(c.title, r.movie_title) as movie_title,
+        COALESCE(c.category, r.category) as category,
+        COALESCE(c.year_or_platform, r.movie_year) as movie_year,
+        COALESCE(c.creator, r.director) as director,
+        COALESCE(c.img_url, r.img_url) as img_url,
+        t.reaction_count,
+        t.reaction_breakdown
+    FROM review_reaction_totals t
+    JOIN reviews r ON r.id = t.review_id
+    LEFT JOIN contents c ON r.content_id = c.id
+    WHERE t.reaction_count > 0
+      {category_clause}
+    ORDER BY t.reaction_count DESC, t.review_created_at DESC
+    LIMIT %s
+'''
+REVIEW_RANKING_CATEGORY_CLAUSE = "AND t.category = %s"
+
+
+@instrument_methods(exclude=('connect', 'close', 'get_pool_stats'), error_logger="bot.db")
 class Database:
     def __init__(self):
-        self.conn = None
+        self.pool = None
+        self.review_cache = ReviewRowCache(REVIEW_CACHE_SIZE, REVIEW_CACHE_TTL)
+        self.title_index = TitleIndex()
         self.connect()
         self.create_tables()
 
     def connect(self):
-        """DB 연결"""
+        """DB 연결 풀 생성"""
         try:
-            self.conn = psycopg2.connect(DATABASE_URL)
-            print("✅ Database connected successfully")
+            self.pool = get_pool()
+            logger.info(
+                "✅ Database connected successfully (pool %s~%s)",
+                self.pool.minconn, self.pool.maxconn
+            )
         except Exception as e:
-            print(f"❌ Database connection failed: {e}")
+            logger.error("❌ Database connection failed: %s", e)
+
+    def get_pool_stats(self):
+        """연결 풀 통계 (checkout/대기 횟수, 대기 시간 등)"""
+        if not self.pool:
+            return {}
+        return self.pool.stats()
+
+    def close(self):
+        """풀의 모든 연결 종료"""
+        if self.pool:
+            self.pool.closeall()
 
     def create_tables(self):
         """테이블 생성"""
         try:
-            cursor = self.conn.cursor()
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS reviews (
-                    id SERIAL PRIMARY KEY,
-                    user_id BIGINT NOT NULL,
-                    username TEXT,
-                    movie_title TEXT NOT NULL,
-                    movie_year TEXT,
-                    director TEXT,
-                    score REAL NOT NULL,
-                    one_line_review TEXT NOT NULL,
-                    additional_comment TEXT,
-                    category TEXT DEFAULT 'movie',
-                    created_at TIMESTAMP DEFAULT NOW()
-                )
-            ''')
-
-            # 기존 테이블에 category 컬럼 추가 (이미 존재하면 무시)
-            cursor.execute('''
-                DO $$
-                BEGIN
-                    ALTER TABLE reviews ADD COLUMN category TEXT DEFAULT 'movie';
-                EXCEPTION WHEN duplicate_column THEN NULL;
-                END $$;
-            ''')
-
-            # 기존 테이블에 img_url 컬럼 추가 (이미 존재하면 무시)
-            cursor.execute('''
-                DO $$
-                BEGIN
-                    ALTER TABLE reviews ADD COLUMN img_url TEXT;
-                EXCEPTION WHEN duplicate_column THEN NULL;
-                END $$;
-            ''')
-
-            # 기존 테이블에 message_id, channel_id 컬럼 추가 (이미 존재하면 무시)
-            cursor.execute('''
-                DO $$
-                BEGIN
-                    ALTER TABLE reviews ADD COLUMN message_id BIGINT;
-                EXCEPTION WHEN duplicate_column THEN NULL;
-                END $$;
-            ''')
-            cursor.execute('''
-                DO $$
-                BEGIN
-                    ALTER TABLE reviews ADD COLUMN channel_id BIGINT;
-                EXCEPTION WHEN duplicate_column THEN NULL;
-                END $$;
-            ''')
-
-            # 인덱스 생성 (이미 존재하면 무시됨)
-            cursor.execute('''
-                CREATE INDEX IF NOT EXISTS idx_user_id ON reviews(user_id)
-            ''')
-            cursor.execute('''
-                CREATE INDEX IF NOT EXISTS idx_movie_title ON reviews(movie_title)
-            ''')
-
-            # review_logs 테이블 생성
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS review_logs (
-                    id SERIAL PRIMARY KEY,
-                    user_id BIGINT NOT NULL,
-                    username TEXT,
-                    action TEXT NOT NULL,
-                    movie_title TEXT NOT NULL,
-                    category TEXT,
-                    old_score REAL,
-                    old_one_line_review TEXT,
-                    old_additional_comment TEXT,
-                    new_score REAL,
-                    new_one_line_review TEXT,
-                    new_additional_comment TEXT,
-                    created_at TIMESTAMP DEFAULT NOW()
-                )
-            ''')
-
-            # review_reactions 테이블 생성
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS review_reactions (
-                    id SERIAL PRIMARY KEY,
-                    review_id INTEGER NOT NULL REFERENCES reviews(id) ON DELETE CASCADE,
-                    user_id BIGINT NOT NULL,
-                    username TEXT,
-                    reaction_type TEXT NOT NULL,
-                    created_at TIMESTAMP DEFAULT NOW(),
-                    UNIQUE(review_id, user_id)
-                )
-            ''')
-            cursor.execute('''
-                CREATE INDEX IF NOT EXISTS idx_reactions_review_id ON review_reactions(review_id)
-            ''')
-
-            # review_comments 테이블 생성
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS review_comments (
-                    id SERIAL PRIMARY KEY,
-                    review_id INTEGER NOT NULL REFERENCES reviews(id) ON DELETE CASCADE,
-                    user_id BIGINT NOT NULL,
-                    username TEXT,
-                    content TEXT NOT NULL,
-                    thread_message_id BIGINT,
-                    created_at TIMESTAMP DEFAULT NOW()
-                )
-            ''')
-            cursor.execute('''
-                CREATE INDEX IF NOT EXISTS idx_comments_review_id ON review_comments(review_id)
-            ''')
-
-            # 기존 테이블에 thread_message_id 컬럼 추가 (이미 존재하면 무시)
-            cursor.execute('''
-                DO $$
-                BEGIN
-                    ALTER TABLE review_comments ADD COLUMN thread_message_id BIGINT;
-                EXCEPTION WHEN duplicate_column THEN NULL;
-                END $$;
-            ''')
-
-            # 기존 테이블에 season 컬럼 추가 (이미 존재하면 무시)
-            cursor.execute('''
-                DO $$
-                BEGIN
-                    ALTER TABLE reviews ADD COLUMN season INTEGER;
-                EXCEPTION WHEN duplicate_column THEN NULL;
-                END $$;
-            ''')
-            cursor.execute('''
-                DO $$
-                BEGIN
-                    ALTER TABLE review_logs ADD COLUMN season INTEGER;
-                EXCEPTION WHEN duplicate_column THEN NULL;
-                END $$;
-            ''')
-
-            # contents 테이블 생성 (작품 마스터)
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS contents (
-                    id SERIAL PRIMARY KEY,
-                    title TEXT NOT NULL,
-                    category TEXT NOT NULL,
-                    year_or_platform TEXT,
-                    creator TEXT,
-                    img_url TEXT,
-                    tmdb_id INTEGER,
-                    mangadex_id TEXT,
-                    naver_title_id TEXT,
-                    musicbrainz_id TEXT,
-                    musicbrainz_type TEXT,
-                    igdb_id INTEGER,
-                    steam_appid INTEGER,
-                    created_at TIMESTAMP DEFAULT NOW(),
-                    UNIQUE(title, category)
-                )
-            ''')
-            cursor.execute('''
-                DO $$
-                BEGIN
-                    ALTER TABLE contents ADD COLUMN musicbrainz_id TEXT;
-                EXCEPTION WHEN duplicate_column THEN NULL;
-                END $$;
-            ''')
-            cursor.execute('''
-                DO $$
-                BEGIN
-                    ALTER TABLE contents ADD COLUMN musicbrainz_type TEXT;
-                EXCEPTION WHEN duplicate_column THEN NULL;
-                END $$;
-            ''')
-            cursor.execute('''
-                DO $$
-                BEGIN
-                    ALTER TABLE contents ADD COLUMN igdb_id INTEGER;
-                EXCEPTION WHEN duplicate_column THEN NULL;
-                END $$;
-            ''')
-            cursor.execute('''
-                DO $$
-                BEGIN
-                    ALTER TABLE contents ADD COLUMN steam_appid INTEGER;
-                EXCEPTION WHEN duplicate_column THEN NULL;
-                END $$;
-            ''')
-            cursor.execute('''
-                ALTER TABLE contents DROP CONSTRAINT IF EXISTS contents_title_category_key
-            ''')
-            cursor.execute('''
-                DROP INDEX IF EXISTS idx_contents_title_category_unique
-            ''')
-            cursor.execute('''
-                CREATE UNIQUE INDEX IF NOT EXISTS idx_contents_title_category_unique
-                ON contents(title, category)
-                WHERE category NOT IN ('music_track', 'game')
-            ''')
-            cursor.execute('''
-                CREATE UNIQUE INDEX IF NOT EXISTS idx_contents_music_mbid_unique
-                ON contents(musicbrainz_id, category)
-                WHERE musicbrainz_id IS NOT NULL
-                  AND category = 'music_track'
-            ''')
-            cursor.execute('''
-                CREATE UNIQUE INDEX IF NOT EXISTS idx_contents_music_title_creator_unique
-                ON contents(title, category, COALESCE(creator, ''))
-                WHERE musicbrainz_id IS NULL
-                  AND category = 'music_track'
-            ''')
-            cursor.execute('''
-                CREATE INDEX IF NOT EXISTS idx_contents_category ON contents(category)
-            ''')
-            cursor.execute('''
-                CREATE INDEX IF NOT EXISTS idx_contents_tmdb ON contents(tmdb_id)
-            ''')
-            cursor.execute('''
-                CREATE INDEX IF NOT EXISTS idx_contents_musicbrainz
-                ON contents(musicbrainz_id)
-            ''')
-            cursor.execute('''
-                CREATE UNIQUE INDEX IF NOT EXISTS idx_contents_game_igdb_unique
-                ON contents(igdb_id, category)
-                WHERE igdb_id IS NOT NULL AND category = 'game'
-            ''')
-            cursor.execute('''
-                CREATE UNIQUE INDEX IF NOT EXISTS idx_contents_game_steam_unique
-                ON contents(steam_appid, category)
-                WHERE steam_appid IS NOT NULL AND category = 'game'
-            ''')
-            cursor.execute('''
-                CREATE UNIQUE INDEX IF NOT EXISTS idx_contents_game_title_creator_unique
-                ON contents(title, category, COALESCE(creator, ''))
-                WHERE igdb_id IS NULL
-                  AND steam_appid IS NULL
-                  AND category = 'game'
-            ''')
-
-            # reviews 테이블에 content_id, unit 컬럼 추가
-            cursor.execute('''
-                DO $$
-                BEGIN
-                    ALTER TABLE reviews ADD COLUMN content_id INTEGER;
-                EXCEPTION WHEN duplicate_column THEN NULL;
-                END $$;
-            ''')
-            cursor.execute('''
-                DO $$
-                BEGIN
-                    ALTER TABLE reviews ADD COLUMN unit_from INTEGER;
-                EXCEPTION WHEN duplicate_column THEN NULL;
-                END $$;
-            ''')
-            cursor.execute('''
-                DO $$
-                BEGIN
-                    ALTER TABLE reviews ADD COLUMN unit_to INTEGER;
-                EXCEPTION WHEN duplicate_column THEN NULL;
-                END $$;
-            ''')
-            cursor.execute('''
-                DO $$
-                BEGIN
-                    ALTER TABLE reviews ADD COLUMN latest_units INTEGER;
-                EXCEPTION WHEN duplicate_column THEN NULL;
-                END $$;
-            ''')
-            cursor.execute('''
-                DO $$
-                BEGIN
-                    ALTER TABLE reviews ADD COLUMN source_url TEXT;
-                EXCEPTION WHEN duplicate_column THEN NULL;
-                END $$;
-            ''')
-            cursor.execute('''
-                CREATE INDEX IF NOT EXISTS idx_reviews_content ON reviews(content_id)
-            ''')
-
-            # review_logs 테이블에도 unit 컬럼 추가
-            cursor.execute('''
-                DO $$
-                BEGIN
-                    ALTER TABLE review_logs ADD COLUMN unit_from INTEGER;
-                EXCEPTION WHEN duplicate_column THEN NULL;
-                END $$;
-            ''')
-            cursor.execute('''
-                DO $$
-                BEGIN
-                    ALTER TABLE review_logs ADD COLUMN unit_to INTEGER;
-                EXCEPTION WHEN duplicate_column THEN NULL;
-                END $$;
-            ''')
-            cursor.execute('''
-                DO $$
-                BEGIN
-                    ALTER TABLE review_logs ADD COLUMN latest_units INTEGER;
-                EXCEPTION WHEN duplicate_column THEN NULL;
-                END $$;
-            ''')
-            cursor.execute('''
-                DO $$
-                BEGIN
-                    ALTER TABLE review_logs ADD COLUMN source_url TEXT;
-                EXCEPTION WHEN duplicate_column THEN NULL;
-                END $$;
-            ''')
-
-            self.conn.commit()
-            cursor.close()
-            print("✅ Tables created/verified successfully")
+            with get_conn() as conn:
+                cursor = conn.cursor()
+                cursor.execute('''
+                    CREATE TABLE IF NOT EXISTS reviews (
+                        id SERIAL PRIMARY KEY,
+                        user_id BIGINT NOT NULL,
+                        username TEXT,
+                        movie_title TEXT NOT NULL,
+                        movie_year TEXT,
+                        director TEXT,
+                        score REAL NOT NULL,
+                        one_line_review TEXT NOT NULL,
+                        additional_comment TEXT,
+                        category TEXT DEFAULT 'movie',
+                        created_at TIMESTAMP DEFAULT NOW()
+                    )
+                ''')
+
+                # 기존 테이블에 category 컬럼 추가 (이미 존재하면 무시)
+                cursor.execute('''
+                    DO $$
+                    BEGIN
+                        ALTER TABLE reviews ADD COLUMN category TEXT DEFAULT 'movie';
+                    EXCEPTION WHEN duplicate_column THEN NULL;
+                    END $$;
+                ''')
+
+                # 기존 테이블에 img_url 컬럼 추가 (이미 존재하면 무시)
+                cursor.execute('''
+                    DO $$
+                    BEGIN
+                        ALTER TABLE reviews ADD COLUMN img_url TEXT;
+                    EXCEPTION WHEN duplicate_column THEN NULL;
+                    END $$;
+                ''')
+
+                # 기존 테이블에 message_id, channel_id 컬럼 추가 (이미 존재하면 무시)
+                cursor.execute('''
+                    DO $$
+                    BEGIN
+                        ALTER TABLE reviews ADD COLUMN message_id BIGINT;
+                    EXCEPTION WHEN duplicate_column THEN NULL;
+                    END $$;
+                ''')
+                cursor.execute('''
+                    DO $$
+                    BEGIN
+                        ALTER TABLE reviews ADD COLUMN channel_id BIGINT;
+                    EXCEPTION WHEN duplicate_column THEN NULL;
+                    END $$;
+                ''')
+
+                # 인덱스 생성 (이미 존재하면 무시됨)
+                cursor.execute('''
+                    CREATE INDEX IF NOT EXISTS idx_user_id ON reviews(user_id)
+                ''')
+                cursor.execute('''
+                    CREATE INDEX IF NOT EXISTS idx_movie_title ON reviews(movie_title)
+                ''')
+
+                # review_logs 테이블 생성
+                cursor.execute('''
+                    CREATE TABLE IF NOT EXISTS review_logs (
+                        id SERIAL PRIMARY KEY,
+                        user_id BIGINT NOT NULL,
+                        username TEXT,
+                        action TEXT NOT NULL,
+                        movie_title TEXT NOT NULL,
+                        category TEXT,
+                        old_score REAL,
+                        old_one_line_review TEXT,
+                        old_additional_comment TEXT,
+                        new_score REAL,
+                        new_one_line_review TEXT,
+                        new_additional_comment TEXT,
+                        created_at TIMESTAMP DEFAULT NOW()
+                    )
+                ''')
+
+                # review_reactions 테이블 생성
+                cursor.execute('''
+                    CREATE TABLE IF NOT EXISTS review_reactions (
+                        id SERIAL PRIMARY KEY,
+                        review_id INTEGER NOT NULL REFERENCES reviews(id) ON DELETE CASCADE,
+                        user_id BIGINT NOT NULL,
+                        username TEXT,
+                        reaction_type TEXT NOT NULL,
+                        created_at TIMESTAMP DEFAULT NOW(),
+                        UNIQUE(review_id, user_id)
+                    )
+                ''')
+                cursor.execute('''
+                    CREATE INDEX IF NOT EXISTS idx_reactions_review_id ON review_reactions(review_id)
+                ''')
+
+                # review_comments 테이블 생성
+                cursor.execute('''
+                    CREATE TABLE IF NOT EXISTS review_comments (
+                        id SERIAL PRIMARY KEY,
+                        review_id INTEGER NOT NULL REFERENCES reviews(id) ON DELETE CASCADE,
+                        user_id BIGINT NOT NULL,
+                        username TEXT,
+                        content TEXT NOT NULL,
+                        thread_message_id BIGINT,
+                        created_at TIMESTAMP DEFAULT NOW()
+                    )
+                ''')
+                cursor.execute('''
+                    CREATE INDEX IF NOT EXISTS idx_comments_review_id ON review_comments(review_id)
+                ''')
+
+                # 기존 테이블에 thread_message_id 컬럼 추가 (이미 존재하면 무시)
+                cursor.execute('''
+                    DO $$
+                    BEGIN
+                        ALTER TABLE review_comments ADD COLUMN thread_message_id BIGINT;
+                    EXCEPTION WHEN duplicate_column THEN NULL;
+                    END $$;
+                ''')
+
+                # 기존 테이블에 season 컬럼 추가 (이미 존재하면 무시)
+                cursor.execute('''
+                    DO $$
+                    BEGIN
+                        ALTER TABLE reviews ADD COLUMN season INTEGER;
+                    EXCEPTION WHEN duplicate_column THEN NULL;
+                    END $$;
+                ''')
+                cursor.execute('''
+                    DO $$
+                    BEGIN
+                        ALTER TABLE review_logs ADD COLUMN season INTEGER;
+                    EXCEPTION WHEN duplicate_column THEN NULL;
+                    END $$;
+                ''')
+
+                # contents 테이블 생성 (작품 마스터)
+                cursor.execute('''
+                    CREATE TABLE IF NOT EXISTS contents (
+                        id SERIAL PRIMARY KEY,
+                        title TEXT NOT NULL,
+                        category TEXT NOT NULL,
+                        year_or_platform TEXT,
+                        creator TEXT,
+                        img_url TEXT,
+                        tmdb_id INTEGER,
+                        mangadex_id TEXT,
+                        naver_title_id TEXT,
+                        musicbrainz_id TEXT,
+                        musicbrainz_type TEXT,
+                        igdb_id INTEGER,
+                        steam_appid INTEGER,
+                        created_at TIMESTAMP DEFAULT NOW(),
+                        UNIQUE(title, category)
+                    )
+                ''')
+                cursor.execute('''
+                    DO $$
+                    BEGIN
+                        ALTER TABLE contents ADD COLUMN musicbrainz_id TEXT;
+                    EXCEPTION WHEN duplicate_column THEN NULL;
+                    END $$;
+                ''')
+                cursor.execute('''
+                    DO $$
+                    BEGIN
+                        ALTER TABLE contents ADD COLUMN musicbrainz_type TEXT;
+                    EXCEPTION WHEN duplicate_column THEN NULL;
+                    END $$;
+                ''')
+                cursor.execute('''
+                    DO $$
+                    BEGIN
+                        ALTER TABLE contents ADD COLUMN igdb_id INTEGER;
+                    EXCEPTION WHEN duplicate_column THEN NULL;
+                    END $$;
+                ''')
+                cursor.execute('''
+                    DO $$
+                    BEGIN
+                        ALTER TABLE contents ADD COLUMN steam_appid INTEGER;
+                    EXCEPTION WHEN duplicate_column THEN NULL;
+                    END $$;
+                ''')
+                # 이미 Discord에 올린 포스터 첨부파일 URL (같은 작품 리뷰는 재업로드 없이 재사용)
+                cursor.execute('''
+                    DO $$
+                    BEGIN
+                        ALTER TABLE contents ADD COLUMN discord_image_url TEXT;
+                    EXCEPTION WHEN duplicate_column THEN NULL;
+                    END $$;
+                ''')
+                cursor.execute('''
+                    DO $$
+                    BEGIN
+                        ALTER TABLE contents ADD COLUMN discord_image_source TEXT;
+                    EXCEPTION WHEN duplicate_column THEN NULL;
+                    END $$;
+                ''')
+                # 포스터 첨부파일이 달린 리뷰 메시지 (그 메시지가 지워지면 URL도 못 쓰게 된다)
+                cursor.execute('''
+                    DO $$
+                    BEGIN
+                        ALTER TABLE contents ADD COLUMN discord_image_message_id BIGINT;
+                    EXCEPTION WHEN duplicate_column THEN NULL;
+                    END $$;
+                ''')
+                cursor.execute('''
+                    ALTER TABLE contents DROP CONSTRAINT IF EXISTS contents_title_category_key
+                ''')
+                cursor.execute('''
+                    DROP INDEX IF EXISTS idx_contents_title_category_unique
+                ''')
+                cursor.execute('''
+                    CREATE UNIQUE INDEX IF NOT EXISTS idx_contents_title_category_unique
+                    ON contents(title, category)
+                    WHERE category NOT IN ('music_track', 'game')
+                ''')
+                cursor.execute('''
+                    CREATE UNIQUE INDEX IF NOT EXISTS idx_contents_music_mbid_unique
+                    ON contents(musicbrainz_id, category)
+                    WHERE musicbrainz_id IS NOT NULL
+                      AND category = 'music_track'
+                ''')
+                cursor.execute('''
+                    CREATE UNIQUE INDEX IF NOT EXISTS idx_contents_music_title_creator_unique
+                    ON contents(title, category, COALESCE(creator, ''))
+                    WHERE musicbrainz_id IS NULL
+                      AND category = 'music_track'
+                ''')
+                cursor.execute('''
+                    CREATE INDEX IF NOT EXISTS idx_contents_category ON contents(category)
+                ''')
+                cursor.execute('''
+                    CREATE INDEX IF NOT EXISTS idx_contents_tmdb ON contents(tmdb_id)
+                ''')
+                cursor.execute('''
+                    CREATE INDEX IF NOT EXISTS idx_contents_musicbrainz
+                    ON contents(musicbrainz_id)
+                ''')
+                cursor.execute('''
+                    CREATE UNIQUE INDEX IF NOT EXISTS idx_contents_game_igdb_unique
+                    ON contents(igdb_id, category)
+                    WHERE igdb_id IS NOT NULL AND category = 'game'
+                ''')
+                cursor.execute('''
+                    CREATE UNIQUE INDEX IF NOT EXISTS idx_contents_game_steam_unique
+                    ON contents(steam_appid, category)
+                    WHERE steam_appid IS NOT NULL AND category = 'game'
+                ''')
+                cursor.execute('''
+                    CREATE UNIQUE INDEX IF NOT EXISTS idx_contents_game_title_creator_unique
+                    ON contents(title, category, COALESCE(creator, ''))
+                    WHERE igdb_id IS NULL
+                      AND steam_appid IS NULL
+                      AND category = 'game'
+                ''')
+
+                # reviews 테이블에 content_id, unit 컬럼 추가
+                cursor.execute('''
+                    DO $$
+                    BEGIN
+                        ALTER TABLE reviews ADD COLUMN content_id INTEGER;
+                    EXCEPTION WHEN duplicate_column THEN NULL;
+                    END $$;
+                ''')
+                cursor.execute('''
+                    DO $$
+                    BEGIN
+                        ALTER TABLE reviews ADD COLUMN unit_from INTEGER;
+                    EXCEPTION WHEN duplicate_column THEN NULL;
+                    END $$;
+                ''')
+                cursor.execute('''
+                    DO $$
+                    BEGIN
+                        ALTER TABLE reviews ADD COLUMN unit_to INTEGER;
+                    EXCEPTION WHEN duplicate_column THEN NULL;
+                    END $$;
+                ''')
+                cursor.execute('''
+                    DO $$
+                    BEGIN
+                        ALTER TABLE reviews ADD COLUMN latest_units INTEGER;
+                    EXCEPTION WHEN duplicate_column THEN NULL;
+                    END $$;
+                ''')
+                cursor.execute('''
+                    DO $$
+                    BEGIN
+                        ALTER TABLE reviews ADD COLUMN source_url TEXT;
+                    EXCEPTION WHEN duplicate_column THEN NULL;
+                    END $$;
+                ''')
+                cursor.execute('''
+                    CREATE INDEX IF NOT EXISTS idx_reviews_content ON reviews(content_id)
+                ''')
+                cursor.execute('''
+                    CREATE INDEX IF NOT EXISTS idx_reviews_message_id
+                    ON reviews(message_id)
+                    WHERE message_id IS NOT NULL
+                ''')
+                # 리뷰 수정이 다른 리뷰의 메시지를 가리킬 수 있어 message_id는 유일하지 않다.
+                # 잠깐 배포됐던 UNIQUE 인덱스가 남아 있으면 update_message_id()가 실패하므로 제거
+                cursor.execute('DROP INDEX IF EXISTS uq_reviews_message_id')
+                # 조회 패턴별 인덱스 (migrations/010_query_shape_indexes.sql 참고)
+                cursor.execute('''
+                    CREATE INDEX IF NOT EXISTS idx_reviews_user_content_season
+                    ON reviews(user_id, content_id, season, created_at DESC)
+                ''')
+                cursor.execute('''
+                    CREATE INDEX IF NOT EXISTS idx_reviews_user_created
+                    ON reviews(user_id, created_at DESC, id DESC)
+                ''')
+                cursor.execute('''
+                    CREATE INDEX IF NOT EXISTS idx_reviews_legacy_title
+                    ON reviews(user_id, movie_title, category)
+                    WHERE content_id IS NULL
+                ''')
+                cursor.execute('''
+                    CREATE INDEX IF NOT EXISTS idx_contents_title ON contents(title, category)
+                ''')
+                cursor.execute('''
+                    CREATE INDEX IF NOT EXISTS idx_review_logs_user_created
+                    ON review_logs(user_id, created_at DESC, id DESC)
+                ''')
+
+                # review_logs 테이블에도 unit 컬럼 추가
+                cursor.execute('''
+                    DO $$
+                    BEGIN
+                        ALTER TABLE review_logs ADD COLUMN unit_from INTEGER;
+                    EXCEPTION WHEN duplicate_column THEN NULL;
+                    END $$;
+                ''')
+                cursor.execute('''
+                    DO $$
+                    BEGIN
+                        ALTER TABLE review_logs ADD COLUMN unit_to INTEGER;
+                    EXCEPTION WHEN duplicate_column THEN NULL;
+                    END $$;
+                ''')
+                cursor.execute('''
+                    DO $$
+                    BEGIN
+                        ALTER TABLE review_logs ADD COLUMN latest_units INTEGER;
+                    EXCEPTION WHEN duplicate_column THEN NULL;
+                    END $$;
+                ''')
+                cursor.execute('''
+                    DO $$
+                    BEGIN
+                        ALTER TABLE review_logs ADD COLUMN source_url TEXT;
+                    EXCEPTION WHEN duplicate_column THEN NULL;
+                    END $$;
+                ''')
+
+                # 외부 API 메타데이터 영구 캐시 (재시작 후에도 유지)
+                cursor.execute('''
+                    CREATE TABLE IF NOT EXISTS metadata_cache (
+                        provider TEXT NOT NULL,
+                        cache_key TEXT NOT NULL,
+                        payload JSONB NOT NULL,
+                        fetched_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+                        expires_at TIMESTAMPTZ NOT NULL,
+                        PRIMARY KEY (provider, cache_key)
+                    )
+                ''')
+                cursor.execute('''
+                    CREATE INDEX IF NOT EXISTS idx_metadata_cache_fetched_at
+                    ON metadata_cache(fetched_at)
+                ''')
+
+                # 레거시 리뷰 마이그레이션 진행 위치 (중단 후 이어하기용)
+                cursor.execute('''
+                    CREATE TABLE IF NOT EXISTS migration_checkpoints (
+                        channel_id BIGINT PRIMARY KEY,
+                        last_message_id BIGINT,
+                        target_count INTEGER NOT NULL,
+                        processed INTEGER NOT NULL DEFAULT 0,
+                        migrated INTEGER NOT NULL DEFAULT 0,
+                        skipped INTEGER NOT NULL DEFAULT 0,
+                        failed INTEGER NOT NULL DEFAULT 0,
+                        status TEXT NOT NULL DEFAULT 'running',
+                        started_at TIMESTAMP DEFAULT NOW(),
+                        updated_at TIMESTAMP DEFAULT NOW()
+                    )
+                ''')
+                # 파싱에 실패한 message_id (이어하기에서 다시 시도, 끝나면 관리자에게 보고)
+                cursor.execute('''
+                    DO $$
+                    BEGIN
+                        ALTER TABLE migration_checkpoints
+                        ADD COLUMN failed_message_ids BIGINT[] NOT NULL DEFAULT '{}';
+                    EXCEPTION WHEN duplicate_column THEN NULL;
+                    END $$;
+                ''')
+
+                # 리뷰 제출 함수 (한 번의 왕복으로 작품 UPSERT + 중복 검사 + 저장)
+                cursor.execute(SUBMIT_REVIEW_FUNCTIONS_SQL)
+
+                # 랭킹용 반응 집계 테이블 (처음 만들 때만 백필)
+                cursor.execute("SELECT to_regclass('review_reaction_totals') IS NULL")
+                needs_backfill = cursor.fetchone()[0]
+                cursor.execute(REVIEW_REACTION_TOTALS_SQL)
+                if needs_backfill:
+                    cursor.execute(REVIEW_REACTION_TOTALS_BACKFILL_SQL)
+
+                cursor.close()
+            logger.info("✅ Tables created/verified successfully")
         except Exception as e:
-            print(f"❌ Table creation failed: {e}")
+            logger.error("❌ Table creation failed: %s", e)
+
+    def _invalidate_review_cache(self, review_id, message_id=None):
+        """리뷰 수정/삭제 후 message_id 캐시 무효화"""
+        self.review_cache.invalidate_review(review_id)
+        if message_id is not None:
+            self.review_cache.invalidate_message(message_id)
 
     @staticmethod
     def _build_season_clause(season, column='r.season'):
@@ -433,6 +1238,7 @@ class Database:
                             musicbrainz_type, igdb_id, steam_appid, existing[0]
                         ))
                         conn.commit()
+                        self.title_index.add_content(existing[0], title, category)
                         # 기존 작품이 있으면 ID 반환
                         return existing[0]
                     else:
@@ -449,9 +1255,11 @@ class Database:
                               musicbrainz_id, musicbrainz_type, igdb_id, steam_appid))
 
                         conn.commit()
-                        return cursor.fetchone()[0]
+                        content_id = cursor.fetchone()[0]
+                        self.title_index.add_content(content_id, title, category)
+                        return content_id
         except Exception as e:
-            print(f"❌ Failed to get_or_create_content: {e}")
+            logger.error("❌ Failed to get_or_create_content: %s", e)
             return None
 
     def save_review_v2(self, user_id, username, content_id, score,
@@ -477,11 +1285,10 @@ class Database:
                     unit_from = None
                     if unit_to is not None:
                         season_clause, season_params = self._build_season_clause(season, 'season')
-                        cursor.execute(f'''
-                            SELECT MAX(unit_to) FROM reviews
-                            WHERE user_id = %s AND content_id = %s
-                            {season_clause}
-                        ''', (user_id, content_id) + season_params)
+                        cursor.execute(
+                            MAX_UNIT_TO_SQL.format(season_clause=season_clause),
+                            (user_id, content_id) + season_params
+                        )
 
                         max_unit = cursor.fetchone()[0]
                         unit_from = (max_unit + 1) if max_unit else 1
@@ -501,9 +1308,11 @@ class Database:
                           channel_id, season, latest_units, source_url))
 
                     conn.commit()
-                    return cursor.fetchone()[0]
+                    review_id = cursor.fetchone()[0]
+                    self.title_index.add_review(user_id, content_id, content_title, content_category)
+                    return review_id
         except Exception as e:
-            print(f"❌ Failed to save review (v2): {e}")
+            logger.error("❌ Failed to save review (v2): %s", e)
             return None
 
     def has_review_v2(self, user_id, content_id, unit_to=None, season=None):
@@ -523,20 +1332,75 @@ class Database:
                         return cursor.fetchone() is not None
                     else:
                         # 구간 평: 기존 max(unit_to)보다 큰지 확인 (회고 차단)
-                        cursor.execute(f'''
-                            SELECT MAX(unit_to) FROM reviews
-                            WHERE user_id = %s AND content_id = %s
-                            {season_clause}
-                        ''', (user_id, content_id) + season_params)
+                        cursor.execute(
+                            MAX_UNIT_TO_SQL.format(season_clause=season_clause),
+                            (user_id, content_id) + season_params
+                        )
 
                         max_unit = cursor.fetchone()[0]
                         if max_unit and unit_to <= max_unit:
                             return True  # 회고 입력 차단
                         return False
         except Exception as e:
-            print(f"❌ Failed to check review (v2): {e}")
+            logger.error("❌ Failed to check review (v2): %s", e)
             return False
 
+    def submit_review(self, user_id, username, title, category, score,
+                      one_line_review, additional_comment, year_or_platform=None,
+                      creator=None, img_url=None, tmdb_id=None, mangadex_id=None,
+                      naver_title_id=None, musicbrainz_id=None, musicbrainz_type=None,
+                      igdb_id=None, steam_appid=None, unit_to=None, season=None,
+                      latest_units=None, source_url=None):
+        """작품 UPSERT + 중복/회고 검사 + 리뷰 저장을 DB 함수 한 번으로 처리.
+
+        Returns:
+            dict: {'status', 'content_id', 'review_id', 'unit_from'}
+                  status는 'created' | 'duplicate' | 'retro'. 실패 시 None
+        """
+        try:
+            with get_conn() as conn:
+                with conn.cursor(cursor_factory=RealDictCursor) as cursor:
+                    cursor.execute('''
+                        SELECT status, content_id, review_id, unit_from
+                        FROM submit_review(
+                            p_user_id => %s::bigint,
+                            p_username => %s::text,
+                            p_title => %s::text,
+                            p_category => %s::text,
+                            p_score => %s::real,
+                            p_one_line_review => %s::text,
+                            p_additional_comment => %s::text,
+                            p_year_or_platform => %s::text,
+                            p_creator => %s::text,
+                            p_img_url => %s::text,
+                            p_tmdb_id => %s::integer,
+                            p_mangadex_id => %s::text,
+                            p_naver_title_id => %s::text,
+                            p_musicbrainz_id => %s::text,
+                            p_musicbrainz_type => %s::text,
+                            p_igdb_id => %s::integer,
+                            p_steam_appid => %s::integer,
+                            p_unit_to => %s::integer,
+                            p_season => %s::integer,
+                            p_latest_units => %s::integer,
+                            p_source_url => %s::text
+                        )
+                    ''', (
+                        user_id, username, title, category, score,
+                        one_line_review, additional_comment,
+                        year_or_platform, creator, img_url,
+                        tmdb_id, mangadex_id, naver_title_id,
+                        musicbrainz_id, musicbrainz_type, igdb_id, steam_appid,
+                        unit_to, season, latest_units, source_url
+                    ))
+                    row = cursor.fetchone()
+                    if row and row['review_id']:
+                        self.title_index.add_review(user_id, row['content_id'], title, category)
+                    return dict(row) if row else None
+        except Exception as e:
+            logger.error("❌ Failed to submit review: %s", e)
+            return None
+
     def update_message_id(self, review_id, message_id, channel_id):
         """리뷰의 message_id, channel_id 업데이트"""
         try:
@@ -548,9 +1412,11 @@ class Database:
                         WHERE id = %s
                     ''', (message_id, channel_id, review_id))
                     conn.commit()
+                    self.review_cache.invalidate_review(review_id)
+                    self.review_cache.invalidate_message(message_id)
                     return True
         except Exception as e:
-            print(f"❌ Failed to update message_id: {e}")
+            logger.error("❌ Failed to update message_id: %s", e)
             return False
 
     def get_user_reviews(self, user_id, limit=10, category=None):
@@ -561,63 +1427,15 @@ class Database:
                     category_clause = ""
                     params = [user_id]
                     if category:
-                        category_clause = "AND (r.category = %s OR c.category = %s)"
+                        category_clause = USER_REVIEWS_CATEGORY_CLAUSE
                         params.extend([category, category])
                     params.append(limit)
 
-                    cursor.execute(f'''
-                        WITH joined_reviews AS (
-                            SELECT
-                                r.id,
-                                r.user_id,
-                                r.username,
-                                COALESCE(c.title, r.movie_title) as movie_title,
-                                COALESCE(c.category, r.category) as category,
-                                COALESCE(c.year_or_platform, r.movie_year) as movie_year,
-                                COALESCE(c.creator, r.director) as director,
-                                r.score,
-                                r.one_line_review,
-                                r.additional_comment,
-                                r.created_at,
-                                COALESCE(c.img_url, r.img_url) as img_url,
-                                r.message_id,
-                                r.channel_id,
-                                r.content_id,
-                                r.unit_from,
-                                r.unit_to,
-                                r.latest_units,
-                                r.source_url,
-                                r.season,
-                                c.title as content_title,
-                                c.category as content_category,
-                                c.year_or_platform,
-                                c.creator,
-                                c.img_url as content_img_url
-                            FROM reviews r
-                            LEFT JOIN contents c ON r.content_id = c.id
-                            WHERE r.user_id = %s
-                              {category_clause}
-                        ),
-                        latest_reviews AS (
-                            SELECT
-                                joined_reviews.*,
-                                ROW_NUMBER() OVER (
-                                    PARTITION BY
-                                        COALESCE(content_id::text, movie_title || '|' || COALESCE(category, '')),
-                                        COALESCE(season, 0)
-                                    ORDER BY created_at DESC, id DESC
-                                ) as rn
-                            FROM joined_reviews
-                        )
-                        SELECT * FROM latest_reviews
-                        WHERE rn = 1
-                        ORDER BY created_at DESC, id DESC
-                        LIMIT %s
-                    ''', tuple(params))
+                    cursor.execute(USER_REVIEWS_SQL.format(category_clause=category_clause), tuple(params))
 
                     return cursor.fetchall()
         except Exception as e:
-            print(f"❌ Failed to get user reviews: {e}")
+            logger.error("❌ Failed to get user reviews: %s", e)
             return []
 
     def get_content_stats(self, title, category=None):
@@ -657,7 +1475,7 @@ class Database:
                     stats = cursor.fetchone()
                     return stats
         except Exception as e:
-            print(f"❌ Failed to get content stats: {e}")
+            logger.error("❌ Failed to get content stats: %s", e)
             return None
 
     def delete_review(self, user_id, title, category=None, season=_NO_SEASON_FILTER):
@@ -667,47 +1485,23 @@ class Database:
                 with conn.cursor(cursor_factory=RealDictCursor) as cursor:
                     # content_id 기반 삭제
                     season_clause, season_params = self._build_season_clause(season)
-                    if category:
-                        cursor.execute(f'''
-                            WITH target AS (
-                                SELECT r.id
-                                FROM reviews r
-                                JOIN contents c ON r.content_id = c.id
-                                WHERE r.user_id = %s
-                                  AND c.title = %s
-                                  AND c.category = %s
-                                  {season_clause}
-                                ORDER BY r.created_at DESC, r.id DESC
-                                LIMIT 1
-                            )
-                            DELETE FROM reviews r
-                            USING target
-                            WHERE r.id = target.id
-                            RETURNING r.id
-                        ''', (user_id, title, category) + season_params)
-                    else:
-                        cursor.execute(f'''
-                            WITH target AS (
-                                SELECT r.id
-                                FROM reviews r
-                                JOIN contents c ON r.content_id = c.id
-                                WHERE r.user_id = %s
-                                  AND c.title = %s
-                                  {season_clause}
-                                ORDER BY r.created_at DESC, r.id DESC
-                                LIMIT 1
-                            )
-                            DELETE FROM reviews r
-                            USING target
-                            WHERE r.id = target.id
-                            RETURNING r.id
-                        ''', (user_id, title) + season_params)
+                    category_clause = CONTENT_CATEGORY_CLAUSE if category else ""
+                    category_params = (category,) if category else ()
+                    cursor.execute(
+                        DELETE_REVIEW_SQL.format(category_clause=category_clause, season_clause=season_clause),
+                        (user_id, title) + category_params + season_params
+                    )
 
                     deleted = cursor.fetchone()
+                    if deleted:
+                        self._clear_content_discord_image(cursor, deleted['message_id'], deleted['content_id'])
                     conn.commit()
+                    if deleted:
+                        self._invalidate_review_cache(deleted['id'], deleted['message_id'])
+                        self.title_index.remove_review(user_id, deleted['content_id'])
                     return deleted is not None
         except Exception as e:
-            print(f"❌ Failed to delete review: {e}")
+            logger.error("❌ Failed to delete review: %s", e)
             return False
 
     def delete_review_by_id(self, user_id, review_id):
@@ -718,13 +1512,18 @@ class Database:
                     cursor.execute('''
                         DELETE FROM reviews
                         WHERE id = %s AND user_id = %s
-                        RETURNING id
+                        RETURNING id, message_id, content_id
                     ''', (review_id, user_id))
                     deleted = cursor.fetchone()
+                    if deleted:
+                        self._clear_content_discord_image(cursor, deleted[1], deleted[2])
                     conn.commit()
+                    if deleted:
+                        self._invalidate_review_cache(deleted[0], deleted[1])
+                        self.title_index.remove_review(user_id, deleted[2])
                     return deleted is not None
         except Exception as e:
-            print(f"❌ Failed to delete review by id: {e}")
+            logger.error("❌ Failed to delete review by id: %s", e)
             return False
 
     def get_user_review(self, user_id, title, category=None, season=_NO_SEASON_FILTER):
@@ -734,46 +1533,16 @@ class Database:
                 with conn.cursor(cursor_factory=RealDictCursor) as cursor:
                     # content_id 기반 조회 (JOIN)
                     season_clause, season_params = self._build_season_clause(season)
-                    if category:
-                        cursor.execute(f'''
-                            SELECT
-                                r.*,
-                                COALESCE(c.title, r.movie_title) as movie_title,
-                                COALESCE(c.category, r.category) as category,
-                                COALESCE(c.year_or_platform, r.movie_year) as movie_year,
-                                COALESCE(c.creator, r.director) as director,
-                                COALESCE(c.img_url, r.img_url) as img_url,
-                                c.title as content_title,
-                                c.category as content_category
-                            FROM reviews r
-                            JOIN contents c ON r.content_id = c.id
-                            WHERE r.user_id = %s AND c.title = %s AND c.category = %s
-                              {season_clause}
-                            ORDER BY r.created_at DESC
-                            LIMIT 1
-                        ''', (user_id, title, category) + season_params)
-                    else:
-                        cursor.execute(f'''
-                            SELECT
-                                r.*,
-                                COALESCE(c.title, r.movie_title) as movie_title,
-                                COALESCE(c.category, r.category) as category,
-                                COALESCE(c.year_or_platform, r.movie_year) as movie_year,
-                                COALESCE(c.creator, r.director) as director,
-                                COALESCE(c.img_url, r.img_url) as img_url,
-                                c.title as content_title,
-                                c.category as content_category
-                            FROM reviews r
-                            JOIN contents c ON r.content_id = c.id
-                            WHERE r.user_id = %s AND c.title = %s
-                              {season_clause}
-                            ORDER BY r.created_at DESC
-                            LIMIT 1
-                        ''', (user_id, title) + season_params)
+                    category_clause = CONTENT_CATEGORY_CLAUSE if category else ""
+                    category_params = (category,) if category else ()
+                    cursor.execute(
+                        USER_REVIEW_SQL.format(category_clause=category_clause, season_clause=season_clause),
+                        (user_id, title) + category_params + season_params
+                    )
 
                     return cursor.fetchone()
         except Exception as e:
-            print(f"❌ Failed to get user review: {e}")
+            logger.error("❌ Failed to get user review: %s", e)
             return None
 
     def update_review(self, user_id, title, category, score, one_line_review, additional_comment,
@@ -804,14 +1573,16 @@ class Database:
                         UPDATE reviews
                         SET score = %s, one_line_review = %s, additional_comment = %s
                         WHERE id = %s
-                        RETURNING id
+                        RETURNING id, message_id
                     ''', (score, one_line_review, additional_comment, review_id))
 
                     updated = cursor.fetchone()
                     conn.commit()
+                    if updated:
+                        self._invalidate_review_cache(updated[0], updated[1])
                     return updated is not None
         except Exception as e:
-            print(f"❌ Failed to update review: {e}")
+            logger.error("❌ Failed to update review: %s", e)
             return False
 
     def log_review_action(self, user_id, username, action, movie_title, category,
@@ -837,10 +1608,10 @@ class Database:
                         season, unit_from, unit_to, latest_units, source_url
                     ))
                     conn.commit()
-                    print(f"✅ Review log saved: {action} - {movie_title}")
+                    logger.debug("✅ Review log saved: %s - %s", action, movie_title)
                     return True
         except Exception as e:
-            print(f"❌ Failed to save review log: {e}")
+            logger.error("❌ Failed to save review log: %s", e)
             return False
 
     def get_review_history(self, user_id, title, category=None, season=_NO_SEASON_FILTER, limit=10):
@@ -850,43 +1621,21 @@ class Database:
                 with conn.cursor(cursor_factory=RealDictCursor) as cursor:
                     season_clause, season_params = self._build_season_clause(season)
                     if category:
-                        cursor.execute(f'''
-                            SELECT
-                                r.*,
-                                COALESCE(c.title, r.movie_title) as movie_title,
-                                COALESCE(c.category, r.category) as category,
-                                COALESCE(c.year_or_platform, r.movie_year) as movie_year,
-                                COALESCE(c.creator, r.director) as director,
-                                COALESCE(c.img_url, r.img_url) as img_url
-                            FROM reviews r
-                            LEFT JOIN contents c ON r.content_id = c.id
-                            WHERE r.user_id = %s
-                              AND COALESCE(c.title, r.movie_title) = %s
-                              AND COALESCE(c.category, r.category) = %s
-                              {season_clause}
-                            ORDER BY r.created_at DESC, r.id DESC
-                            LIMIT %s
-                        ''', (user_id, title, category) + season_params + (limit,))
+                        query = REVIEW_HISTORY_SQL.format(
+                            contents_category_clause=HISTORY_CONTENTS_CATEGORY_CLAUSE,
+                            legacy_category_clause=HISTORY_LEGACY_CATEGORY_CLAUSE,
+                            season_clause=season_clause,
+                        )
+                        params = (user_id, title, category, title, category)
                     else:
-                        cursor.execute(f'''
-                            SELECT
-                                r.*,
-                                COALESCE(c.title, r.movie_title) as movie_title,
-                                COALESCE(c.category, r.category) as category,
-                                COALESCE(c.year_or_platform, r.movie_year) as movie_year,
-                                COALESCE(c.creator, r.director) as director,
-                                COALESCE(c.img_url, r.img_url) as img_url
-                            FROM reviews r
-                            LEFT JOIN contents c ON r.content_id = c.id
-                            WHERE r.user_id = %s
-                              AND COALESCE(c.title, r.movie_title) = %s
-                              {season_clause}
-                            ORDER BY r.created_at DESC, r.id DESC
-                            LIMIT %s
-                        ''', (user_id, title) + season_params + (limit,))
+                        query = REVIEW_HISTORY_SQL.format(
+                            contents_category_clause="", legacy_category_clause="", season_clause=season_clause
+                        )
+                        params = (user_id, title, title)
+                    cursor.execute(query, params + season_params + (limit,))
                     return cursor.fetchall()
         except Exception as e:
-            print(f"❌ Failed to get review history: {e}")
+            logger.error("❌ Failed to get review history: %s", e)
             return []
 
     def get_review_logs(self, user_id, title=None, category=None, season=_NO_SEASON_FILTER, limit=10):
@@ -905,18 +1654,11 @@ class Database:
                         filters.append("category = %s")
                         params.append(category)
 
-                    query = f'''
-                        SELECT *
-                        FROM review_logs
-                        WHERE {' AND '.join(filters)}
-                          {season_clause}
-                        ORDER BY created_at DESC, id DESC
-                        LIMIT %s
-                    '''
+                    query = REVIEW_LOGS_SQL.format(filters=' AND '.join(filters), season_clause=season_clause)
                     cursor.execute(query, tuple(params) + season_params + (limit,))
                     return cursor.fetchall()
         except Exception as e:
-            print(f"❌ Failed to get review logs: {e}")
+            logger.error("❌ Failed to get review logs: %s", e)
             return []
 
     def get_user_reviews_for_title(self, user_id, title, category):
@@ -941,11 +1683,14 @@ class Database:
                     ''', (user_id, title, category))
                     return cursor.fetchall()
         except Exception as e:
-            print(f"❌ Failed to get user reviews for title: {e}")
+            logger.error("❌ Failed to get user reviews for title: %s", e)
             return []
 
     def get_review_by_message_id(self, message_id):
-        """message_id로 리뷰 조회"""
+        """message_id로 리뷰 조회 (review_cache 우선)"""
+        cached = self.review_cache.get(message_id)
+        if cached is not None:
+            return cached
         try:
             with get_conn() as conn:
                 with conn.cursor(cursor_factory=RealDictCursor) as cursor:
@@ -961,9 +1706,12 @@ class Database:
                         LEFT JOIN contents c ON r.content_id = c.id
                         WHERE r.message_id = %s
                     ''', (message_id,))
-                    return cursor.fetchone()
+                    row = cursor.fetchone()
+                    if row:
+                        self.review_cache.put(message_id, row)
+                    return row
         except Exception as e:
-            print(f"❌ Failed to get review by message_id: {e}")
+            logger.error("❌ Failed to get review by message_id: %s", e)
             return None
 
     def toggle_reaction(self, review_id, user_id, username, reaction_type):
@@ -1006,7 +1754,7 @@ class Database:
                         conn.commit()
                         return ('added', reaction_type)
         except Exception as e:
-            print(f"❌ Failed to toggle reaction: {e}")
+            logger.error("❌ Failed to toggle reaction: %s", e)
             return (None, None)
 
     def ensure_reaction(self, review_id, user_id, username, reaction_type):
@@ -1044,7 +1792,7 @@ class Database:
                         conn.commit()
                         return ('added', reaction_type)
         except Exception as e:
-            print(f"❌ Failed to ensure reaction: {e}")
+            logger.error("❌ Failed to ensure reaction: %s", e)
             return (None, None)
 
     def get_reaction_counts(self, review_id):
@@ -1060,7 +1808,29 @@ class Database:
                     ''', (review_id,))
                     return {row[0]: row[1] for row in cursor.fetchall()}
         except Exception as e:
-            print(f"❌ Failed to get reaction counts: {e}")
+            logger.error("❌ Failed to get reaction counts: %s", e)
+            return {}
+
+    def get_reaction_counts_bulk(self, review_ids):
+        """여러 리뷰의 반응 카운트를 한 번에 조회. {review_id: {reaction_type: count}}"""
+        review_ids = list(review_ids)
+        if not review_ids:
+            return {}
+        try:
+            with get_conn() as conn:
+                with conn.cursor() as cursor:
+                    cursor.execute('''
+                        SELECT review_id, reaction_type, COUNT(*) as cnt
+                        FROM review_reactions
+                        WHERE review_id = ANY(%s)
+                        GROUP BY review_id, reaction_type
+                    ''', (review_ids,))
+                    counts = {review_id: {} for review_id in review_ids}
+                    for review_id, reaction_type, cnt in cursor.fetchall():
+                        counts[review_id][reaction_type] = cnt
+                    return counts
+        except Exception as e:
+            logger.error("❌ Failed to get reaction counts (bulk): %s", e)
             return {}
 
     def get_user_reaction(self, review_id, user_id):
@@ -1075,7 +1845,7 @@ class Database:
                     result = cursor.fetchone()
                     return result[0] if result else None
         except Exception as e:
-            print(f"❌ Failed to get user reaction: {e}")
+            logger.error("❌ Failed to get user reaction: %s", e)
             return None
 
     def add_comment(self, review_id, user_id, username, content, thread_message_id=None):
@@ -1091,7 +1861,7 @@ class Database:
                     conn.commit()
                     return cursor.fetchone()[0]
         except Exception as e:
-            print(f"❌ Failed to add comment: {e}")
+            logger.error("❌ Failed to add comment: %s", e)
             return None
 
     def get_user_comment_message_id(self, review_id, user_id):
@@ -1106,7 +1876,7 @@ class Database:
                     result = cursor.fetchone()
                     return result[0] if result else None
         except Exception as e:
-            print(f"❌ Failed to get user comment message_id: {e}")
+            logger.error("❌ Failed to get user comment message_id: %s", e)
             return None
 
     def get_comments(self, review_id, limit=20):
@@ -1122,7 +1892,7 @@ class Database:
                     ''', (review_id, limit))
                     return cursor.fetchall()
         except Exception as e:
-            print(f"❌ Failed to get comments: {e}")
+            logger.error("❌ Failed to get comments: %s", e)
             return []
 
     def get_comment_count(self, review_id):
@@ -1136,7 +1906,7 @@ class Database:
                     ''', (review_id,))
                     return cursor.fetchone()[0]
         except Exception as e:
-            print(f"❌ Failed to get comment count: {e}")
+            logger.error("❌ Failed to get comment count: %s", e)
             return 0
 
     def has_user_comment(self, review_id, user_id):
@@ -1150,7 +1920,7 @@ class Database:
                     ''', (review_id, user_id))
                     return cursor.fetchone() is not None
         except Exception as e:
-            print(f"❌ Failed to check user comment: {e}")
+            logger.error("❌ Failed to check user comment: %s", e)
             return False
 
     def delete_user_comment(self, review_id, user_id):
@@ -1165,54 +1935,28 @@ class Database:
                     conn.commit()
                     return True
         except Exception as e:
-            print(f"❌ Failed to delete user comment: {e}")
+            logger.error("❌ Failed to delete user comment: %s", e)
             return False
 
     def get_review_ranking(self, limit=10, category=None):
-        """반응 많은 리뷰 랭킹"""
+        """반응 많은 리뷰 랭킹 (reaction_breakdown: 반응 종류별 개수 dict 포함)
+
+        트리거로 유지되는 review_reaction_totals 인덱스를 따라 limit개만 읽는다.
+        """
         try:
             with get_conn() as conn:
                 with conn.cursor(cursor_factory=RealDictCursor) as cursor:
+                    category_clause = ""
+                    params = []
                     if category:
-                        cursor.execute('''
-                            SELECT
-                                r.*,
-                                COALESCE(c.title, r.movie_title) as movie_title,
-                                COALESCE(c.category, r.category) as category,
-                                COALESCE(c.year_or_platform, r.movie_year) as movie_year,
-                                COALESCE(c.creator, r.director) as director,
-                                COALESCE(c.img_url, r.img_url) as img_url,
-                                COUNT(rr.id) as reaction_count
-                            FROM reviews r
-                            LEFT JOIN contents c ON r.content_id = c.id
-                            LEFT JOIN review_reactions rr ON r.id = rr.review_id
-                            WHERE COALESCE(c.category, r.category) = %s
-                            GROUP BY r.id, c.title, c.category, c.year_or_platform, c.creator, c.img_url
-                            HAVING COUNT(rr.id) > 0
-                            ORDER BY reaction_count DESC, r.created_at DESC
-                            LIMIT %s
-                        ''', (category, limit))
-                    else:
-                        cursor.execute('''
-                            SELECT
-                                r.*,
-                                COALESCE(c.title, r.movie_title) as movie_title,
-                                COALESCE(c.category, r.category) as category,
-                                COALESCE(c.year_or_platform, r.movie_year) as movie_year,
-                                COALESCE(c.creator, r.director) as director,
-                                COALESCE(c.img_url, r.img_url) as img_url,
-                                COUNT(rr.id) as reaction_count
-                            FROM reviews r
-                            LEFT JOIN contents c ON r.content_id = c.id
-                            LEFT JOIN review_reactions rr ON r.id = rr.review_id
-                            GROUP BY r.id, c.title, c.category, c.year_or_platform, c.creator, c.img_url
-                            HAVING COUNT(rr.id) > 0
-                            ORDER BY reaction_count DESC, r.created_at DESC
-                            LIMIT %s
-                        ''', (limit,))
+                        category_clause = REVIEW_RANKING_CATEGORY_CLAUSE
+                        params.append(category)
+                    params.append(limit)
+
+                    cursor.execute(REVIEW_RANKING_SQL.format(category_clause=category_clause), params)
                     return cursor.fetchall()
         except Exception as e:
-            print(f"❌ Failed to get review ranking: {e}")
+            logger.error("❌ Failed to get review ranking: %s", e)
             return []
 
     def save_migrated_review(self, user_id, username, movie_title, movie_year, director,
@@ -1251,5 +1995,570 @@ class Database:
                     conn.commit()
                     return cursor.fetchone()[0]
         except Exception as e:
-            print(f"❌ Failed to save migrated review: {e}")
+            logger.error("❌ Failed to save migrated review: %s", e)
+            return None
+
+    def save_migrated_reviews_bulk(self, reviews):
+        """마이그레이션된 리뷰 여러 개를 한 번의 INSERT로 저장.
+
+        같은 message_id의 리뷰가 이미 있으면 건너뛰므로 다시 실행해도 중복되지 않는다.
+        (동시에 실행된 마이그레이션끼리는 advisory lock으로 순서대로 저장)
+        제목+카테고리가 같은 작품이 contents에 정확히 하나 있으면 content_id를 연결한다.
+        (같은 제목의 곡/게임이 여러 개면 잘못 연결하지 않도록 비워 둔다. 새 작품은 만들지 않음)
+
+        Args:
+            reviews: save_migrated_review와 같은 키를 가진 dict 목록
+
+        Returns:
+            int: 새로 저장된 행 수. 실패 시 None
+        """
+        if not reviews:
+            return 0
+        values = [
+            (
+                review['user_id'], review['username'], review['movie_title'],
+                review.get('movie_year'), review.get('director'), review['score'],
+                review['one_line_review'], review.get('category', 'movie'),
+                review.get('message_id'), review.get('channel_id'),
+                review.get('created_at'), review.get('season')
+            )
+            for review in reviews
+        ]
+        try:
+            with get_conn() as conn:
+                with conn.cursor() as cursor:
+                    cursor.execute("SELECT pg_advisory_xact_lock(hashtext('save_migrated_reviews'))")
+                    inserted = execute_values(cursor, '''
+                        INSERT INTO reviews
+                        (user_id, username, movie_title, movie_year, director, score,
+                         one_line_review, additional_comment, category, img_url, content_id,
+                         message_id, channel_id, created_at, season)
+                        SELECT v.user_id, v.username, v.movie_title,
+                               COALESCE(v.movie_year, c.year_or_platform), COALESCE(v.director, c.creator),
+                               v.score, v.one_line_review, NULL, v.category, c.img_url, c.id,
+                               v.message_id, v.channel_id, COALESCE(v.created_at, NOW()), v.season
+                        FROM (VALUES %s) AS v(
+                            user_id, username, movie_title, movie_year, director, score,
+                            one_line_review, category, message_id, channel_id, created_at, season
+                        )
+                        LEFT JOIN LATERAL (
+                            SELECT MIN(id) AS id
+                            FROM contents
+                            WHERE title = v.movie_title AND category = v.category
+                            HAVING COUNT(*) = 1
+                        ) matched ON TRUE
+                        LEFT JOIN contents c ON c.id = matched.id
+                        WHERE NOT EXISTS (
+                            SELECT 1 FROM reviews r WHERE r.message_id = v.message_id
+                        )
+                        RETURNING user_id, content_id, movie_title, category
+                    ''', values,
+                        template="(%s::bigint, %s, %s, %s, %s, %s::real, %s, %s, "
+                                 "%s::bigint, %s::bigint, %s::timestamp, %s::integer)",
+                        page_size=len(values),
+                        fetch=True
+                    )
+                    conn.commit()
+                    # content_id가 연결된 행은 제목/카테고리가 contents와 같다
+                    for user_id, content_id, title, category in inserted:
+                        self.title_index.add_review(user_id, content_id, title, category)
+                    return len(inserted)
+        except Exception as e:
+            logger.error("❌ Failed to save migrated reviews (bulk): %s", e)
+            return None
+
+    def get_migration_checkpoint(self, channel_id):
+        """채널의 마이그레이션 진행 위치 조회 (없으면 None)"""
+        try:
+            with get_conn() as conn:
+                with conn.cursor(cursor_factory=RealDictCursor) as cursor:
+                    cursor.execute('''
+                        SELECT channel_id, last_message_id, target_count, processed,
+                               migrated, skipped, failed, failed_message_ids, status,
+                               started_at, updated_at
+                        FROM migration_checkpoints
+                        WHERE channel_id = %s
+                    ''', (channel_id,))
+                    row = cursor.fetchone()
+                    return dict(row) if row else None
+        except Exception as e:
+            logger.error("❌ Failed to get migration checkpoint: %s", e)
+            return None
+
+    def save_migration_checkpoint(self, channel_id, last_message_id, target_count,
+                                  processed, migrated, skipped, failed, status='running',
+                                  failed_message_ids=()):
+        """마이그레이션 진행 위치 저장. last_message_id까지(포함) 처리와 저장이 끝난 상태.
+
+        status: 'running' (중단되면 다음 실행에서 이어함) | 'done'
+        failed_message_ids: last_message_id까지 중 파싱에 실패한 메시지 (이어하기에서 다시 시도)
+        """
+        try:
+            with get_conn() as conn:
+                with conn.cursor() as cursor:
+                    cursor.execute('''
+                        INSERT INTO migration_checkpoints
+                        (channel_id, last_message_id, target_count, processed,
+                         migrated, skipped, failed, status, failed_message_ids)
+                        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s::bigint[])
+                        ON CONFLICT (channel_id) DO UPDATE
+                        SET last_message_id = EXCLUDED.last_message_id,
+                            target_count = EXCLUDED.target_count,
+                            processed = EXCLUDED.processed,
+                            migrated = EXCLUDED.migrated,
+                            skipped = EXCLUDED.skipped,
+                            failed = EXCLUDED.failed,
+                            status = EXCLUDED.status,
+                            failed_message_ids = EXCLUDED.failed_message_ids,
+                            started_at = CASE
+                                WHEN migration_checkpoints.status = 'running'
+                                THEN migration_checkpoints.started_at
+                                ELSE NOW()
+                            END,
+                            updated_at = NOW()
+                    ''', (
+                        channel_id, last_message_id, target_count, processed,
+                        migrated, skipped, failed, status, list(failed_message_ids)
+                    ))
+                    conn.commit()
+                    return True
+        except Exception as e:
+            logger.error("❌ Failed to save migration checkpoint: %s", e)
+            return False
+
+    def get_metadata_cache_entry(self, provider, cache_key, max_stale_seconds):
+        """영구 메타데이터 캐시 조회.
+
+        Returns:
+            dict: {'payload', 'expired', 'ttl_remaining'} 또는 None
+                  (없거나 max_stale_seconds보다 오래된 경우)
+        """
+        try:
+            with get_conn() as conn:
+                with conn.cursor(cursor_factory=RealDictCursor) as cursor:
+                    cursor.execute('''
+                        SELECT payload,
+                               expires_at <= NOW() AS expired,
+                               GREATEST(EXTRACT(EPOCH FROM expires_at - NOW()), 0) AS ttl_remaining
+                        FROM metadata_cache
+                        WHERE provider = %s
+                          AND cache_key = %s
+                          AND fetched_at > NOW() - make_interval(secs => %s)
+                    ''', (provider, cache_key, max_stale_seconds))
+                    row = cursor.fetchone()
+                    if not row:
+                        return None
+                    row = dict(row)
+                    row['ttl_remaining'] = float(row['ttl_remaining'])
+                    return row
+        except Exception as e:
+            logger.error("❌ Failed to get metadata cache: %s", e)
+            return None
+
+    def load_title_index(self):
+        """자동완성용 제목 인덱스를 contents/reviews에서 다시 채운다.
+
+        Returns:
+            int: 인덱스에 올라간 작품 수 (실패 시 None)
+        """
+        try:
+            with get_conn() as conn:
+                with conn.cursor() as cursor:
+                    cursor.execute('SELECT id, title, category FROM contents')
+                    contents = cursor.fetchall()
+                    cursor.execute('''
+                        SELECT user_id, content_id, COUNT(*)
+                        FROM reviews
+                        WHERE content_id IS NOT NULL
+                        GROUP BY user_id, content_id
+                        ORDER BY MAX(created_at), user_id, content_id
+                    ''')
+                    user_reviews = cursor.fetchall()
+            self.title_index.load(contents, user_reviews)
+            return len(contents)
+        except Exception as e:
+            logger.error("❌ Failed to load title index: %s", e)
+            return None
+
+    @staticmethod
+    def _clear_content_discord_image(cursor, message_id, content_id):
+        """삭제된 리뷰 메시지에 달린 포스터 URL을 비운다 (다른 리뷰가 더 이상 참조하지 않도록).
+
+        예전에 저장해 메시지를 모르는 URL은 삭제된 리뷰의 작품이면 함께 비운다.
+        """
+        cursor.execute('''
+            UPDATE contents
+            SET discord_image_url = NULL, discord_image_source = NULL, discord_image_message_id = NULL
+            WHERE discord_image_url IS NOT NULL
+              AND (discord_image_message_id = %s
+                   OR (discord_image_message_id IS NULL AND id = %s))
+        ''', (message_id, content_id))
+
+    def get_content_discord_image(self, content_id):
+        """작품 포스터의 Discord 첨부파일 URL 조회
+
+        Returns:
+            {'discord_image_url', 'discord_image_source'} 또는 None
+        """
+        try:
+            with get_conn() as conn:
+                with conn.cursor(cursor_factory=RealDictCursor) as cursor:
+                    cursor.execute('''
+                        SELECT discord_image_url, discord_image_source
+                        FROM contents
+                        WHERE id = %s AND discord_image_url IS NOT NULL
+                    ''', (content_id,))
+                    row = cursor.fetchone()
+                    return dict(row) if row else None
+        except Exception as e:
+            logger.error("❌ Failed to get content discord image: %s", e)
             return None
+
+    def save_content_discord_image(self, content_id, discord_image_url, source_url, message_id=None):
+        """리뷰 메시지에 올린 포스터의 Discord 첨부파일 URL 저장
+
+        Args:
+            source_url: 업로드한 원본 img_url (contents.img_url이 바뀌면 재사용하지 않기 위해)
+            message_id: 첨부파일이 달린 리뷰 메시지 (지워지면 _clear_content_discord_image로 비운다)
+        """
+        try:
+            with get_conn() as conn:
+                with conn.cursor() as cursor:
+                    cursor.execute('''
+                        UPDATE contents
+                        SET discord_image_url = %s, discord_image_source = %s, discord_image_message_id = %s
+                        WHERE id = %s
+                    ''', (discord_image_url, source_url, message_id, content_id))
+                    conn.commit()
+                    return cursor.rowcount > 0
+        except Exception as e:
+            logger.error("❌ Failed to save content discord image: %s", e)
+            return False
+
+    def save_metadata_cache_entry(self, provider, cache_key, payload, ttl_seconds):
+        """영구 메타데이터 캐시 저장 (UPSERT)"""
+        try:
+            with get_conn() as conn:
+                with conn.cursor() as cursor:
+                    cursor.execute('''
+                        INSERT INTO metadata_cache (provider, cache_key, payload, fetched_at, expires_at)
+                        VALUES (%s, %s, %s, NOW(), NOW() + make_interval(secs => %s))
+                        ON CONFLICT (provider, cache_key) DO UPDATE
+                        SET payload = EXCLUDED.payload,
+                            fetched_at = EXCLUDED.fetched_at,
+                            expires_at = EXCLUDED.expires_at
+                    ''', (provider, cache_key, Json(payload), ttl_seconds))
+                    conn.commit()
+                    return True
+        except Exception as e:
+            logger.error("❌ Failed to save metadata cache: %s", e)
+            return False
+
+    def get_metadata_cache_entries(self, provider, cache_keys):
+        """만료되지 않은 영구 캐시 항목 여러 개를 한 번에 조회.
+
+        Returns:
+            dict: {cache_key: payload} (없거나 만료된 키는 빠짐). 실패 시 빈 dict
+        """
+        if not cache_keys:
+            return {}
+        try:
+            with get_conn() as conn:
+                with conn.cursor() as cursor:
+                    cursor.execute('''
+                        SELECT cache_key, payload
+                        FROM metadata_cache
+                        WHERE provider = %s
+                          AND cache_key = ANY(%s)
+                          AND expires_at > NOW()
+                    ''', (provider, list(cache_keys)))
+                    return dict(cursor.fetchall())
+        except Exception as e:
+            logger.error("❌ Failed to get metadata cache entries: %s", e)
+            return {}
+
+    def save_metadata_cache_entries(self, provider, entries, ttl_seconds):
+        """영구 캐시 항목 여러 개를 한 번의 UPSERT로 저장.
+
+        Args:
+            entries: [(cache_key, payload)]
+        """
+        if not entries:
+            return True
+        # 같은 키가 두 번 들어오면 ON CONFLICT DO UPDATE가 실패하므로 마지막 값만 남긴다
+        values = [
+            (provider, cache_key, Json(payload), ttl_seconds)
+            for cache_key, payload in dict(entries).items()
+        ]
+        try:
+            with get_conn() as conn:
+                with conn.cursor() as cursor:
+                    execute_values(cursor, '''
+                        INSERT INTO metadata_cache (provider, cache_key, payload, fetched_at, expires_at)
+                        SELECT v.provider, v.cache_key, v.payload, NOW(), NOW() + make_interval(secs => v.ttl)
+                        FROM (VALUES %s) AS v(provider, cache_key, payload, ttl)
+                        ON CONFLICT (provider, cache_key) DO UPDATE
+                        SET payload = EXCLUDED.payload,
+                            fetched_at = EXCLUDED.fetched_at,
+                            expires_at = EXCLUDED.expires_at
+                    ''', values, template="(%s, %s, %s::jsonb, %s::double precision)", page_size=len(values))
+                    conn.commit()
+                    return True
+        except Exception as e:
+            logger.error("❌ Failed to save metadata cache entries: %s", e)
+            return False
+
+
+class AsyncDatabase:
+    """Database의 asyncio 래퍼.
+
+    모든 공개 메서드를 같은 이름의 코루틴으로 노출하고, 실제 쿼리는 연결 풀 크기만큼의
+    전용 스레드에서 실행해 discord.py 이벤트 루프(하트비트, 다른 인터랙션)를 막지 않는다.
+    """
+
+    def __init__(self, db, max_workers=None):
+        self.sync = db
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers or DB_POOL_MAX,
+            thread_name_prefix="db"
+        )
+
+    def __getattr__(self, name):
+        attr = getattr(self.sync, name)
+        if name.startswith('_') or not callable(attr):
+            return attr
+
+        @functools.wraps(attr)
+        async def call(*args, **kwargs):
+            loop = asyncio.get_running_loop()
+            with span(f"db.{name}"):
+                return await loop.run_in_executor(
+                    self._executor,
+                    functools.partial(attr, *args, **kwargs)
+                )
+
+        # 다음 호출부터는 __getattr__를 거치지 않도록 캐시
+        setattr(self, name, call)
+        return call
+
+    async def get_review_by_message_id(self, message_id):
+        """캐시에 있으면 스레드 풀을 거치지 않고 바로 반환"""
+        cached = self.sync.review_cache.get(message_id)
+        if cached is not None:
+            return cached
+        loop = asyncio.get_running_loop()
+        with span("db.get_review_by_message_id"):
+            return await loop.run_in_executor(
+                self._executor,
+                functools.partial(self.sync.get_review_by_message_id, message_id)
+            )
+
+    def shutdown(self):
+        """실행 중인 쿼리를 마친 뒤 스레드 풀과 연결 풀 종료"""
+        self._executor.shutdown(wait=True)
+        self.sync.close()
+
+
+# plpgsql 함수 본문의 조회문 (find_content_id의 작품 조회, submit_review의 중복/회고 검사)
+_PLPGSQL_SELECT = re.compile(r'SELECT\s+(?:c\.id\s+INTO|1\s+FROM|MAX\(r\.unit_to\)\s+INTO).*?(?=;|\)\s*THEN)', re.S)
+_PLPGSQL_FUNCTION = re.compile(r'CREATE OR REPLACE FUNCTION (\w+)')
+# 함수 인자/변수 → EXPLAIN에 넣을 예시 값
+SUBMIT_REVIEW_PLAN_PARAMS = {
+    'p_title': '제목',
+    'p_creator': '감독',
+    'p_musicbrainz_id': 'mbid',
+    'p_igdb_id': 1,
+    'p_steam_appid': 1,
+    'p_user_id': 1,
+    'p_season': None,
+    'v_content_id': 1,
+}
+
+
+def _plan_category(query):
+    """조회문이 실제로 쓰이는 find_content_id 분기의 카테고리 (게임/곡 조회는 부분 인덱스를 탄다)"""
+    if 'igdb_id' in query or 'steam_appid' in query:
+        return 'game'
+    if 'musicbrainz_id' in query or 'creator' in query:
+        return 'music_track'
+    return 'movie'
+
+
+def _function_query_plans(functions_sql):
+    """함수 SQL에서 조회문을 뽑아 EXPLAIN할 수 있는 (이름, 쿼리, 파라미터)로 바꾼다.
+
+    함수 본문을 그대로 읽으므로 SUBMIT_REVIEW_FUNCTIONS_SQL을 고치면 확인하는 쿼리도 바뀐다.
+    INTO는 지우고 p_*/v_* 인자는 SUBMIT_REVIEW_PLAN_PARAMS 값으로 바인딩한다.
+    """
+    plans = []
+    seen = set()
+    parts = _PLPGSQL_FUNCTION.split(functions_sql)
+    for function_name, body in zip(parts[1::2], parts[2::2]):
+        for match in _PLPGSQL_SELECT.finditer(body):
+            query = re.sub(r'\s+INTO\s+v_\w+', '', match.group(0))
+            query = re.sub(r'\b(p_\w+|v_content_id)\b', r'%(\1)s', query)
+            normalized = ' '.join(query.split())
+            if normalized in seen:
+                continue
+            seen.add(normalized)
+            params = dict(SUBMIT_REVIEW_PLAN_PARAMS, p_category=_plan_category(query))
+            plans.append((f'{function_name}: {normalized[:60]}', query, params))
+    return plans
+
+
+# 자주 실행되는 조회 (메서드와 같은 SQL 상수 + 예시 파라미터). 인덱스를 바꾸면 python database.py로 확인
+HOT_QUERY_PLANS = [
+    # save_review_v2 / has_review_v2
+    ('save_review_v2: MAX(unit_to)',
+     MAX_UNIT_TO_SQL.format(season_clause=" AND season IS NULL"), (1, 1)),
+    ('get_user_reviews',
+     USER_REVIEWS_SQL.format(category_clause=""), (1, 5)),
+    ('get_user_reviews (카테고리)',
+     USER_REVIEWS_SQL.format(category_clause=USER_REVIEWS_CATEGORY_CLAUSE), (1, 'movie', 'movie', 5)),
+    ('get_user_review',
+     USER_REVIEW_SQL.format(category_clause="", season_clause=""), (1, '제목')),
+    ('get_user_review (카테고리/시즌)',
+     USER_REVIEW_SQL.format(category_clause=CONTENT_CATEGORY_CLAUSE, season_clause=" AND r.season = %s"),
+     (1, '제목', 'drama', 1)),
+    ('delete_review',
+     DELETE_REVIEW_SQL.format(category_clause="", season_clause=""), (1, '제목')),
+    ('delete_review (카테고리/시즌)',
+     DELETE_REVIEW_SQL.format(category_clause=CONTENT_CATEGORY_CLAUSE, season_clause=" AND r.season IS NULL"),
+     (1, '제목', 'movie')),
+    ('get_review_history (카테고리)',
+     REVIEW_HISTORY_SQL.format(
+         contents_category_clause=HISTORY_CONTENTS_CATEGORY_CLAUSE,
+         legacy_category_clause=HISTORY_LEGACY_CATEGORY_CLAUSE,
+         season_clause="",
+     ),
+     (1, '제목', 'movie', '제목', 'movie', 10)),
+    ('get_review_history',
+     REVIEW_HISTORY_SQL.format(contents_category_clause="", legacy_category_clause="", season_clause=""),
+     (1, '제목', '제목', 10)),
+    ('get_review_logs',
+     REVIEW_LOGS_SQL.format(filters="user_id = %s", season_clause=""), (1, 10)),
+    ('get_review_ranking',
+     REVIEW_RANKING_SQL.format(category_clause=""), (10,)),
+    ('get_review_ranking (카테고리)',
+     REVIEW_RANKING_SQL.format(category_clause=REVIEW_RANKING_CATEGORY_CLAUSE), ('movie', 10)),
+    # submit_review() DB 함수 안의 조회
+    *_function_query_plans(SUBMIT_REVIEW_FUNCTIONS_SQL),
+]
+PLAN_CHECKED_TABLES = {'reviews', 'contents', 'review_logs', 'review_reaction_totals'}
+
+
+def _seq_scans(plan):
+    """실행 계획 트리에서 Seq Scan 대상 테이블 목록"""
+    found = []
+    if plan.get('Node Type') == 'Seq Scan' and plan.get('Relation Name') in PLAN_CHECKED_TABLES:
+        found.append(plan['Relation Name'])
+    for child in plan.get('Plans', []):
+        found.extend(_seq_scans(child))
+    return found
+
+
+def check_query_plans():
+    """HOT_QUERY_PLANS의 실행 계획에 Seq Scan이 있는지 확인.
+
+    행 수가 적으면 플래너가 인덱스가 있어도 Seq Scan을 고르므로 enable_seqscan을 끄고 본다.
+    (꺼도 Seq Scan이 나오면 쓸 수 있는 인덱스가 없다는 뜻)
+
+    Returns:
+        list: [(쿼리 이름, 테이블)] - 비어 있으면 통과
+    """
+    failures = []
+    with get_conn() as conn:
+        with conn.cursor() as cursor:
+            cursor.execute('SET LOCAL enable_seqscan = off')
+            for name, query, params in HOT_QUERY_PLANS:
+                cursor.execute(f'EXPLAIN (FORMAT JSON) {query}', params)
+                plan = cursor.fetchone()[0][0]['Plan']
+                failures.extend((name, table) for table in _seq_scans(plan))
+        conn.rollback()
+    return failures
+
+
+# 루프 지연 측정 주기 (초)
+LOOP_LAG_TICK = 0.005
+
+
+def _percentile(samples, q):
+    ordered = sorted(samples)
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+async def _measure_loop_lag(run_calls, tick=LOOP_LAG_TICK):
+    """run_calls()가 끝날 때까지 tick마다 깨어나는 ticker가 예정보다 늦게 깬 시간(초) 목록"""
+    loop = asyncio.get_running_loop()
+    lags = []
+    done = asyncio.Event()
+
+    async def ticker():
+        expected = loop.time() + tick
+        while not done.is_set():
+            await asyncio.sleep(tick)
+            now = loop.time()
+            lags.append(max(0.0, now - expected))
+            expected = now + tick
+
+    ticker_task = asyncio.create_task(ticker())
+    await asyncio.sleep(0)
+    started = loop.time()
+    try:
+        await run_calls()
+    finally:
+        elapsed = loop.time() - started
+        done.set()
+        await ticker_task
+    return lags, elapsed
+
+
+async def benchmark_loop_lag(calls=50):
+    """같은 조회를 calls개 동시에 실행하면서 이벤트 루프 지연 비교.
+
+    sync: 코루틴 안에서 Database 메서드를 바로 호출 (예전 방식, 쿼리 동안 루프가 멈춤)
+    async: AsyncDatabase로 호출 (쿼리는 풀 크기만큼의 스레드에서 실행)
+    """
+    db = Database()
+    async_db = AsyncDatabase(db)
+
+    async def sync_calls():
+        # 인터랙션마다 한 번씩 루프를 막는 모양: 호출 사이에만 다른 코루틴(ticker)이 돈다
+        for _ in range(calls):
+            db.get_user_reviews(0, limit=10)
+            await asyncio.sleep(0)
+
+    async def async_calls():
+        await asyncio.gather(*(async_db.get_user_reviews(0, limit=10) for _ in range(calls)))
+
+    # 첫 연결 생성 비용이 측정에 섞이지 않도록 미리 한 번 실행
+    await async_calls()
+    try:
+        print(f"동시 호출 {calls}개, 풀 {DB_POOL_MIN}~{DB_POOL_MAX}, tick {format_duration(LOOP_LAG_TICK)}")
+        for label, run_calls in (("sync", sync_calls), ("async", async_calls)):
+            lags, elapsed = await _measure_loop_lag(run_calls)
+            print(
+                f"{label:5} 전체 {format_duration(elapsed)} | 루프 지연 "
+                f"p50 {format_duration(_percentile(lags, 0.50))} "
+                f"p99 {format_duration(_percentile(lags, 0.99))} "
+                f"max {format_duration(max(lags, default=0.0))} ({len(lags)}회 측정)"
+            )
+    finally:
+        async_db.shutdown()
+
+
+if __name__ == "__main__":
+    if sys.argv[1:2] == ["loop-lag"]:
+        # 이벤트 루프 지연 비교: DATABASE_URL=... python database.py loop-lag [동시 호출 수]
+        asyncio.run(benchmark_loop_lag(int(sys.argv[2]) if len(sys.argv) > 2 else 50))
+        sys.exit(0)
+
+    # 인덱스 회귀 확인: DATABASE_URL=... python database.py (Seq Scan이 있으면 종료 코드 1)
+    seq_scans = check_query_plans()
+    for query_name, table in seq_scans:
+        print(f"❌ {query_name}: Seq Scan on {table}")
+    if not seq_scans:
+        print(f"✅ {len(HOT_QUERY_PLANS)}개 쿼리 모두 인덱스 사용")
+    sys.exit(1 if seq_scans else 0)
@@ -0,0 +1,231 @@
+import asyncio
+import hashlib
+import logging
+import os
+import threading
+from collections import OrderedDict
+
+from tracing import span
+
+logger = logging.getLogger("bot.images")
+
+IMAGE_CACHE_DIR = os.getenv("IMAGE_CACHE_DIR", os.path.join(".cache", "images"))
+# 0이면 캐시 비활성화
+IMAGE_CACHE_MAX_BYTES = int(os.getenv("IMAGE_CACHE_MAX_BYTES", str(256 * 1024 * 1024)))
+
+
+def cache_key(img_url, content_id=None, variant=None):
+    """파일 이름: 작품 ID + 이미지 URL(+변환 설정) 해시.
+
+    contents.img_url이 바뀌면 해시가 달라져 자연스럽게 새로 받는다.
+    """
+    source = f"{img_url}|{variant}" if variant else img_url
+    digest = hashlib.sha256(source.encode("utf-8")).hexdigest()[:32]
+    prefix = f"c{content_id}" if content_id is not None else "u"
+    return f"{prefix}-{digest}"
+
+
+class ImageCache:
+    """포스터/커버 이미지 디스크 캐시 (전체 크기 기준 LRU).
+
+    파일 읽기/쓰기는 스레드에서 실행해 이벤트 루프를 막지 않는다.
+    같은 이미지를 동시에 요청하면 다운로드는 한 번만 한다.
+    """
+
+    def __init__(self, directory=IMAGE_CACHE_DIR, max_bytes=IMAGE_CACHE_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._index = OrderedDict()  # 파일 이름 -> 크기 (오래 안 쓴 순)
+        self._size = 0
+        self._lock = threading.Lock()
+        self._loaded = False
+        self._inflight = {}
+        self._tasks = set()
+        self._stats = {'hits': 0, 'misses': 0, 'coalesced': 0, 'evictions': 0, 'errors': 0}
+
+    @property
+    def enabled(self):
+        return self.max_bytes > 0
+
+    def _path(self, name):
+        return os.path.join(self.directory, name)
+
+    def _load_index(self):
+        """기존 캐시 파일을 수정 시각 순으로 읽어 LRU 순서를 복원."""
+        with self._lock:
+            if self._loaded:
+                return
+            os.makedirs(self.directory, exist_ok=True)
+            entries = []
+            for entry in os.scandir(self.directory):
+                if not entry.is_file():
+                    continue
+                if entry.name.endswith(".tmp"):
+                    # 쓰는 도중 종료된 파일
+                    os.unlink(entry.path)
+                    continue
+                stat = entry.stat()
+                entries.append((stat.st_mtime, entry.name, stat.st_size))
+            for _, name, size in sorted(entries):
+                self._index[name] = size
+                self._size += size
+            self._loaded = True
+            self._evict()
+        logger.info("이미지 캐시 로드 - %s개, %sKB", len(self._index), self._size // 1024)
+
+    def _read(self, name):
+        path = self._path(name)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+            os.utime(path)
+        except FileNotFoundError:
+            self._discard(name)
+            return None
+        with self._lock:
+            if name in self._index:
+                self._index.move_to_end(name)
+        return data
+
+    def _write(self, name, data):
+        path = self._path(name)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+        with self._lock:
+            self._drop_stale(name)
+            if name in self._index:
+                self._size -= self._index.pop(name)
+            self._index[name] = len(data)
+            self._size += len(data)
+            self._evict()
+
+    def _promote(self, url_name, name):
+        """작품 ID 없이 받아둔 파일(프리페치)을 작품 ID 키로 옮긴다."""
+        os.replace(self._path(url_name), self._path(name))
+        with self._lock:
+            self._drop_stale(name)
+            size = self._index.pop(url_name, None)
+            if size is None:
+                size = os.path.getsize(self._path(name))
+            else:
+                self._size -= size
+            self._index[name] = size
+            self._size += size
+
+    def _drop_stale(self, name):
+        """락을 잡은 상태에서 호출. 같은 작품의 예전 이미지(URL 변경 전)는 바로 정리."""
+        if name.startswith("c"):
+            prefix = name.split("-", 1)[0] + "-"
+            for old_name in [n for n in self._index if n.startswith(prefix) and n != name]:
+                self._remove(old_name)
+
+    def _evict(self):
+        """락을 잡은 상태에서 호출."""
+        while self._size > self.max_bytes and self._index:
+            self._remove(next(iter(self._index)))
+            self._stats['evictions'] += 1
+
+    def _remove(self, name):
+        """락을 잡은 상태에서 호출."""
+        self._size -= self._index.pop(name)
+        try:
+            os.unlink(self._path(name))
+        except FileNotFoundError:
+            pass
+
+    def _discard(self, name):
+        with self._lock:
+            if name in self._index:
+                self._size -= self._index.pop(name)
+
+    def contains(self, img_url, content_id=None, variant=None):
+        return self._loaded and cache_key(img_url, content_id, variant) in self._index
+
+    async def get_or_fetch(self, img_url, fetch, content_id=None, variant=None):
+        """캐시된 이미지 bytes 반환. 없으면 fetch()로 받아 저장 (실패 결과는 저장하지 않음).
+
+        Args:
+            variant: 저장할 bytes를 만든 변환 설정 (image_pipeline.pipeline_variant())
+        """
+        if not img_url:
+            return None
+        if not self.enabled:
+            return await fetch()
+
+        name = cache_key(img_url, content_id, variant)
+        try:
+            if not self._loaded:
+                await asyncio.to_thread(self._load_index)
+            if content_id is not None and name not in self._index:
+                url_name = cache_key(img_url, None, variant)
+                if url_name in self._index:
+                    await asyncio.to_thread(self._promote, url_name, name)
+            if name in self._index:
+                with span("image.cache_read"):
+                    data = await asyncio.to_thread(self._read, name)
+                if data:
+                    self._stats['hits'] += 1
+                    return data
+        except OSError as e:
+            self._stats['errors'] += 1
+            logger.warning("이미지 캐시 읽기 실패 (%s): %s", name, e)
+
+        inflight = self._inflight.get(name)
+        if inflight is None and content_id is not None:
+            # 작품 ID 없이 시작된 프리페치가 아직 받는 중
+            inflight = self._inflight.get(cache_key(img_url, None, variant))
+        if inflight is not None:
+            self._stats['coalesced'] += 1
+            return await asyncio.shield(inflight)
+
+        # 다운로드는 별도 task로 실행한다. 처음 요청한 쪽(예: 시간 제한이 걸린 프리페치)이
+        # 취소돼도 다운로드는 계속되고, 같은 이미지를 기다리던 요청은 그 결과를 받는다.
+        self._stats['misses'] += 1
+        task = asyncio.create_task(self._fetch(name, fetch))
+        self._inflight[name] = task
+        self._tasks.add(task)
+        task.add_done_callback(lambda done: self._finish(name, done))
+        return await asyncio.shield(task)
+
+    async def _fetch(self, name, fetch):
+        data = await fetch()
+        if data:
+            self._spawn(self._store(name, data))
+        return data
+
+    def _finish(self, name, task):
+        self._tasks.discard(task)
+        if self._inflight.get(name) is task:
+            del self._inflight[name]
+        if not task.cancelled():
+            # 기다리는 요청이 없어도 "exception was never retrieved" 경고가 나지 않도록
+            task.exception()
+
+    async def _store(self, name, data):
+        try:
+            await asyncio.to_thread(self._write, name, data)
+        except OSError as e:
+            self._stats['errors'] += 1
+            logger.warning("이미지 캐시 저장 실패 (%s): %s", name, e)
+
+    def _spawn(self, coro):
+        task = asyncio.create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    def stats(self):
+        lookups = self._stats['hits'] + self._stats['coalesced'] + self._stats['misses']
+        served = self._stats['hits'] + self._stats['coalesced']
+        return dict(
+            self._stats,
+            entries=len(self._index),
+            size_bytes=self._size,
+            max_bytes=self.max_bytes,
+            hit_rate=served / lookups if lookups else 0.0,
+        )
+
+
+image_cache = ImageCache()
@@ -0,0 +1,92 @@
+import asyncio
+import io
+import logging
+import os
+
+logger = logging.getLogger("bot.images")
+
+try:
+    from PIL import Image
+except Exception as e:
+    logger.info("Pillow unavailable; review images are uploaded unchanged: %s", e)
+    Image = None
+
+# Discord 채팅창 미리보기는 세로 기준 최대 약 350px로 그려지므로 고해상도 화면까지 고려해 여유를 둔다
+REVIEW_IMAGE_MAX_SIZE = int(os.getenv("REVIEW_IMAGE_MAX_SIZE", "600"))
+# webp | jpeg
+REVIEW_IMAGE_FORMAT = os.getenv("REVIEW_IMAGE_FORMAT", "webp").lower()
+REVIEW_IMAGE_QUALITY = int(os.getenv("REVIEW_IMAGE_QUALITY", "82"))
+
+FORMAT_EXTENSIONS = {"jpeg": "jpg", "png": "png", "gif": "gif", "webp": "webp"}
+
+
+def detect_image_format(data):
+    """매직 바이트로 이미지 형식 판별. 모르면 None."""
+    if not data:
+        return None
+    if data[:3] == b"\xff\xd8\xff":
+        return "jpeg"
+    if data[:8] == b"\x89PNG\r\n\x1a\n":
+        return "png"
+    if data[:6] in (b"GIF87a", b"GIF89a"):
+        return "gif"
+    if data[:4] == b"RIFF" and data[8:12] == b"WEBP":
+        return "webp"
+    return None
+
+
+def image_filename(data, stem="image"):
+    """실제 형식에 맞는 첨부파일 이름 (모르면 기존처럼 .jpg)."""
+    return f"{stem}.{FORMAT_EXTENSIONS.get(detect_image_format(data), 'jpg')}"
+
+
+def pipeline_variant():
+    """이미지 캐시 키에 넣을 변환 설정 (설정이 바뀌면 캐시를 새로 채운다)."""
+    if Image is None:
+        return "original"
+    return f"{REVIEW_IMAGE_FORMAT}-{REVIEW_IMAGE_MAX_SIZE}-q{REVIEW_IMAGE_QUALITY}"
+
+
+def _shrink(data):
+    source_format = detect_image_format(data)
+    if source_format is None:
+        return data
+
+    with Image.open(io.BytesIO(data)) as image:
+        # 움직이는 GIF/WebP는 프레임이 깨지지 않도록 그대로 둔다
+        if getattr(image, "is_animated", False):
+            return data
+
+        image.thumbnail((REVIEW_IMAGE_MAX_SIZE, REVIEW_IMAGE_MAX_SIZE), Image.LANCZOS)
+        if REVIEW_IMAGE_FORMAT == "jpeg":
+            if image.mode != "RGB":
+                image = image.convert("RGB")
+            save_kwargs = {"format": "JPEG", "quality": REVIEW_IMAGE_QUALITY, "optimize": True, "progressive": True}
+        else:
+            if image.mode not in ("RGB", "RGBA"):
+                image = image.convert("RGBA" if "A" in image.getbands() else "RGB")
+            save_kwargs = {"format": "WEBP", "quality": REVIEW_IMAGE_QUALITY, "method": 4}
+
+        output = io.BytesIO()
+        image.save(output, **save_kwargs)
+
+    shrunk = output.getvalue()
+    # 이미 작은 이미지는 재인코딩으로 오히려 커질 수 있음
+    return shrunk if len(shrunk) < len(data) else data
+
+
+async def prepare_upload_image(data):
+    """Discord 표시 크기에 맞게 줄이고 재인코딩 (Pillow가 없거나 실패하면 원본).
+
+    디코딩/리사이즈는 CPU 작업이라 스레드에서 실행한다.
+    """
+    if Image is None or not data:
+        return data
+    try:
+        shrunk = await asyncio.to_thread(_shrink, data)
+    except Exception as e:
+        logger.warning("prepare_upload_image() 변환 실패, 원본 사용: %s", e)
+        return data
+    if len(shrunk) < len(data):
+        logger.debug("prepare_upload_image() %s bytes -> %s bytes", len(data), len(shrunk))
+    return shrunk
@@ -0,0 +1,366 @@
+import os
+import re
+import time
+
+from review_form import parse_season_number, split_title_season
+
+# 이 점수 이상이면 LLM 없이 규칙 파싱 결과를 그대로 사용
+LEGACY_PARSE_MIN_CONFIDENCE = float(os.getenv("LEGACY_PARSE_MIN_CONFIDENCE", "0.85"))
+
+# 신뢰도 구성 (합계 1.0)
+#   점수 0.35 (후보가 여러 개면 0.1)
+#   제목 0.3 ('제목:', 따옴표, 『』 등으로 구분된 제목) 또는 0.1 ('X - 4/5'의 X나 첫 줄 추정)
+#   한줄평 0.15 / 카테고리 0.2 (카테고리 태그가 없으면 LLM이 제목으로 추정하도록 넘긴다)
+# 제목이 따로 구분되지 않으면 최대 0.8이라 LLM으로 넘어간다
+# ('영화 모임 - 4/5 참석', '드라마 정주행 - 3/5 완료' 같은 글을 리뷰로 받아들이지 않도록)
+SCORE_WEIGHT = 0.35
+AMBIGUOUS_SCORE_WEIGHT = 0.1
+STRONG_TITLE_WEIGHT = 0.3
+WEAK_TITLE_WEIGHT = 0.1
+REVIEW_WEIGHT = 0.15
+CATEGORY_WEIGHT = 0.2
+
+# 점수 표기 (위에서부터 먼저 매칭하고, 매칭된 구간은 다음 패턴에서 제외)
+FRACTION_SCORE = re.compile(r'(?<![\d.])(\d{1,3}(?:\.\d+)?)\s*/\s*(5|10|100)(?![\d.\w])(?:\s*점)?')
+STAR_SCORE = re.compile(r'([★⭐]+)\s*(½)?[☆]*')
+STAR_WORD_SCORE = re.compile(r'별\s*(\d(?:\.\d)?)\s*개')
+LABELED_SCORE = re.compile(r'(?:평점|점수|별점)\s*[:：]?\s*(\d{1,2}(?:\.\d+)?)(?:\s*점)?')
+POINT_SCORE = re.compile(r'(?<![\d.])(\d{1,2}(?:\.\d)?)\s*점(?!\s*만점)')
+
+TITLE_LABEL = re.compile(r'^\s*(?:제목|작품명|작품|title)\s*[:：]\s*(.+?)\s*$', re.IGNORECASE | re.MULTILINE)
+TITLE_BRACKETS = re.compile(r'[『「《<\[]([^』」》>\]\n]{1,80})[』」》>\]]|["“]([^"”\n]{1,80})["”]')
+# 띄어 쓴 '-', ':' 또는 '|' (연속되면 하나로 본다. '스파이더맨-노웨이홈', 'Re:Zero'는 나누지 않음)
+TITLE_SEPARATOR = re.compile(r'(?:\s+[-–—:：]+(?=\s|$)|\s*\|)+\s*')
+# 제목 앞뒤 시즌 표기 (split_title_season이 처리하지 않는 '시즌 2', 'Season 2', 'S2')
+TITLE_SEASON_PREFIXED = re.compile(r'^(.+?)\s+(?:시즌|season|s)\s*(\d+)$', re.IGNORECASE)
+TITLE_YEAR = re.compile(r'\s*\((\d{4})\)\s*$')
+QUOTES = '"\'“”‘’`「」『』'
+VARIATION_SELECTOR = re.compile('[︎️]')
+# Discord 멘션/채널/역할/커스텀 이모지/타임스탬프 (<@123>, <#123>, <:name:123>) - 제목으로 읽히지 않도록 먼저 지운다
+DISCORD_TOKEN = re.compile(r'<(?:@[!&]?\d+|#\d+|a?:\w+:\d+|t:\d+(?::\w)?)>')
+# 첫 줄이 '[공지]', '(질문)' 같은 말머리로 시작하면 리뷰가 아닌 글로 보고 LLM에 넘긴다
+BOARD_TAG = re.compile(
+    r'^[\[(【]\s*(?:공지|질문|잡담|모집|투표|이벤트|정보|알림|notice|question|q&a|qna)\s*[\])】]',
+    re.IGNORECASE
+)
+# 리뷰 글에 붙는 말머리는 제목이 아니므로 지운다
+REVIEW_TAG = re.compile(r'[\[(【]\s*(?:후기|추천|비추|리뷰|스포|스포일러|review|spoiler)\s*[\])】]', re.IGNORECASE)
+
+CATEGORY_WORDS = {
+    'movie': r'영화|movie',
+    'drama': r'드라마|drama',
+    'anime': r'애니메이션|애니|anime',
+    'manga': r'만화|망가|manga',
+    'webtoon': r'웹툰|webtoon',
+    'webnovel': r'웹소설|라노벨|webnovel',
+    'music_track': r'노래|음악|곡|song',
+    'game': r'게임|game',
+}
+CATEGORY_KEYWORDS = {
+    category: re.compile(words, re.IGNORECASE) for category, words in CATEGORY_WORDS.items()
+}
+_ANY_CATEGORY = '|'.join(CATEGORY_WORDS.values())
+# '[영화] 제목', '드라마 제목', '제목 (애니)', '#웹툰', '『제목』 애니' 처럼 카테고리를 직접 적은 표기
+CATEGORY_TAG = re.compile(
+    rf'^[\[(#]?({_ANY_CATEGORY})[\])]?(?:\s+|$)|[\[(#]({_ANY_CATEGORY})[\])]?(?=\s|$)'
+    rf'|(?<=[』」》>])\s*({_ANY_CATEGORY})(?=\s|$)',
+    re.IGNORECASE
+)
+
+
+def _find_scores(line):
+    """한 줄에서 점수 후보 [(0~5 점수, 시작, 끝)]"""
+    scores = []
+    masked = line
+
+    def take(pattern, convert):
+        nonlocal masked
+        for match in pattern.finditer(masked):
+            value = convert(match)
+            if value is not None and 0 <= value <= 5:
+                scores.append((round(value, 2), match.start(), match.end()))
+            masked = masked[:match.start()] + " " * (match.end() - match.start()) + masked[match.end():]
+
+    take(FRACTION_SCORE, lambda m: float(m.group(1)) * 5 / int(m.group(2)))
+    take(STAR_SCORE, lambda m: float(len(m.group(1))) + (0.5 if m.group(2) else 0))
+    take(STAR_WORD_SCORE, lambda m: float(m.group(1)))
+    take(LABELED_SCORE, lambda m: _scale_points(float(m.group(1))))
+    take(POINT_SCORE, lambda m: _scale_points(float(m.group(1))))
+    return sorted(scores, key=lambda item: item[1])
+
+
+def _scale_points(value):
+    """단위 없는 점수: 5 이하는 5점 만점, 10 이하는 10점 만점으로 본다."""
+    if value <= 5:
+        return value
+    if value <= 10:
+        return value / 2
+    return None
+
+
+def _clean_text(text):
+    text = text.strip().strip(QUOTES).strip()
+    return re.sub(r'^[-•·*>\s]+', '', text).strip().strip(QUOTES).strip()
+
+
+def _category_of(word):
+    for category, pattern in CATEGORY_KEYWORDS.items():
+        if pattern.fullmatch(word):
+            return category
+    return None
+
+
+def _detect_category(text):
+    """카테고리 태그('[영화]', '드라마 제목', '#웹툰')가 하나의 카테고리만 가리킬 때 그것을 사용.
+
+    본문 중간의 단어('곡성', '오징어 게임', '노래가 좋다')로는 추정하지 않는다.
+    """
+    tags = {_category_of(match.group(1) or match.group(2) or match.group(3)) for match in CATEGORY_TAG.finditer(text)}
+    tags.discard(None)
+    return tags.pop() if len(tags) == 1 else None
+
+
+def _split_title(raw_title):
+    """제목에서 카테고리 태그/연도/시즌 표기를 떼어낸다 → (title, year, season)"""
+    title = _clean_text(raw_title)
+    # '[영화] 제목', '드라마 제목', '제목 (애니)' 같은 카테고리 태그
+    title = CATEGORY_TAG.sub(' ', title).strip()
+    year = None
+    year_match = TITLE_YEAR.search(title)
+    if year_match:
+        year = year_match.group(1)
+        title = title[:year_match.start()]
+    title, season = split_title_season(title)
+    prefixed = TITLE_SEASON_PREFIXED.match(title)
+    if season is None and prefixed:
+        title, season = prefixed.group(1).strip(), parse_season_number(prefixed.group(2))
+    return _clean_text(title), year, season
+
+
+def _bracket_rest(line, brackets):
+    """괄호 밖에 남는 글 (점수/카테고리 태그 제외)"""
+    rest = line.replace(brackets.group(0), ' ')
+    for _, start, end in reversed(_find_scores(rest)):
+        rest = rest[:start] + rest[end:]
+    return _clean_text(CATEGORY_TAG.sub(' ', rest.strip()))
+
+
+def _delimited_title(line):
+    """괄호/따옴표로 구분된 제목 → (매치, 제목). 카테고리 태그나 말머리는 건너뛴다."""
+    for match in TITLE_BRACKETS.finditer(line):
+        title = match.group(1) or match.group(2)
+        if match.group(0).startswith('[') and _bracket_rest(line, match):
+            # '[맛집] 제주 흑돼지 4/5' 처럼 뒤에 다른 글이 이어지면 '[...]'는 말머리일 가능성이 높다
+            continue
+        if _detect_category(title):
+            continue
+        return match, title
+    return None, None
+
+
+def parse_legacy_review_rules(content):
+    """자주 쓰이는 레거시 리뷰 형식("제목 - 4/5", "⭐⭐⭐⭐", "8/10")을 규칙으로 파싱.
+
+    Returns:
+        (parsed, confidence): parsed는 GrokSearcher.parse_legacy_review와 같은 키의 dict
+        (제목이나 점수를 못 찾으면 None), confidence는 0~1
+    """
+    if not content:
+        return None, 0.0
+
+    text = VARIATION_SELECTOR.sub('', content)
+    text = REVIEW_TAG.sub(' ', DISCORD_TOKEN.sub(' ', text)).strip()
+    lines = [line.strip() for line in text.split('\n') if line.strip()]
+    if not lines or BOARD_TAG.match(lines[0]):
+        return None, 0.0
+
+    scored_lines = [(idx, _find_scores(line)) for idx, line in enumerate(lines)]
+    scored_lines = [(idx, scores) for idx, scores in scored_lines if scores]
+    if not scored_lines:
+        return None, 0.0
+    if len(scored_lines) > 1:
+        # 점수가 여러 줄에 있으면 한 메시지에 리뷰가 여러 개일 가능성이 높다
+        return None, 0.0
+
+    score_idx, scores = scored_lines[0]
+    score = scores[0][0]
+    confidence = SCORE_WEIGHT if len({value for value, _, _ in scores}) == 1 else AMBIGUOUS_SCORE_WEIGHT
+
+    # 점수 줄에서 점수 표기를 지운 나머지
+    score_line = lines[score_idx]
+    for _, start, end in reversed(scores):
+        score_line = score_line[:start] + score_line[end:]
+    score_line = re.sub(r'(?:평점|점수|별점)\s*[:：]?', '', score_line).strip()
+
+    title = None
+    title_line_idx = None
+    label = TITLE_LABEL.search('\n'.join(lines))
+    brackets, bracket_title = _delimited_title(lines[0])
+    if label:
+        title = label.group(1)
+        title_line_idx = next(idx for idx, line in enumerate(lines) if label.group(1) in line)
+        confidence += STRONG_TITLE_WEIGHT
+    elif brackets:
+        title = bracket_title
+        title_line_idx = 0
+        confidence += STRONG_TITLE_WEIGHT
+        if score_idx == 0:
+            # "『제목』 애니 ⭐⭐⭐⭐" 에서 제목과 카테고리 태그를 뺀 나머지만 한줄평 후보
+            score_line = CATEGORY_TAG.sub(' ', score_line.replace(brackets.group(0), ' ').strip()).strip()
+    elif score_line:
+        # "제목 - 4/5 - 한줄평" 처럼 점수와 같은 줄. 'X - 4/5'의 X는 '모임', '정주행' 같은 일반 명사일 수
+        # 있으므로 구분자가 있어도 추정으로만 본다
+        parts = [part for part in TITLE_SEPARATOR.split(score_line) if _clean_text(part)]
+        if parts:
+            title = parts[0]
+            score_line = ' '.join(parts[1:])
+            title_line_idx = score_idx
+            confidence += WEAK_TITLE_WEIGHT
+    if title is None and score_idx > 0 and len(lines[0]) <= 40:
+        title = lines[0]
+        title_line_idx = 0
+        confidence += WEAK_TITLE_WEIGHT
+
+    if not title:
+        return None, 0.0
+    title, year, season = _split_title(title)
+    if not title or len(title) > 80:
+        return None, 0.0
+
+    review_parts = []
+    for idx, line in enumerate(lines):
+        if idx == title_line_idx and idx != score_idx:
+            continue
+        if idx == score_idx:
+            line = score_line
+        if label and idx == title_line_idx:
+            continue
+        line = _clean_text(line)
+        if line and line != title:
+            review_parts.append(line)
+    one_line_review = ' '.join(review_parts) or None
+    if one_line_review:
+        confidence += REVIEW_WEIGHT
+
+    category = _detect_category(text)
+    if category:
+        confidence += CATEGORY_WEIGHT
+
+    parsed = {
+        'title': title,
+        'score': score,
+        'one_line_review': one_line_review,
+        'category': category or 'movie',
+        'season': season,
+        'year': year,
+        'director': None,
+    }
+    return parsed, round(min(confidence, 1.0), 2)
+
+
+# (메시지, 기대 결과) - 기대 결과가 None이면 리뷰가 아닌 메시지
+# 기대 결과에 'category'가 있으면 카테고리도 비교한다 (None이면 규칙으로 받아들이지 않고 LLM에 넘겨야 함)
+BENCHMARK_CORPUS = [
+    ("[영화] 인터스텔라 - 4.5/5\n시간이 지나도 여운이 남는다", {'title': '인터스텔라', 'score': 4.5}),
+    ("인터스텔라 - 9/10 - 영화관에서 봐야 하는 영화", {'title': '인터스텔라', 'score': 4.5}),
+    ("제목: 기생충\n평점: 5\n봉준호 영화 중 최고", {'title': '기생충', 'score': 5.0}),
+    ("『귀멸의 칼날』 애니 ⭐⭐⭐⭐\n작화가 미쳤다", {'title': '귀멸의 칼날', 'score': 4.0}),
+    ("진격의 거인 2기 (애니) ★★★★½\n전개 미쳤음", {'title': '진격의 거인', 'score': 4.5}),
+    ("드라마 더 글로리 | 8/10 | 복수극은 역시 시원해야", {'title': '더 글로리', 'score': 4.0}),
+    ("웹툰 외모지상주의 별 3개\n초반은 재밌는데 늘어짐", {'title': '외모지상주의', 'score': 3.0}),
+    ("<전지적 독자 시점> 웹소설 4/5\n설정이 탄탄함", {'title': '전지적 독자 시점', 'score': 4.0}),
+    ("만화 원피스 - 5점\n인생 만화", {'title': '원피스', 'score': 5.0}),
+    ("게임 엘든 링 - 95/100 - 길 잃는 재미", {'title': '엘든 링', 'score': 4.75}),
+    ("영화 듄 파트2 (2024) - 4/5\n사운드가 압도적", {'title': '듄 파트2', 'score': 4.0}),
+    ("드라마 오징어 게임 시즌 2 - 3/5\n1보다는 아쉽다", {'title': '오징어 게임', 'score': 3.0}),
+    ("헤어질 결심 8/10\n대사가 오래 남는다", {'title': '헤어질 결심', 'score': 4.0}),
+    ("스파이더맨-노웨이홈 - 4/5 - 멀티버스 영화의 정석", {'title': '스파이더맨-노웨이홈', 'score': 4.0}),
+    ("Re:Zero 2기 | 8/10 | 애니 후반부 몰입감 최고", {'title': 'Re:Zero', 'score': 4.0}),
+    ("인터스텔라 - 4/5", {'title': '인터스텔라', 'score': 4.0}),
+    ("너의 이름은.\n⭐⭐⭐⭐⭐\n영상미 최고", {'title': '너의 이름은.', 'score': 5.0}),
+    ("어제 본 탑건 매버릭 진짜 재밌었음 8점 줄게", {'title': '탑건 매버릭', 'score': 4.0}),
+    ("오펜하이머 봤는데 3시간이 순삭이더라 추천", {'title': '오펜하이머', 'score': None}),
+    ("스파이 패밀리 2기는 1기보다 별로... 그래도 볼만함", {'title': '스파이 패밀리', 'score': None}),
+    ("인사이드 아웃 2 4/5, 엘리멘탈 3/5 둘 다 봄", {'title': '인사이드 아웃 2', 'score': 4.0}),
+    ("내일 7시에 모여서 영화 보러 갈 사람?", None),
+    ("ㅋㅋㅋㅋ 이거 완전 레전드다", None),
+    ("공지: 리뷰는 /한줄평 명령어로 작성해주세요", None),
+    ("오늘 회의는 2/3 정도 진행됐습니다", None),
+    ("다들 주말 잘 보내세요~~", None),
+    ("이번 주 박스오피스 1위가 뭐였죠?", None),
+    ("<@123456789> 영화 4/5 ㄱㄱ\n재밌음", None),
+    ("<:pepega:1234567> 영화 8점 ㅋㅋ\n이거 뭐임", None),
+    ("<#99999> 채널에 4/5 올려둠\n확인 부탁", None),
+    ("[공지] 영화 모임 투표 결과 4/5 찬성", None),
+    ("[질문] 드라마 추천 점수 8/10 이상인 거 있나요?", None),
+    ("[추천] 인터스텔라 - 5/5 - 영화관에서 다시 보고 싶다", {'title': '인터스텔라', 'score': 5.0}),
+    ("[맛집] 영화관 옆 팝콘집 4/5\n맛있음", None),
+    ("영화 모임 - 3/5명 참석", None),
+    # 일정/모임/예매 글 (카테고리 단어 + 'X - 점수' 모양이지만 리뷰가 아님)
+    ("영화 모임 - 4/5 참석\n다음주 토요일 7시", None),
+    ("드라마 정주행 - 3/5 완료\n오늘 밤에 마저 봄", None),
+    ("게임 대회 - 8/10 라운드\n다음 라운드는 내일", None),
+    ("영화 예매 완료 - 5점 만점에 5점\n좋다", None),
+    ("영화 티켓 예매 - 2/5 남음\n빨리 신청하세요", None),
+    ("[영화] 상영회 일정 - 7/10 금요일\n장소는 추후 공지", None),
+    ("애니 정모 - 참석 4/5\n회비는 만원", None),
+    ("게임 스터디 출석 | 9/10 | 다음 주 수요일 8시", None),
+    ("웹툰 연재 일정 - 3/5 휴재\n다음 화는 다음 주", None),
+    # 제목을 따옴표/괄호로 구분하면 규칙 파서가 받아들인다
+    ("[영화] \"라라랜드\" - 4/5 - 노래가 좋다", {'title': '라라랜드', 'score': 4.0, 'category': 'movie'}),
+    ("드라마 『더 글로리』 8/10\n복수극은 역시 시원해야", {'title': '더 글로리', 'score': 4.0, 'category': 'drama'}),
+    # 카테고리 태그가 없으면 제목 속 단어로 카테고리를 정하지 않고 LLM에 넘긴다
+    ("곡성 - 4/5 - 나홍진 최고", {'title': '곡성', 'score': 4.0, 'category': None}),
+    ("오징어 게임 - 4/5 - 재밌다", {'title': '오징어 게임', 'score': 4.0, 'category': None}),
+    ("라라랜드 - 4/5 - 노래가 좋다", {'title': '라라랜드', 'score': 4.0, 'category': None}),
+]
+
+
+def _benchmark():
+    """규칙 파서 적중률 측정: python legacy_parser.py"""
+    reviews = [(text, expected) for text, expected in BENCHMARK_CORPUS if expected]
+    non_reviews = [text for text, expected in BENCHMARK_CORPUS if not expected]
+
+    start = time.perf_counter()
+    hits = 0
+    correct = 0
+    for text, expected in reviews:
+        parsed, confidence = parse_legacy_review_rules(text)
+        accepted = parsed is not None and confidence >= LEGACY_PARSE_MIN_CONFIDENCE
+        ok = (
+            accepted
+            and parsed['title'] == expected['title']
+            and parsed['score'] == expected['score']
+            and parsed['category'] == expected.get('category', parsed['category'])
+        )
+        hits += accepted
+        correct += ok
+        mark = "✅" if ok else ("❌" if accepted else "→LLM")
+        print(f"{mark:5} {confidence:.2f} {text.splitlines()[0][:40]!r} -> {parsed and (parsed['title'], parsed['score'])}")
+
+    wrong_category = sum(
+        1 for text, expected in reviews
+        if 'category' in expected and expected['category'] is None
+        and parse_legacy_review_rules(text)[1] >= LEGACY_PARSE_MIN_CONFIDENCE
+    )
+
+    false_hits = 0
+    for text in non_reviews:
+        parsed, confidence = parse_legacy_review_rules(text)
+        accepted = parsed is not None and confidence >= LEGACY_PARSE_MIN_CONFIDENCE
+        false_hits += accepted
+        mark = "❌" if accepted else "✅"
+        print(f"{mark:5} {confidence:.2f} {text[:40]!r} (리뷰 아님)")
+    elapsed = time.perf_counter() - start
+
+    print()
+    print(f"기준 신뢰도: {LEGACY_PARSE_MIN_CONFIDENCE}")
+    print(f"적중률 (LLM 생략): {hits}/{len(reviews)} ({hits / len(reviews):.0%})")
+    print(f"적중 중 정확: {correct}/{hits}")
+    print(f"카테고리 태그 없이 적중: {wrong_category}")
+    print(f"리뷰 아닌 메시지 오탐: {false_hits}/{len(non_reviews)}")
+    print(f"메시지당 {elapsed / len(BENCHMARK_CORPUS) * 1000:.3f}ms")
+
+
+if __name__ == "__main__":
+    _benchmark()
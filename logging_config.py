@@ -0,0 +1,132 @@
+import atexit
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+
+from tracing import current_trace
+
+# 기본 로그 레벨과 서브시스템별 레벨
+# 예) LOG_LEVEL=INFO, LOG_LEVELS="bot.db=WARNING,bot.api=DEBUG,discord=WARNING"
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
+LOG_LEVELS = os.getenv("LOG_LEVELS", "")
+# text | json
+LOG_FORMAT = os.getenv("LOG_FORMAT", "text")
+LOG_QUEUE_SIZE = int(os.getenv("LOG_QUEUE_SIZE", "10000"))
+
+# 서브시스템 로거 이름
+#   bot            piacia.py (명령어/모달/링크 조회)
+#   bot.api        api_searcher.py (TMDB/MangaDex/Naver/MusicBrainz/Grok)
+#   bot.db         database.py
+#   bot.cache      metadata_cache.py
+#   bot.images     image_cache.py, image_pipeline.py
+#   bot.titles     title_index.py
+#   bot.metrics    monitoring.py
+#   bot.trace      tracing.py
+#   bot.reactions  review_interaction.py
+
+_listener = None
+
+
+class TraceContextFilter(logging.Filter):
+    """로그를 남긴 시점의 interaction trace 이름을 record에 붙인다 (호출한 쪽 컨텍스트에서 실행)."""
+
+    def filter(self, record):
+        trace = current_trace()
+        record.trace = trace.name if trace is not None and not trace.finished else None
+        return True
+
+
+class TextFormatter(logging.Formatter):
+    def __init__(self):
+        super().__init__("%(asctime)s %(levelname)-7s %(name)s: %(message)s")
+
+    def format(self, record):
+        text = super().format(record)
+        trace = getattr(record, "trace", None)
+        return f"{text} [{trace}]" if trace else text
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record):
+        entry = {
+            "ts": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        trace = getattr(record, "trace", None)
+        if trace:
+            entry["trace"] = trace
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False)
+
+
+class DroppingQueueHandler(logging.handlers.QueueHandler):
+    """큐가 가득 차면 이벤트 루프를 막지 않고 로그를 버린다."""
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            pass
+
+
+def _level(name, default=logging.INFO):
+    value = logging.getLevelName(name.strip().upper())
+    return value if isinstance(value, int) else default
+
+
+def parse_levels(spec):
+    """'bot.db=WARNING,bot.api=DEBUG' → {'bot.db': 30, 'bot.api': 10}"""
+    levels = {}
+    for item in spec.split(","):
+        name, sep, level = item.partition("=")
+        if not sep:
+            continue
+        value = _level(level, None)
+        if value is not None:
+            levels[name.strip()] = value
+    return levels
+
+
+def setup_logging():
+    """root 로거에 큐 핸들러를 달고, 실제 출력은 별도 스레드의 QueueListener가 담당한다.
+
+    로그를 남기는 쪽(이벤트 루프, DB 스레드)은 레벨 확인 후 큐에 넣기만 하므로
+    stdout 쓰기로 막히지 않는다. 여러 번 호출해도 한 번만 설정한다.
+    """
+    global _listener
+    if _listener is not None:
+        return
+
+    stream_handler = logging.StreamHandler(sys.stdout)
+    stream_handler.setFormatter(JsonFormatter() if LOG_FORMAT == "json" else TextFormatter())
+
+    log_queue = queue.Queue(LOG_QUEUE_SIZE)
+    queue_handler = DroppingQueueHandler(log_queue)
+    queue_handler.addFilter(TraceContextFilter())
+
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(queue_handler)
+    root.setLevel(_level(LOG_LEVEL))
+
+    for name, level in parse_levels(LOG_LEVELS).items():
+        logging.getLogger(name).setLevel(level)
+
+    _listener = logging.handlers.QueueListener(log_queue, stream_handler, respect_handler_level=True)
+    _listener.start()
+    atexit.register(shutdown_logging)
+
+
+def shutdown_logging():
+    """큐에 남은 로그를 모두 출력하고 리스너 스레드 종료."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
@@ -0,0 +1,316 @@
+import asyncio
+import copy
+import functools
+import inspect
+import json
+import logging
+import os
+import re
+import sys
+import time
+import unicodedata
+from collections import OrderedDict
+
+from tracing import span
+
+logger = logging.getLogger("bot.cache")
+
+METADATA_CACHE_MAX_BYTES = int(os.getenv("METADATA_CACHE_MAX_BYTES", str(32 * 1024 * 1024)))
+
+# provider별 TTL (초). 검색 결과는 자주, 크레딧/MusicBrainz 데이터는 드물게 바뀐다.
+PROVIDER_TTLS = {
+    'tmdb_search': 6 * 3600,
+    'tmdb_credits': 7 * 86400,
+    'tmdb_providers': 12 * 3600,
+    'mangadex': 86400,
+    'naver_webtoon': 86400,
+    'musicbrainz': 7 * 86400,
+    'coverart': 7 * 86400,
+    'steam': 86400,
+    'igdb': 86400,
+    'webnovel_page': 86400,
+    # 레거시 리뷰 LLM 파싱 결과 (메시지 내용/모델/프롬프트가 키에 들어가므로 사실상 바뀌지 않음)
+    'grok_legacy_review': 180 * 86400,
+}
+DEFAULT_TTL = 3600
+# 만료된 영구 캐시 항목도 이 기간까지는 먼저 반환하고 백그라운드에서 갱신
+METADATA_CACHE_MAX_STALE = int(os.getenv("METADATA_CACHE_MAX_STALE", str(30 * 86400)))
+# stale 항목을 메모리에 올려둘 시간 (갱신이 실패해도 이 동안은 재조회하지 않음)
+STALE_RETRY_TTL = 300
+# 사용자가 직접 입력한 검색어 인자 (나머지 ID/URL/옵션 인자는 그대로 키에 넣는다)
+QUERY_PARAMS = frozenset({'name', 'title', 'artist'})
+# 검색어 자리에 링크를 넣은 경우 (경로/ID는 대소문자를 구분하므로 정규화하지 않음)
+URL_PATTERN = re.compile(r'^\s*[a-z][a-z0-9+.-]*://', re.IGNORECASE)
+
+
+def normalize_query(value):
+    """캐시 키용 정규화: 대소문자/공백/유니코드 표기 차이를 무시 (URL은 앞뒤 공백만 제거)."""
+    if isinstance(value, str):
+        if URL_PATTERN.match(value):
+            return value.strip()
+        value = unicodedata.normalize('NFKC', value).casefold()
+        return re.sub(r'\s+', ' ', value).strip()
+    if isinstance(value, (list, tuple)):
+        return tuple(normalize_query(item) for item in value)
+    return value
+
+
+def is_empty_result(value):
+    """캐시하지 않을 결과 (검색 실패/오류 시 반환되는 값)."""
+    if value is None or value == "정보 없음":
+        return True
+    if isinstance(value, (list, dict)) and not value:
+        return True
+    if isinstance(value, tuple) and (not value or value[0] is None):
+        return True
+    return False
+
+
+def _store_key(key):
+    """메모리 캐시 키 (provider, ...) → 영구 캐시 cache_key 문자열."""
+    return json.dumps(key[1:], ensure_ascii=False, default=str)
+
+
+def _encode(value):
+    """JSONB 저장용. tuple 반환값은 복원할 수 있도록 표시해 둔다."""
+    if isinstance(value, tuple):
+        return {'__tuple__': list(value)}
+    return value
+
+
+def _decode(payload):
+    if isinstance(payload, dict) and set(payload) == {'__tuple__'}:
+        return tuple(payload['__tuple__'])
+    return payload
+
+
+def _estimate_size(value, _seen=None):
+    """객체가 차지하는 메모리를 대략적으로 계산 (LRU 용량 제한용)."""
+    if _seen is None:
+        _seen = set()
+    if id(value) in _seen:
+        return 0
+    _seen.add(id(value))
+
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        size += sum(_estimate_size(k, _seen) + _estimate_size(v, _seen) for k, v in value.items())
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        size += sum(_estimate_size(item, _seen) for item in value)
+    return size
+
+
+class MetadataCache:
+    """외부 API 조회 결과용 TTL + LRU 캐시.
+
+    전체 크기가 max_bytes를 넘으면 가장 오래 안 쓴 항목부터 버린다.
+    같은 키를 동시에 조회하면 첫 요청만 API를 호출하고 나머지는 그 결과를 기다린다.
+    attach_store()로 DB를 연결하면 메모리에 없는 항목은 metadata_cache 테이블(L2)에서
+    찾고, 만료된 항목은 먼저 반환한 뒤 백그라운드에서 갱신한다.
+    """
+
+    def __init__(self, max_bytes=METADATA_CACHE_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._inflight = {}
+        self._refreshing = set()
+        self._tasks = set()
+        self._db = None
+        self._size = 0
+        self._stats = {}
+
+    def attach_store(self, db):
+        """영구 캐시(L2) 연결. db는 AsyncDatabase."""
+        self._db = db
+
+    def _provider_stats(self, provider):
+        if provider not in self._stats:
+            self._stats[provider] = {
+                'hits': 0, 'misses': 0, 'coalesced': 0, 'evictions': 0,
+                'l2_hits': 0, 'stale_hits': 0, 'refreshes': 0,
+            }
+        return self._stats[provider]
+
+    def get(self, key):
+        """(found, value) 반환. 만료된 항목은 지운다."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return False, None
+
+        expires_at, size, value = entry
+        if expires_at <= time.monotonic():
+            self._remove(key)
+            return False, None
+
+        self._entries.move_to_end(key)
+        return True, copy.deepcopy(value)
+
+    def set(self, key, value, ttl):
+        size = _estimate_size(value)
+        if size > self.max_bytes:
+            return
+
+        if key in self._entries:
+            self._remove(key)
+        self._entries[key] = (time.monotonic() + ttl, size, copy.deepcopy(value))
+        self._size += size
+
+        while self._size > self.max_bytes and self._entries:
+            old_key = next(iter(self._entries))
+            self._remove(old_key)
+            self._provider_stats(old_key[0])['evictions'] += 1
+
+    def _remove(self, key):
+        _, size, _ = self._entries.pop(key)
+        self._size -= size
+
+    def invalidate(self, provider=None):
+        """provider 항목만 (None이면 전체) 비운다."""
+        for key in [k for k in self._entries if provider is None or k[0] == provider]:
+            self._remove(key)
+
+    async def get_or_fetch(self, provider, key, fetch, ttl=None):
+        """캐시에 있으면 반환, 없으면 fetch()를 한 번만 실행해 저장 후 반환."""
+        with span(f"cache.{provider}") as trace_span:
+            return await self._get_or_fetch(provider, key, fetch, ttl, trace_span)
+
+    async def _get_or_fetch(self, provider, key, fetch, ttl, trace_span):
+        stats = self._provider_stats(provider)
+        key = (provider,) + tuple(key)
+        ttl = ttl if ttl is not None else PROVIDER_TTLS.get(provider, DEFAULT_TTL)
+
+        found, value = self.get(key)
+        if found:
+            stats['hits'] += 1
+            trace_span.set(result='hit')
+            return value
+
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            stats['coalesced'] += 1
+            trace_span.set(result='coalesced')
+            value = await asyncio.shield(inflight)
+            return copy.deepcopy(value)
+
+        # 조회는 별도 task로 실행한다. 처음 요청한 쪽(예: 시간 제한이 걸린 프리페치)이
+        # 취소돼도 조회는 계속되고, 같은 키를 기다리던 요청은 그 결과를 받는다.
+        task = asyncio.create_task(self._load_or_fetch(provider, key, fetch, ttl, trace_span))
+        self._inflight[key] = task
+        self._tasks.add(task)
+        task.add_done_callback(lambda done: self._finish(key, done))
+        value = await asyncio.shield(task)
+        return copy.deepcopy(value)
+
+    async def _load_or_fetch(self, provider, key, fetch, ttl, trace_span):
+        stats = self._provider_stats(provider)
+        row = await self._load_persistent(key)
+        if row is not None:
+            value = _decode(row['payload'])
+            if row['expired']:
+                stats['stale_hits'] += 1
+                trace_span.set(result='stale')
+                self.set(key, value, STALE_RETRY_TTL)
+                self._revalidate(provider, key, fetch, ttl)
+            else:
+                stats['l2_hits'] += 1
+                trace_span.set(result='l2')
+                self.set(key, value, row['ttl_remaining'])
+            return value
+        stats['misses'] += 1
+        trace_span.set(result='miss')
+        return await self._fetch_and_store(key, fetch, ttl)
+
+    def _finish(self, key, task):
+        self._tasks.discard(task)
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled():
+            # 기다리는 요청이 없어도 "exception was never retrieved" 경고가 나지 않도록
+            task.exception()
+
+    async def _fetch_and_store(self, key, fetch, ttl):
+        value = await fetch()
+        if not is_empty_result(value):
+            self.set(key, value, ttl)
+            if self._db is not None:
+                self._spawn(self._db.save_metadata_cache_entry(
+                    key[0], _store_key(key), _encode(copy.deepcopy(value)), ttl
+                ))
+        return value
+
+    async def _load_persistent(self, key):
+        if self._db is None:
+            return None
+        try:
+            return await self._db.get_metadata_cache_entry(
+                key[0], _store_key(key), METADATA_CACHE_MAX_STALE
+            )
+        except Exception as e:
+            logger.warning("metadata_cache 영구 캐시 조회 실패: %s", e)
+            return None
+
+    def _revalidate(self, provider, key, fetch, ttl):
+        """stale 항목을 백그라운드에서 다시 조회 (키당 하나만 실행)."""
+        if key in self._refreshing:
+            return
+        self._refreshing.add(key)
+
+        async def refresh():
+            try:
+                await self._fetch_and_store(key, fetch, ttl)
+                self._provider_stats(provider)['refreshes'] += 1
+            except Exception as e:
+                logger.warning("metadata_cache 백그라운드 갱신 실패 (%s): %s", provider, e)
+            finally:
+                self._refreshing.discard(key)
+
+        self._spawn(refresh())
+
+    def _spawn(self, coro):
+        task = asyncio.create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    def stats(self):
+        """provider별 hit/miss 통계와 현재 크기."""
+        providers = {}
+        for provider, counts in self._stats.items():
+            served = counts['hits'] + counts['coalesced'] + counts['l2_hits'] + counts['stale_hits']
+            lookups = served + counts['misses']
+            providers[provider] = dict(counts, hit_rate=served / lookups if lookups else 0.0)
+        return {
+            'entries': len(self._entries),
+            'size_bytes': self._size,
+            'max_bytes': self.max_bytes,
+            'providers': providers,
+        }
+
+
+metadata_cache = MetadataCache()
+
+
+def cached(provider, ttl=None):
+    """ContentSearcher 조회 함수용 캐시 데코레이터.
+
+    첫 번째 인자(session)는 키에서 제외한다. 검색어 인자(QUERY_PARAMS)만 정규화하고
+    ID/URL 같은 나머지 인자는 대소문자가 다르면 다른 값이므로 그대로 키에 넣는다.
+    """
+    def decorator(func):
+        signature = inspect.signature(func)
+
+        @functools.wraps(func)
+        async def wrapper(session, *args, **kwargs):
+            bound = signature.bind(session, *args, **kwargs)
+            bound.apply_defaults()
+            key = (func.__name__,) + tuple(
+                normalize_query(value) if name in QUERY_PARAMS else value
+                for name, value in list(bound.arguments.items())[1:]
+            )
+            return await metadata_cache.get_or_fetch(
+                provider,
+                key,
+                lambda: func(session, *args, **kwargs),
+                ttl=ttl
+            )
+        return wrapper
+    return decorator
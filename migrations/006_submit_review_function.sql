@@ -0,0 +1,174 @@
+-- Migration 006: Single-round-trip review submission.
+--
+-- submit_review()는 작품 UPSERT, 중복/회고 검사, unit_from 계산, 리뷰 INSERT를
+-- 한 트랜잭션 안에서 처리하고 상태 코드를 반환한다.
+--   status: 'created' | 'duplicate' | 'retro'
+-- 봇 시작 시 Database.create_tables()에서도 같은 함수를 CREATE OR REPLACE 한다.
+
+BEGIN;
+
+CREATE OR REPLACE FUNCTION find_content_id(
+    p_title TEXT,
+    p_category TEXT,
+    p_creator TEXT,
+    p_musicbrainz_id TEXT,
+    p_igdb_id INTEGER,
+    p_steam_appid INTEGER
+) RETURNS INTEGER
+LANGUAGE plpgsql STABLE AS $$
+DECLARE
+    v_id INTEGER;
+BEGIN
+    IF p_category = 'music_track' THEN
+        IF p_musicbrainz_id IS NOT NULL THEN
+            SELECT c.id INTO v_id FROM contents c
+            WHERE c.musicbrainz_id = p_musicbrainz_id AND c.category = p_category;
+        END IF;
+        IF v_id IS NULL THEN
+            SELECT c.id INTO v_id FROM contents c
+            WHERE c.title = p_title
+              AND c.category = p_category
+              AND COALESCE(c.creator, '') = COALESCE(p_creator, '');
+        END IF;
+    ELSIF p_category = 'game' THEN
+        IF p_igdb_id IS NOT NULL THEN
+            SELECT c.id INTO v_id FROM contents c
+            WHERE c.igdb_id = p_igdb_id AND c.category = p_category;
+        END IF;
+        IF v_id IS NULL AND p_steam_appid IS NOT NULL THEN
+            SELECT c.id INTO v_id FROM contents c
+            WHERE c.steam_appid = p_steam_appid AND c.category = p_category;
+        END IF;
+        IF v_id IS NULL THEN
+            SELECT c.id INTO v_id FROM contents c
+            WHERE c.title = p_title
+              AND c.category = p_category
+              AND COALESCE(c.creator, '') = COALESCE(p_creator, '');
+        END IF;
+    ELSE
+        SELECT c.id INTO v_id FROM contents c
+        WHERE c.title = p_title AND c.category = p_category;
+    END IF;
+    RETURN v_id;
+END;
+$$;
+
+CREATE OR REPLACE FUNCTION submit_review(
+    p_user_id BIGINT,
+    p_username TEXT,
+    p_title TEXT,
+    p_category TEXT,
+    p_score REAL,
+    p_one_line_review TEXT,
+    p_additional_comment TEXT,
+    p_year_or_platform TEXT DEFAULT NULL,
+    p_creator TEXT DEFAULT NULL,
+    p_img_url TEXT DEFAULT NULL,
+    p_tmdb_id INTEGER DEFAULT NULL,
+    p_mangadex_id TEXT DEFAULT NULL,
+    p_naver_title_id TEXT DEFAULT NULL,
+    p_musicbrainz_id TEXT DEFAULT NULL,
+    p_musicbrainz_type TEXT DEFAULT NULL,
+    p_igdb_id INTEGER DEFAULT NULL,
+    p_steam_appid INTEGER DEFAULT NULL,
+    p_unit_to INTEGER DEFAULT NULL,
+    p_season INTEGER DEFAULT NULL,
+    p_latest_units INTEGER DEFAULT NULL,
+    p_source_url TEXT DEFAULT NULL
+) RETURNS TABLE (status TEXT, content_id INTEGER, review_id INTEGER, unit_from INTEGER)
+LANGUAGE plpgsql AS $$
+#variable_conflict use_column
+DECLARE
+    v_content_id INTEGER;
+    v_review_id INTEGER;
+    v_max_unit INTEGER;
+    v_unit_from INTEGER;
+BEGIN
+    -- 1. 작품 조회 또는 생성 (get_or_create_content와 같은 식별 규칙)
+    v_content_id := find_content_id(
+        p_title, p_category, p_creator, p_musicbrainz_id, p_igdb_id, p_steam_appid
+    );
+
+    IF v_content_id IS NULL THEN
+        BEGIN
+            INSERT INTO contents
+            (title, category, year_or_platform, creator, img_url,
+             tmdb_id, mangadex_id, naver_title_id,
+             musicbrainz_id, musicbrainz_type, igdb_id, steam_appid)
+            VALUES (p_title, p_category, p_year_or_platform, p_creator, p_img_url,
+                    p_tmdb_id, p_mangadex_id, p_naver_title_id,
+                    p_musicbrainz_id, p_musicbrainz_type, p_igdb_id, p_steam_appid)
+            RETURNING id INTO v_content_id;
+        EXCEPTION WHEN unique_violation THEN
+            -- 다른 요청이 같은 작품을 먼저 만든 경우 다시 조회
+            v_content_id := find_content_id(
+                p_title, p_category, p_creator, p_musicbrainz_id, p_igdb_id, p_steam_appid
+            );
+        END;
+    END IF;
+
+    IF v_content_id IS NULL THEN
+        RAISE EXCEPTION 'submit_review: content lookup failed for %', p_title;
+    END IF;
+
+    UPDATE contents c
+    SET year_or_platform = COALESCE(c.year_or_platform, p_year_or_platform),
+        creator = COALESCE(c.creator, p_creator),
+        img_url = COALESCE(c.img_url, p_img_url),
+        tmdb_id = COALESCE(c.tmdb_id, p_tmdb_id),
+        mangadex_id = COALESCE(c.mangadex_id, p_mangadex_id),
+        naver_title_id = COALESCE(c.naver_title_id, p_naver_title_id),
+        musicbrainz_id = COALESCE(c.musicbrainz_id, p_musicbrainz_id),
+        musicbrainz_type = COALESCE(c.musicbrainz_type, p_musicbrainz_type),
+        igdb_id = COALESCE(c.igdb_id, p_igdb_id),
+        steam_appid = COALESCE(c.steam_appid, p_steam_appid)
+    WHERE c.id = v_content_id;
+
+    -- 2. 같은 유저/작품에 대한 동시 제출 직렬화 (트랜잭션 종료 시 자동 해제)
+    PERFORM pg_advisory_xact_lock(hashtext(p_user_id::TEXT || ':' || v_content_id::TEXT));
+
+    -- 3. 중복/회고 검사 + unit_from 계산
+    IF p_unit_to IS NULL THEN
+        IF EXISTS (
+            SELECT 1 FROM reviews r
+            WHERE r.user_id = p_user_id
+              AND r.content_id = v_content_id
+              AND r.unit_from IS NULL AND r.unit_to IS NULL
+              AND r.season IS NOT DISTINCT FROM p_season
+        ) THEN
+            RETURN QUERY SELECT 'duplicate'::TEXT, v_content_id, NULL::INTEGER, NULL::INTEGER;
+            RETURN;
+        END IF;
+    ELSE
+        SELECT MAX(r.unit_to) INTO v_max_unit
+        FROM reviews r
+        WHERE r.user_id = p_user_id
+          AND r.content_id = v_content_id
+          AND r.season IS NOT DISTINCT FROM p_season;
+
+        IF v_max_unit IS NOT NULL AND v_max_unit > 0 AND p_unit_to <= v_max_unit THEN
+            RETURN QUERY SELECT 'retro'::TEXT, v_content_id, NULL::INTEGER, NULL::INTEGER;
+            RETURN;
+        END IF;
+        v_unit_from := COALESCE(v_max_unit, 0) + 1;
+    END IF;
+
+    -- 4. 리뷰 저장 (레거시 컬럼은 contents 값으로 채움)
+    INSERT INTO reviews
+    (user_id, username, movie_title, movie_year, director,
+     category, img_url, content_id, unit_from, unit_to,
+     score, one_line_review, additional_comment,
+     season, latest_units, source_url)
+    SELECT p_user_id, p_username, c.title, c.year_or_platform, c.creator,
+           c.category, c.img_url, c.id, v_unit_from, p_unit_to,
+           p_score, p_one_line_review, p_additional_comment,
+           p_season, p_latest_units, p_source_url
+    FROM contents c
+    WHERE c.id = v_content_id
+    RETURNING id INTO v_review_id;
+
+    RETURN QUERY SELECT 'created'::TEXT, v_content_id, v_review_id, v_unit_from;
+END;
+$$;
+
+COMMIT;
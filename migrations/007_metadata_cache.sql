@@ -0,0 +1,20 @@
+-- Migration 007: Persistent metadata cache for external API lookups.
+--
+-- ContentSearcher 조회 결과를 provider + 정규화된 요청 키로 저장한다.
+-- expires_at이 지난 항목도 봇이 먼저 반환하고 백그라운드에서 갱신한다.
+
+BEGIN;
+
+CREATE TABLE IF NOT EXISTS metadata_cache (
+    provider TEXT NOT NULL,
+    cache_key TEXT NOT NULL,
+    payload JSONB NOT NULL,
+    fetched_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    expires_at TIMESTAMPTZ NOT NULL,
+    PRIMARY KEY (provider, cache_key)
+);
+
+CREATE INDEX IF NOT EXISTS idx_metadata_cache_fetched_at
+ON metadata_cache(fetched_at);
+
+COMMIT;
@@ -0,0 +1,130 @@
+-- Migration 008: Trigger-maintained reaction totals for the review ranking.
+--
+-- review_reaction_totals는 리뷰별 반응 수와 종류별 개수를 저장한다.
+-- review_reactions에 INSERT/UPDATE/DELETE가 일어날 때 트리거가 증감시키므로
+-- /리뷰랭킹은 (category, reaction_count) 인덱스만 읽으면 된다.
+-- 봇 시작 시 Database.create_tables()에서도 같은 객체를 만든다.
+
+BEGIN;
+
+CREATE TABLE IF NOT EXISTS review_reaction_totals (
+    review_id INTEGER PRIMARY KEY REFERENCES reviews(id) ON DELETE CASCADE,
+    category TEXT,
+    review_created_at TIMESTAMP,
+    reaction_count INTEGER NOT NULL DEFAULT 0,
+    reaction_breakdown JSONB NOT NULL DEFAULT '{}'::jsonb,
+    updated_at TIMESTAMP NOT NULL DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS idx_reaction_totals_rank
+ON review_reaction_totals(reaction_count DESC, review_created_at DESC)
+WHERE reaction_count > 0;
+
+CREATE INDEX IF NOT EXISTS idx_reaction_totals_category_rank
+ON review_reaction_totals(category, reaction_count DESC, review_created_at DESC)
+WHERE reaction_count > 0;
+
+CREATE OR REPLACE FUNCTION bump_review_reaction_total(
+    p_review_id INTEGER,
+    p_reaction_type TEXT,
+    p_delta INTEGER
+) RETURNS VOID
+LANGUAGE plpgsql AS $$
+BEGIN
+    INSERT INTO review_reaction_totals AS t
+        (review_id, category, review_created_at, reaction_count, reaction_breakdown)
+    SELECT r.id,
+           COALESCE(c.category, r.category),
+           r.created_at,
+           GREATEST(p_delta, 0),
+           CASE WHEN p_delta > 0
+                THEN jsonb_build_object(p_reaction_type, p_delta)
+                ELSE '{}'::jsonb END
+    FROM reviews r
+    LEFT JOIN contents c ON c.id = r.content_id
+    WHERE r.id = p_review_id
+    ON CONFLICT (review_id) DO UPDATE
+    SET reaction_count = GREATEST(t.reaction_count + p_delta, 0),
+        reaction_breakdown = CASE
+            WHEN COALESCE((t.reaction_breakdown ->> p_reaction_type)::INTEGER, 0) + p_delta > 0
+            THEN t.reaction_breakdown || jsonb_build_object(
+                p_reaction_type,
+                COALESCE((t.reaction_breakdown ->> p_reaction_type)::INTEGER, 0) + p_delta
+            )
+            ELSE t.reaction_breakdown - p_reaction_type
+        END,
+        updated_at = NOW();
+END;
+$$;
+
+CREATE OR REPLACE FUNCTION review_reactions_sync_totals() RETURNS TRIGGER
+LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        PERFORM bump_review_reaction_total(NEW.review_id, NEW.reaction_type, 1);
+    ELSIF TG_OP = 'DELETE' THEN
+        PERFORM bump_review_reaction_total(OLD.review_id, OLD.reaction_type, -1);
+    ELSIF OLD.review_id IS DISTINCT FROM NEW.review_id
+       OR OLD.reaction_type IS DISTINCT FROM NEW.reaction_type THEN
+        PERFORM bump_review_reaction_total(OLD.review_id, OLD.reaction_type, -1);
+        PERFORM bump_review_reaction_total(NEW.review_id, NEW.reaction_type, 1);
+    END IF;
+    RETURN NULL;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS trg_review_reactions_sync_totals ON review_reactions;
+CREATE TRIGGER trg_review_reactions_sync_totals
+AFTER INSERT OR UPDATE OR DELETE ON review_reactions
+FOR EACH ROW EXECUTE FUNCTION review_reactions_sync_totals();
+
+CREATE OR REPLACE FUNCTION reviews_sync_reaction_category() RETURNS TRIGGER
+LANGUAGE plpgsql AS $$
+BEGIN
+    UPDATE review_reaction_totals t
+    SET category = COALESCE(
+            (SELECT c.category FROM contents c WHERE c.id = NEW.content_id),
+            NEW.category
+        ),
+        review_created_at = NEW.created_at
+    WHERE t.review_id = NEW.id;
+    RETURN NULL;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS trg_reviews_sync_reaction_category ON reviews;
+CREATE TRIGGER trg_reviews_sync_reaction_category
+AFTER UPDATE OF content_id, category, created_at ON reviews
+FOR EACH ROW EXECUTE FUNCTION reviews_sync_reaction_category();
+
+-- 기존 반응 백필 (백필 중 새 반응이 끼어들지 않도록 잠금)
+LOCK TABLE review_reactions IN SHARE MODE;
+
+INSERT INTO review_reaction_totals
+    (review_id, category, review_created_at, reaction_count, reaction_breakdown)
+SELECT r.id,
+       COALESCE(c.category, r.category),
+       r.created_at,
+       agg.reaction_count,
+       agg.reaction_breakdown
+FROM (
+    SELECT review_id,
+           SUM(cnt)::INTEGER AS reaction_count,
+           jsonb_object_agg(reaction_type, cnt) AS reaction_breakdown
+    FROM (
+        SELECT review_id, reaction_type, COUNT(*) AS cnt
+        FROM review_reactions
+        GROUP BY review_id, reaction_type
+    ) per_type
+    GROUP BY review_id
+) agg
+JOIN reviews r ON r.id = agg.review_id
+LEFT JOIN contents c ON c.id = r.content_id
+ON CONFLICT (review_id) DO UPDATE
+SET category = EXCLUDED.category,
+    review_created_at = EXCLUDED.review_created_at,
+    reaction_count = EXCLUDED.reaction_count,
+    reaction_breakdown = EXCLUDED.reaction_breakdown,
+    updated_at = NOW();
+
+COMMIT;
@@ -0,0 +1,9 @@
+-- Migration 009: Index reviews.message_id for reaction button / context menu lookups.
+
+BEGIN;
+
+CREATE INDEX IF NOT EXISTS idx_reviews_message_id
+ON reviews(message_id)
+WHERE message_id IS NOT NULL;
+
+COMMIT;
@@ -0,0 +1,41 @@
+-- Migration 010: Indexes matching the hot review query shapes.
+--
+-- 쿼리별로 사용하는 인덱스:
+--   submit_review / get_user_review / update_review / delete_review
+--       reviews(user_id, content_id, season, created_at DESC)
+--   get_user_reviews (/내리뷰)
+--       reviews(user_id, created_at DESC, id DESC)
+--   get_review_history (/리뷰히스토리) - content_id가 없는 레거시 행
+--       reviews(user_id, movie_title, category) WHERE content_id IS NULL
+--   contents 제목 조회 (음악/게임은 unique 인덱스 대상이 아님)
+--       contents(title, category)
+--   get_review_logs
+--       review_logs(user_id, created_at DESC, id DESC)
+-- 봇 시작 시 Database.create_tables()에서도 같은 인덱스를 만든다.
+
+BEGIN;
+
+CREATE INDEX IF NOT EXISTS idx_reviews_user_content_season
+ON reviews(user_id, content_id, season, created_at DESC);
+
+CREATE INDEX IF NOT EXISTS idx_reviews_user_created
+ON reviews(user_id, created_at DESC, id DESC);
+
+CREATE INDEX IF NOT EXISTS idx_reviews_legacy_title
+ON reviews(user_id, movie_title, category)
+WHERE content_id IS NULL;
+
+CREATE INDEX IF NOT EXISTS idx_contents_title
+ON contents(title, category);
+
+CREATE INDEX IF NOT EXISTS idx_review_logs_user_created
+ON review_logs(user_id, created_at DESC, id DESC);
+
+COMMIT;
+
+ANALYZE reviews;
+ANALYZE contents;
+ANALYZE review_logs;
+
+-- 실행 계획 확인: DATABASE_URL=... python database.py
+-- (database.HOT_QUERY_PLANS의 쿼리에 Seq Scan on reviews / contents / review_logs가 있으면 실패)
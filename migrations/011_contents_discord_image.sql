@@ -0,0 +1,12 @@
+-- Migration 011: Remember the Discord CDN attachment URL of each content's poster.
+--
+-- 같은 작품의 리뷰를 다시 올릴 때 포스터를 재업로드하지 않고 embed로 이 URL을 참조한다.
+-- discord_image_source는 업로드한 원본 img_url (contents.img_url이 바뀌면 재사용하지 않음).
+-- 봇 시작 시 Database.create_tables()에서도 같은 컬럼을 추가한다.
+
+BEGIN;
+
+ALTER TABLE contents ADD COLUMN IF NOT EXISTS discord_image_url TEXT;
+ALTER TABLE contents ADD COLUMN IF NOT EXISTS discord_image_source TEXT;
+
+COMMIT;
@@ -0,0 +1,22 @@
+-- Migration 012: Resumable legacy review migration.
+--
+-- /마이그레이션이 배치를 저장할 때마다 채널별로 마지막 처리 message_id와 누적 카운트를 남긴다.
+-- status가 'running'인 채로 남아 있으면 다음 실행에서 before=last_message_id부터 이어한다.
+-- 봇 시작 시 Database.create_tables()에서도 같은 테이블을 만든다.
+
+BEGIN;
+
+CREATE TABLE IF NOT EXISTS migration_checkpoints (
+    channel_id BIGINT PRIMARY KEY,
+    last_message_id BIGINT,
+    target_count INTEGER NOT NULL,
+    processed INTEGER NOT NULL DEFAULT 0,
+    migrated INTEGER NOT NULL DEFAULT 0,
+    skipped INTEGER NOT NULL DEFAULT 0,
+    failed INTEGER NOT NULL DEFAULT 0,
+    status TEXT NOT NULL DEFAULT 'running',
+    started_at TIMESTAMP DEFAULT NOW(),
+    updated_at TIMESTAMP DEFAULT NOW()
+);
+
+COMMIT;
@@ -0,0 +1,13 @@
+-- Migration 013: Remember which legacy messages failed to parse.
+--
+-- /마이그레이션은 Grok 오류로 파싱하지 못한 메시지가 있어도 체크포인트를 계속 옮기고,
+-- 그 message_id를 failed_message_ids에 남긴다. 이어하기에서 먼저 다시 시도하고,
+-- 끝나면 남은 목록을 관리자에게 보여준다.
+-- 봇 시작 시 Database.create_tables()에서도 같은 컬럼을 추가한다.
+
+BEGIN;
+
+ALTER TABLE migration_checkpoints
+ADD COLUMN IF NOT EXISTS failed_message_ids BIGINT[] NOT NULL DEFAULT '{}';
+
+COMMIT;
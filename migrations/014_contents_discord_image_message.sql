@@ -0,0 +1,11 @@
+-- Migration 014: Remember which review message owns the reused poster attachment.
+--
+-- contents.discord_image_url은 다른 리뷰 메시지의 첨부파일이라 그 메시지가 지워지면 깨진다.
+-- 리뷰를 삭제할 때 discord_image_message_id가 같은 작품의 URL을 비워 다음 리뷰가 다시 업로드하게 한다.
+-- 봇 시작 시 Database.create_tables()에서도 같은 컬럼을 추가한다.
+
+BEGIN;
+
+ALTER TABLE contents ADD COLUMN IF NOT EXISTS discord_image_message_id BIGINT;
+
+COMMIT;
@@ -0,0 +1,245 @@
+import functools
+import logging
+import os
+import threading
+import time
+
+logger = logging.getLogger("bot.metrics")
+
+METRICS_PORT = int(os.getenv("METRICS_PORT", "0"))
+
+# 지연 시간 히스토그램 버킷 (초)
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class LatencyHistogram:
+    """고정 버킷 지연 시간 히스토그램. 백분위는 버킷 상한으로 근사한다."""
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds):
+        for idx, bound in enumerate(self.buckets):
+            if seconds <= bound:
+                self.counts[idx] += 1
+                break
+        else:
+            self.counts[-1] += 1
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+
+    def percentile(self, q):
+        if not self.count:
+            return 0.0
+        target = q * self.count
+        cumulative = 0
+        for idx, bucket_count in enumerate(self.counts):
+            cumulative += bucket_count
+            if cumulative >= target:
+                return min(self.buckets[idx], self.max) if idx < len(self.buckets) else self.max
+        return self.max
+
+
+class MethodStats:
+    def __init__(self):
+        self.latency = LatencyHistogram()
+        self.errors = 0
+        self.rows = 0
+
+
+class Metrics:
+    """DB 메서드별 호출 수/지연 시간/반환 행 수와 연결 획득 시간 수집 (스레드 안전)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._methods = {}
+        self.pool_acquire = LatencyHistogram()
+        self.started_at = time.time()
+
+    def record_call(self, name, seconds, rows=None, error=False):
+        with self._lock:
+            stats = self._methods.get(name)
+            if stats is None:
+                stats = self._methods[name] = MethodStats()
+            stats.latency.observe(seconds)
+            if rows:
+                stats.rows += rows
+            if error:
+                stats.errors += 1
+
+    def record_pool_acquire(self, seconds):
+        with self._lock:
+            self.pool_acquire.observe(seconds)
+
+    def snapshot(self):
+        """메서드별 요약: {name: {calls, errors, rows, p50, p95, p99, max, avg}}"""
+        with self._lock:
+            return {
+                name: {
+                    'calls': stats.latency.count,
+                    'errors': stats.errors,
+                    'rows': stats.rows,
+                    'p50': stats.latency.percentile(0.50),
+                    'p95': stats.latency.percentile(0.95),
+                    'p99': stats.latency.percentile(0.99),
+                    'max': stats.latency.max,
+                    'avg': stats.latency.total / stats.latency.count if stats.latency.count else 0.0,
+                }
+                for name, stats in self._methods.items()
+            }
+
+    def pool_acquire_summary(self):
+        with self._lock:
+            return {
+                'count': self.pool_acquire.count,
+                'p50': self.pool_acquire.percentile(0.50),
+                'p95': self.pool_acquire.percentile(0.95),
+                'p99': self.pool_acquire.percentile(0.99),
+                'max': self.pool_acquire.max,
+            }
+
+    def render_prometheus(self, gauges=None):
+        """Prometheus text exposition 형식으로 변환.
+
+        Args:
+            gauges: 추가로 내보낼 {metric_name: value} (풀/캐시 상태 등)
+        """
+        lines = []
+        with self._lock:
+            lines.append("# HELP bot_db_call_seconds Database method latency.")
+            lines.append("# TYPE bot_db_call_seconds histogram")
+            for name, stats in sorted(self._methods.items()):
+                lines.extend(_histogram_lines("bot_db_call_seconds", stats.latency, f'method="{name}"'))
+
+            lines.append("# HELP bot_db_call_errors_total Database method calls that raised or logged an error.")
+            lines.append("# TYPE bot_db_call_errors_total counter")
+            for name, stats in sorted(self._methods.items()):
+                lines.append(f'bot_db_call_errors_total{{method="{name}"}} {stats.errors}')
+
+            lines.append("# HELP bot_db_rows_total Rows returned by database methods.")
+            lines.append("# TYPE bot_db_rows_total counter")
+            for name, stats in sorted(self._methods.items()):
+                lines.append(f'bot_db_rows_total{{method="{name}"}} {stats.rows}')
+
+            lines.append("# HELP bot_db_pool_acquire_seconds Time spent waiting for a pooled connection.")
+            lines.append("# TYPE bot_db_pool_acquire_seconds histogram")
+            lines.extend(_histogram_lines("bot_db_pool_acquire_seconds", self.pool_acquire, ""))
+
+        for metric_name, value in sorted((gauges or {}).items()):
+            lines.append(f"# TYPE {metric_name} gauge")
+            lines.append(f"{metric_name} {value}")
+
+        return "\n".join(lines) + "\n"
+
+
+def _histogram_lines(metric, histogram, labels):
+    prefix = f"{labels}," if labels else ""
+    lines = []
+    cumulative = 0
+    for bound, bucket_count in zip(histogram.buckets, histogram.counts):
+        cumulative += bucket_count
+        lines.append(f'{metric}_bucket{{{prefix}le="{bound}"}} {cumulative}')
+    lines.append(f'{metric}_bucket{{{prefix}le="+Inf"}} {histogram.count}')
+    suffix = f"{{{labels}}}" if labels else ""
+    lines.append(f"{metric}_sum{suffix} {histogram.total}")
+    lines.append(f"{metric}_count{suffix} {histogram.count}")
+    return lines
+
+
+metrics = Metrics()
+
+
+def _count_rows(result):
+    if isinstance(result, list):
+        return len(result)
+    if isinstance(result, dict):
+        return 1
+    return None
+
+
+# 스레드별로 ERROR 로그가 몇 번 남았는지 (메서드가 예외를 잡고 로그만 남긴 실패도 오류로 집계)
+_logged_errors = threading.local()
+
+
+class ErrorLogCounter(logging.Filter):
+    """붙인 로거에 ERROR 이상이 기록되면 현재 스레드의 카운터를 올린다."""
+
+    def filter(self, record):
+        if record.levelno >= logging.ERROR:
+            _logged_errors.count = getattr(_logged_errors, 'count', 0) + 1
+        return True
+
+
+def instrument_methods(exclude=(), error_logger=None):
+    """클래스의 모든 공개 메서드 호출 시간을 metrics에 기록하는 클래스 데코레이터.
+
+    Args:
+        error_logger: 메서드가 실패를 예외 대신 이 로거의 ERROR 로그로 남기는 경우 그 로거 이름
+            (호출 중 ERROR 로그가 남으면 오류로 집계)
+    """
+    if error_logger is not None:
+        error_log = logging.getLogger(error_logger)
+        if not any(isinstance(f, ErrorLogCounter) for f in error_log.filters):
+            error_log.addFilter(ErrorLogCounter())
+
+    def decorator(cls):
+        for name, attr in list(vars(cls).items()):
+            if name.startswith('_') or name in exclude or not callable(attr):
+                continue
+            setattr(cls, name, _timed(attr, name))
+        return cls
+    return decorator
+
+
+def _timed(method, name):
+    @functools.wraps(method)
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        logged_before = getattr(_logged_errors, 'count', 0)
+        try:
+            result = method(*args, **kwargs)
+        except Exception:
+            metrics.record_call(name, time.perf_counter() - start, error=True)
+            raise
+        logged_error = getattr(_logged_errors, 'count', 0) > logged_before
+        metrics.record_call(name, time.perf_counter() - start, rows=_count_rows(result), error=logged_error)
+        return result
+    return wrapper
+
+
+def format_duration(seconds):
+    if seconds >= 1:
+        return f"{seconds:.2f}s"
+    return f"{seconds * 1000:.1f}ms"
+
+
+async def start_metrics_server(get_gauges, port=METRICS_PORT):
+    """/metrics 엔드포인트를 여는 aiohttp 서버 시작. port가 0이면 시작하지 않는다.
+
+    Returns:
+        aiohttp.web.AppRunner 또는 None
+    """
+    if not port:
+        return None
+
+    from aiohttp import web
+
+    async def handle_metrics(request):
+        return web.Response(
+            text=metrics.render_prometheus(get_gauges()),
+            content_type="text/plain",
+            charset="utf-8"
+        )
+
+    app = web.Application()
+    app.router.add_get("/metrics", handle_metrics)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    await web.TCPSite(runner, "0.0.0.0", port).start()
+    logger.info("✅ Metrics endpoint listening on :%s/metrics", port)
+    return runner
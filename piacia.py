@@ -1,9 +1,12 @@
 import discord
 import aiohttp
 import asyncio
+import contextvars
 import re
 import html as html_lib
+import logging
 import time
+from collections import deque
 from urllib.parse import parse_qs, urlparse, urljoin
 from discord.ext import commands
 from review_form import (
@@ -14,6 +17,8 @@ from review_form import (
     MUSIC_TRACK_FORM,
     GAME_FORM,
     format_season,
+    parse_season_number,
+    split_title_season,
 )
 
 # 카테고리별 이모지 및 이름 매핑
@@ -60,15 +65,24 @@ MUSIC_LINK_DOMAINS = {
 GAME_LINK_DOMAINS = {
     "store.steampowered.com",
 }
-from database import Database
+from database import AsyncDatabase, Database
+from metadata_cache import cached, metadata_cache
+from image_cache import image_cache
+from image_pipeline import image_filename, pipeline_variant, prepare_upload_image
+from monitoring import format_duration, metrics, start_metrics_server
+from tracing import format_seconds, format_trace_waterfall, http_trace_config, span, trace_store, traced
 from api_searcher import ContentSearcher, GrokSearcher
+from legacy_parser import LEGACY_PARSE_MIN_CONFIDENCE, parse_legacy_review_rules
 from assistant_service import AssistantService
 from review_interaction import ReviewReactionView
 import io
 import os
 from dotenv import load_dotenv
+from logging_config import setup_logging
 
 load_dotenv()
+setup_logging()
+logger = logging.getLogger("bot")
 
 Token = os.getenv("Token")
 SPOTIFY_CLIENT_ID = os.getenv("SPOTIFY_CLIENT_ID")
@@ -81,6 +95,54 @@ SPOTIFY_TOKEN_EXPIRES_AT = 0
 IGDB_ACCESS_TOKEN = None
 IGDB_TOKEN_EXPIRES_AT = 0
 
+HTTP_POOL_LIMIT = int(os.getenv("HTTP_POOL_LIMIT", "100"))
+HTTP_POOL_LIMIT_PER_HOST = int(os.getenv("HTTP_POOL_LIMIT_PER_HOST", "10"))
+HTTP_DNS_CACHE_TTL = int(os.getenv("HTTP_DNS_CACHE_TTL", "300"))
+HTTP_KEEPALIVE_TIMEOUT = float(os.getenv("HTTP_KEEPALIVE_TIMEOUT", "30"))
+LINK_LOOKUP_TIMEOUT = 2.8
+STEAM_APPDETAILS_SEMAPHORE = asyncio.Semaphore(int(os.getenv("STEAM_APPDETAILS_CONCURRENCY", "5")))
+IMAGE_DOWNLOAD_TIMEOUT = aiohttp.ClientTimeout(total=30)
+# 저장된 Discord 첨부파일 URL이 이 시간(초) 안에 만료되면 재사용하지 않고 다시 업로드
+DISCORD_IMAGE_URL_MIN_TTL = 3600
+DISCORD_IMAGE_CHECK_TIMEOUT = aiohttp.ClientTimeout(total=2)
+# 모달이 열려 있는 동안 실행하는 메타데이터/이미지 프리페치 제한
+PREFETCH_MAX_TASKS = 32
+PREFETCH_TIMEOUT = 20
+# 제목 자동완성: Discord 최대 선택지 수, 이보다 오래 걸리면 경고 로그 (초)
+TITLE_AUTOCOMPLETE_LIMIT = 25
+TITLE_AUTOCOMPLETE_WARN = 0.05
+# 레거시 리뷰 마이그레이션: 동시 LLM 호출 수, 한 번에 저장하는 메시지 수, 진행 메시지 수정 간격(초)
+MIGRATION_CONCURRENCY = int(os.getenv("MIGRATION_CONCURRENCY", "8"))
+MIGRATION_BATCH_SIZE = int(os.getenv("MIGRATION_BATCH_SIZE", "50"))
+MIGRATION_PROGRESS_INTERVAL = 3
+# 마이그레이션이 끝난 뒤 관리자에게 보여줄 실패 메시지 링크 수
+MIGRATION_FAILED_REPORT_LIMIT = 15
+# 한 번의 LLM 요청에 묶어 보낼 메시지 수와 총 글자 수
+MIGRATION_LLM_BATCH_SIZE = int(os.getenv("MIGRATION_LLM_BATCH_SIZE", "10"))
+MIGRATION_LLM_BATCH_CHARS = 6000
+# 동시에 파싱하는 배치 수: 배치 하나로는 LLM 요청이 MIGRATION_CONCURRENCY개까지 차지 않으므로
+# 동시 호출 수를 채울 만큼 + 다음 배치를 읽는 동안 하나 더
+MIGRATION_PARSE_AHEAD = -(-MIGRATION_CONCURRENCY * MIGRATION_LLM_BATCH_SIZE // MIGRATION_BATCH_SIZE) + 1
+IMAGE_DOWNLOAD_USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+
+
+def create_http_session():
+    """봇 전체가 공유하는 aiohttp 세션 생성.
+
+    DNS 결과와 TCP/TLS 연결을 재사용하고, 호스트별 동시 연결 수를 제한한다.
+    """
+    connector = aiohttp.TCPConnector(
+        limit=HTTP_POOL_LIMIT,
+        limit_per_host=HTTP_POOL_LIMIT_PER_HOST,
+        ttl_dns_cache=HTTP_DNS_CACHE_TTL,
+        keepalive_timeout=HTTP_KEEPALIVE_TIMEOUT,
+    )
+    return aiohttp.ClientSession(
+        connector=connector,
+        timeout=aiohttp.ClientTimeout(total=30),
+        trace_configs=[http_trace_config()],
+    )
+
 
 # CATEGORY_EMOJI 역매핑 (emoji -> category)
 EMOJI_CATEGORY = {emoji: cat for cat, emoji in CATEGORY_EMOJI.items()}
@@ -105,23 +167,6 @@ def parse_review_message(content):
     return None, None, None
 
 
-def parse_season_number(value):
-    """'2', '2기', '2시즌', '2부' 값을 season 정수로 파싱."""
-    if value is None:
-        return None
-    match = re.match(r'^\s*(\d+)\s*(시즌|기|부)?\s*$', str(value))
-    return int(match.group(1)) if match else None
-
-
-def split_title_season(title, default_season=None):
-    """제목 끝의 시즌 표기를 분리."""
-    title = (title or "").strip()
-    match = re.match(r'^(.+?)\s+(\d+)(시즌|기|부)$', title)
-    if match:
-        return match.group(1).strip(), int(match.group(2))
-    return title, default_season
-
-
 def parse_review_detail(content):
     """리뷰 메시지에서 director/author, year/platform 파싱"""
     lines = content.split('\n')
@@ -143,19 +188,19 @@ def parse_review_detail(content):
     return director, year
 
 
-def resolve_review_message(db, message):
+async def resolve_review_message(db, message):
     """컨텍스트 메뉴 대상 메시지에서 리뷰 식별 정보를 찾는다.
 
     새 리뷰 메시지는 DB에 message_id가 저장되므로 그것을 우선 사용하고,
     오래된 메시지나 DB row를 찾지 못한 경우에만 텍스트 포맷 파싱으로 fallback한다.
     """
-    review = db.get_review_by_message_id(message.id)
+    review = await db.get_review_by_message_id(message.id)
     if review:
         channel_id = review.get('channel_id')
         if channel_id is not None and int(channel_id) != message.channel.id:
-            print(
-                f"[WARN] resolve_review_message() channel mismatch: "
-                f"db={channel_id}, message={message.channel.id}"
+            logger.warning(
+                "resolve_review_message() channel mismatch: db=%s, message=%s",
+                channel_id, message.channel.id
             )
         return (
             review.get('movie_title'),
@@ -453,7 +498,7 @@ async def fetch_page_meta(session, source_url):
                 "musician": extract_meta_content(html, "music:musician_description"),
             }
     except Exception as e:
-        print(f"[WARN] fetch_page_meta() failed: {e}")
+        logger.warning("fetch_page_meta() failed: %s", e)
         return {}
 
 
@@ -467,7 +512,7 @@ async def resolve_redirect_url(session, source_url):
             final_url = str(response.url)
             return final_url if final_url and final_url != source_url else source_url
     except Exception as e:
-        print(f"[WARN] resolve_redirect_url() failed: {e}")
+        logger.warning("resolve_redirect_url() failed: %s", e)
         return source_url
 
 
@@ -489,7 +534,7 @@ async def get_spotify_access_token(session):
             headers={"Content-Type": "application/x-www-form-urlencoded"},
         ) as response:
             if response.status != 200:
-                print(f"[WARN] Spotify token API status={response.status}")
+                logger.warning("Spotify token API status=%s", response.status)
                 return None
 
             data = await response.json()
@@ -497,7 +542,7 @@ async def get_spotify_access_token(session):
             SPOTIFY_TOKEN_EXPIRES_AT = now + int(data.get("expires_in", 3600))
             return SPOTIFY_ACCESS_TOKEN
     except Exception as e:
-        print(f"[WARN] Spotify token API failed: {e}")
+        logger.warning("Spotify token API failed: %s", e)
         return None
 
 
@@ -517,9 +562,9 @@ async def fetch_spotify_oembed(session, source_url):
         ) as response:
             if response.status == 200:
                 return await response.json()
-            print(f"[WARN] Spotify oEmbed status={response.status}")
+            logger.warning("Spotify oEmbed status=%s", response.status)
     except Exception as e:
-        print(f"[WARN] Spotify oEmbed failed: {e}")
+        logger.warning("Spotify oEmbed failed: %s", e)
     return {}
 
 
@@ -538,11 +583,11 @@ async def fetch_spotify_music_by_api(session, spotify_type, spotify_id, source_u
             headers=spotify_api_headers(token),
         ) as response:
             if response.status != 200:
-                print(f"[WARN] Spotify {endpoint} API status={response.status}")
+                logger.warning("Spotify %s API status=%s", endpoint, response.status)
                 return None
             data = await response.json()
     except Exception as e:
-        print(f"[WARN] Spotify {endpoint} API failed: {e}")
+        logger.warning("Spotify %s API failed: %s", endpoint, e)
         return None
 
     album = data.get("album") or {}
@@ -582,11 +627,11 @@ async def fetch_youtube_music_by_api(session, source_url, fallback_category):
             },
         ) as response:
             if response.status != 200:
-                print(f"[WARN] YouTube videos API status={response.status}")
+                logger.warning("YouTube videos API status=%s", response.status)
                 return None
             data = await response.json()
     except Exception as e:
-        print(f"[WARN] YouTube videos API failed: {e}")
+        logger.warning("YouTube videos API failed: %s", e)
         return None
 
     items = data.get("items") or []
@@ -632,7 +677,7 @@ async def fetch_musicbrainz_enrichment(session, category, title, artist):
             {"query": query, "limit": 5}
         )
     except Exception as e:
-        print(f"[WARN] fetch_musicbrainz_enrichment() failed: {e}")
+        logger.warning("fetch_musicbrainz_enrichment() failed: %s", e)
         return None
 
     items = (data or {}).get(result_key) or []
@@ -661,7 +706,7 @@ async def enrich_music_info_from_musicbrainz(session, music_info, prefer_artist=
     try:
         enrichment = await fetch_musicbrainz_enrichment(session, category, title, artist)
     except Exception as e:
-        print(f"[WARN] enrich_music_info_from_musicbrainz() failed: {e}")
+        logger.warning("enrich_music_info_from_musicbrainz() failed: %s", e)
         return music_info
 
     if not enrichment:
@@ -797,9 +842,9 @@ async def fetch_youtube_music_by_url(session, source_url, fallback_category):
             if response.status == 200:
                 oembed_data = await response.json()
             else:
-                print(f"[WARN] YouTube oEmbed status={response.status}")
+                logger.warning("YouTube oEmbed status=%s", response.status)
     except Exception as e:
-        print(f"[WARN] YouTube oEmbed failed: {e}")
+        logger.warning("YouTube oEmbed failed: %s", e)
 
     title, artist = parse_youtube_title_artist(
         oembed_data.get("title"),
@@ -912,17 +957,18 @@ async def get_igdb_access_token(session):
             },
         ) as response:
             if response.status != 200:
-                print(f"[WARN] IGDB token API status={response.status}")
+                logger.warning("IGDB token API status=%s", response.status)
                 return None
             data = await response.json()
             IGDB_ACCESS_TOKEN = data.get("access_token")
             IGDB_TOKEN_EXPIRES_AT = now + int(data.get("expires_in", 3600))
             return IGDB_ACCESS_TOKEN
     except Exception as e:
-        print(f"[WARN] IGDB token API failed: {e}")
+        logger.warning("IGDB token API failed: %s", e)
         return None
 
 
+@cached('igdb')
 async def search_igdb_games(session, title, limit=5):
     token = await get_igdb_access_token(session)
     if not token or not title:
@@ -946,11 +992,11 @@ async def search_igdb_games(session, title, limit=5):
             data=body,
         ) as response:
             if response.status != 200:
-                print(f"[WARN] IGDB games API status={response.status}")
+                logger.warning("IGDB games API status=%s", response.status)
                 return []
             data = await response.json()
     except Exception as e:
-        print(f"[WARN] IGDB games API failed: {e}")
+        logger.warning("IGDB games API failed: %s", e)
         return []
 
     results = [igdb_game_result(item) for item in data if item.get("name")]
@@ -984,23 +1030,22 @@ async def enrich_game_info_from_igdb(session, game_info):
     return game_info
 
 
-async def fetch_steam_game_by_appid(session, steam_appid, source_url=None):
-    if not steam_appid:
-        return None
-
-    source_url = source_url or f"https://store.steampowered.com/app/{steam_appid}"
+@cached('steam')
+async def fetch_steam_appdetails(session, steam_appid):
+    """Steam appdetails 조회 (appid 단위 캐시). source_url은 호출부에서 채운다."""
     try:
-        async with session.get(
-            "https://store.steampowered.com/api/appdetails",
-            params={"appids": steam_appid, "cc": "kr", "l": "koreana"},
-            headers={"User-Agent": "PieDiscordReviewBot/1.0"},
-        ) as response:
-            if response.status != 200:
-                print(f"[WARN] Steam appdetails API status={response.status}")
-                return None
-            data = await response.json()
+        async with STEAM_APPDETAILS_SEMAPHORE:
+            async with session.get(
+                "https://store.steampowered.com/api/appdetails",
+                params={"appids": steam_appid, "cc": "kr", "l": "koreana"},
+                headers={"User-Agent": "PieDiscordReviewBot/1.0"},
+            ) as response:
+                if response.status != 200:
+                    logger.warning("Steam appdetails API status=%s", response.status)
+                    return None
+                data = await response.json()
     except Exception as e:
-        print(f"[WARN] Steam appdetails API failed: {e}")
+        logger.warning("Steam appdetails API failed: %s", e)
         return None
 
     app_data = (data or {}).get(str(steam_appid)) or {}
@@ -1010,16 +1055,25 @@ async def fetch_steam_game_by_appid(session, steam_appid, source_url=None):
     game = app_data.get("data") or {}
     developers = game.get("developers") or []
     release_date = game.get("release_date") or {}
-    game_info = {
+    return {
         "title": game.get("name"),
         "year": first_year_from_text(release_date.get("date")) or "N/A",
         "director": ", ".join(developers) if developers else "미상",
         "img_url": game.get("header_image"),
         "category": "game",
-        "source_url": source_url,
         "steam_appid": steam_appid,
         "provider": "steam_store",
     }
+
+
+async def fetch_steam_game_by_appid(session, steam_appid, source_url=None):
+    if not steam_appid:
+        return None
+
+    game_info = await fetch_steam_appdetails(session, steam_appid)
+    if not game_info:
+        return None
+    game_info["source_url"] = source_url or f"https://store.steampowered.com/app/{steam_appid}"
     return game_info
 
 
@@ -1039,23 +1093,34 @@ async def search_steam_games(session, title, limit=5):
             headers={"User-Agent": "PieDiscordReviewBot/1.0"},
         ) as response:
             if response.status != 200:
-                print(f"[WARN] Steam storesearch API status={response.status}")
+                logger.warning("Steam storesearch API status=%s", response.status)
                 return []
             data = await response.json()
     except Exception as e:
-        print(f"[WARN] Steam storesearch API failed: {e}")
+        logger.warning("Steam storesearch API failed: %s", e)
         return []
 
-    results = []
+    candidates = []
     seen = set()
     for item in (data or {}).get("items", []):
         steam_appid = item.get("id") or item.get("appid")
         if not steam_appid or steam_appid in seen:
             continue
         seen.add(steam_appid)
+        candidates.append(item)
+        if len(candidates) >= limit:
+            break
+
+    # appdetails는 후보별로 동시에 조회 (STEAM_APPDETAILS_SEMAPHORE로 동시 요청 수 제한)
+    details = await asyncio.gather(*(
+        fetch_steam_game_by_appid(session, item.get("id") or item.get("appid"))
+        for item in candidates
+    ))
 
-        game_info = await fetch_steam_game_by_appid(session, steam_appid)
+    results = []
+    for item, game_info in zip(candidates, details):
         if not game_info:
+            steam_appid = item.get("id") or item.get("appid")
             game_info = {
                 "title": item.get("name") or "N/A",
                 "year": "N/A",
@@ -1067,8 +1132,6 @@ async def search_steam_games(session, title, limit=5):
                 "provider": "steam_search",
             }
         results.append(game_info)
-        if len(results) >= limit:
-            break
 
     normalized_query = normalize_game_search_text(title)
     return sorted(
@@ -1116,14 +1179,13 @@ async def send_ephemeral_interaction(
                 await interaction.followup.send(content, view=view, ephemeral=True)
                 return True
             except discord.HTTPException as followup_error:
-                print(
-                    f"[ERROR] send_ephemeral_interaction() followup after 40060 failed "
-                    f"(code={getattr(followup_error, 'code', None)})",
-                    flush=True
+                logger.error(
+                    "send_ephemeral_interaction() followup after 40060 failed (code=%s)",
+                    getattr(followup_error, 'code', None)
                 )
                 return False
         if code == 10062:
-            print("[ERROR] send_ephemeral_interaction() failed - unknown interaction", flush=True)
+            logger.error("send_ephemeral_interaction() failed - unknown interaction")
             return False
         raise
 
@@ -1232,6 +1294,7 @@ def clean_webnovel_title(title, platform):
     return title
 
 
+@cached('webnovel_page')
 async def fetch_webnovel_by_url(session, url):
     """웹소설 링크에서 플랫폼과 공개 메타데이터를 best-effort로 가져온다."""
     source_url = normalize_source_url(url)
@@ -1258,15 +1321,14 @@ async def fetch_webnovel_by_url(session, url):
                 title = clean_webnovel_title(extract_page_title(html), platform)
                 img_url = extract_page_image(html, source_url)
                 author = extract_meta_content(html, "author", "article:author") or author
-                print(
-                    f"[DEBUG] fetch_webnovel_by_url() parsed - "
-                    f"title={title}, platform={platform}, author={author}, img_url={img_url}",
-                    flush=True
+                logger.debug(
+                    "fetch_webnovel_by_url() parsed - title=%s, platform=%s, author=%s, img_url=%s",
+                    title, platform, author, img_url
                 )
             else:
-                print(f"[WARN] fetch_webnovel_by_url() status={response.status}, url={source_url}")
+                logger.warning("fetch_webnovel_by_url() status=%s, url=%s", response.status, source_url)
     except Exception as e:
-        print(f"[WARN] fetch_webnovel_by_url() failed: {e}")
+        logger.warning("fetch_webnovel_by_url() failed: %s", e)
 
     return title, platform, author, img_url, source_url
 
@@ -1338,7 +1400,7 @@ def join_embed_lines(lines, max_chars=1000):
     return "\n".join(selected) or "-"
 
 
-def resolve_review_season(db, user_id, title, category, season):
+async def resolve_review_season(db, user_id, title, category, season):
     """수정/삭제 명령에서 사용할 season 값을 결정."""
     if season is not None:
         return None if season == 0 else season, None
@@ -1346,7 +1408,7 @@ def resolve_review_season(db, user_id, title, category, season):
     if not category:
         return None, None
 
-    reviews_for_title = db.get_user_reviews_for_title(user_id, title, category)
+    reviews_for_title = await db.get_user_reviews_for_title(user_id, title, category)
     distinct_seasons = []
     seen = set()
     for review in reviews_for_title:
@@ -1410,6 +1472,194 @@ def return_score_emoji(score):
     return score_emoji
 
 
+async def download_image(session, img_url, referer=None, log_prefix="download_image()"):
+    """공유 세션으로 이미지 다운로드 (최대 3회 시도). 실패 시 None."""
+    with span("image.download", host=urlparse(img_url).hostname):
+        return await _download_image(session, img_url, referer, log_prefix)
+
+
+async def load_review_image(session, img_url, content_id=None, referer=None, log_prefix="load_review_image()"):
+    """이미지 캐시를 먼저 확인하고, 없을 때만 다운로드 → 업로드용으로 축소/재인코딩해 캐시에 저장."""
+    async def fetch():
+        img_data = await download_image(session, img_url, referer=referer, log_prefix=log_prefix)
+        if not img_data:
+            return None
+        with span("image.prepare", original_bytes=len(img_data)):
+            return await prepare_upload_image(img_data)
+
+    return await image_cache.get_or_fetch(
+        img_url,
+        fetch,
+        content_id=content_id,
+        variant=pipeline_variant()
+    )
+
+
+_prefetch_tasks = set()
+
+
+def start_prefetch(session, img_url=None, content_id=None, source_url=None, category=None):
+    """제목/링크를 아는 시점에 메타데이터·이미지 캐시를 미리 채운다 (결과는 버림).
+
+    on_submit은 같은 캐시를 조회하므로, 사용자가 입력창을 채우는 동안 끝나면 바로 저장되고
+    아직 진행 중이면 같은 요청을 기다린다. 실패해도 on_submit이 평소대로 다시 조회한다.
+    """
+    if not (img_url or source_url) or session is None:
+        return
+    if len(_prefetch_tasks) >= PREFETCH_MAX_TASKS:
+        logger.debug("start_prefetch() 동시 프리페치 한도 초과 - 건너뜀")
+        return
+
+    # 프리페치는 현재 interaction trace와 분리해서 실행
+    task = asyncio.create_task(
+        _prefetch_review_assets(session, img_url, content_id, source_url, category),
+        context=contextvars.Context()
+    )
+    _prefetch_tasks.add(task)
+    task.add_done_callback(_prefetch_tasks.discard)
+
+
+async def _prefetch_review_assets(session, img_url, content_id, source_url, category):
+    try:
+        async with asyncio.timeout(PREFETCH_TIMEOUT):
+            if source_url and not img_url:
+                if category == 'webnovel' or detect_webnovel_platform_from_url(source_url):
+                    info = await fetch_webnovel_by_url(session, source_url)
+                    img_url = info[3] if info else None
+                elif category == 'manga':
+                    info = await ContentSearcher.fetch_manga_by_url(session, source_url)
+                    img_url = info[3] if info else None
+
+            if img_url:
+                await load_review_image(
+                    session,
+                    img_url,
+                    content_id=content_id,
+                    referer=source_url,
+                    log_prefix="prefetch"
+                )
+        logger.debug("_prefetch_review_assets() 완료 - category=%s, img_url=%s", category, img_url)
+    except Exception as e:
+        logger.debug("_prefetch_review_assets() 실패 (무시): %s", e)
+
+
+def discord_cdn_expires_at(url):
+    """Discord CDN 첨부파일 URL의 만료 시각 (ex 파라미터, 16진수 unix time). 없으면 None."""
+    value = parse_qs(urlparse(url).query).get("ex", [None])[0]
+    try:
+        return int(value, 16) if value else None
+    except ValueError:
+        return None
+
+
+async def get_reusable_discord_image(session, db, content_id, img_url):
+    """같은 작품 포스터가 이미 Discord에 올라가 있고 아직 유효하면 그 첨부파일 URL 반환."""
+    stored = await db.get_content_discord_image(content_id)
+    if not stored or stored.get('discord_image_source') != img_url:
+        return None
+
+    cdn_url = stored['discord_image_url']
+    expires_at = discord_cdn_expires_at(cdn_url)
+    if expires_at is None or expires_at - time.time() < DISCORD_IMAGE_URL_MIN_TTL:
+        logger.debug("get_reusable_discord_image() 만료 임박 - content_id: %s", content_id)
+        return None
+
+    # 원본 메시지가 삭제되면 첨부파일도 사라지므로 본문 없이 존재 여부만 확인
+    try:
+        async with session.head(cdn_url, timeout=DISCORD_IMAGE_CHECK_TIMEOUT) as response:
+            if response.status != 200:
+                logger.debug(
+                    "get_reusable_discord_image() 첨부파일 없음 - content_id: %s, status: %s",
+                    content_id, response.status
+                )
+                return None
+    except Exception as e:
+        logger.warning("get_reusable_discord_image() 확인 실패: %s", e)
+        return None
+    return cdn_url
+
+
+async def send_review_message(
+    interaction: discord.Interaction,
+    db,
+    content: str,
+    view,
+    img_url: str = None,
+    content_id: int = None,
+    referer: str = None,
+    log_prefix: str = "send_review_message()"
+):
+    """리뷰 메시지 전송.
+
+    같은 작품 포스터가 Discord CDN에 있으면 embed로 참조하고, 없거나 만료됐으면
+    이미지를 한 번 업로드한 뒤 그 첨부파일 URL을 작품에 저장한다.
+    """
+    session = interaction.client.http_session
+
+    if img_url and content_id is not None:
+        cdn_url = await get_reusable_discord_image(session, db, content_id, img_url)
+        if cdn_url:
+            embed = discord.Embed()
+            embed.set_image(url=cdn_url)
+            try:
+                with span("discord.followup_send", image="cdn"):
+                    sent_message = await interaction.followup.send(content, embed=embed, view=view, wait=True)
+                logger.debug("%s Discord CDN 이미지 재사용 - content_id: %s", log_prefix, content_id)
+                return sent_message
+            except discord.HTTPException as e:
+                logger.warning("%s CDN 이미지 embed 전송 실패, 업로드로 재시도: %s", log_prefix, e)
+
+    img_data = None
+    if img_url:
+        img_data = await load_review_image(
+            session,
+            img_url,
+            content_id=content_id,
+            referer=referer,
+            log_prefix=log_prefix
+        )
+
+    if not img_data:
+        logger.debug("%s 이미지 없이 텍스트만 전송", log_prefix)
+        with span("discord.followup_send"):
+            return await interaction.followup.send(content, view=view, wait=True)
+
+    file = discord.File(io.BytesIO(img_data), filename=image_filename(img_data))
+    with span("discord.followup_send", image_bytes=len(img_data)):
+        sent_message = await interaction.followup.send(content, file=file, view=view, wait=True)
+    logger.debug("%s 이미지 포함 메시지 전송 완료", log_prefix)
+
+    if content_id is not None and sent_message and sent_message.attachments:
+        await db.save_content_discord_image(
+            content_id, sent_message.attachments[0].url, img_url, message_id=sent_message.id
+        )
+    return sent_message
+
+
+async def _download_image(session, img_url, referer, log_prefix):
+    headers = {
+        'User-Agent': IMAGE_DOWNLOAD_USER_AGENT,
+        'Referer': referer or img_url
+    }
+
+    for attempt in range(3):
+        try:
+            async with session.get(img_url, headers=headers, timeout=IMAGE_DOWNLOAD_TIMEOUT) as img_response:
+                logger.debug("%s 이미지 응답 상태: %s (시도 %s)", log_prefix, img_response.status, attempt + 1)
+                if img_response.status == 200:
+                    img_data = await img_response.read()
+                    logger.debug("%s 이미지 다운로드 성공 (크기: %s bytes)", log_prefix, len(img_data))
+                    return img_data
+                logger.debug("%s 이미지 다운로드 실패 (상태: %s)", log_prefix, img_response.status)
+        except Exception as e:
+            logger.error("%s 이미지 다운로드 중 오류 (시도 %s): %s", log_prefix, attempt + 1, e)
+
+        if attempt < 2:
+            await asyncio.sleep(1)
+
+    return None
+
+
 async def _save_and_send_review(
     interaction: discord.Interaction,
     db,
@@ -1425,7 +1675,7 @@ async def _save_and_send_review(
     latest_units: int = None
 ):
     """리뷰 저장 및 메시지 전송 (공통 로직)"""
-    print(f"[DEBUG] _save_and_send_review() 시작 - 작성자: {author_name}")
+    logger.debug("_save_and_send_review() 시작 - 작성자: %s", author_name)
 
     title = movie_info['title']
     year = movie_info['year']
@@ -1436,11 +1686,16 @@ async def _save_and_send_review(
     latest_units = movie_info.get('latest_units', latest_units)
     source_url = movie_info.get('source_url')
 
-    # 1단계: contents 테이블에 작품 저장/조회
-    print(f"[DEBUG] _save_and_send_review() contents 테이블 처리 중...")
-    content_id = db.get_or_create_content(
+    # 작품 UPSERT + 중복/회고 검사 + 리뷰 저장을 한 번에 처리
+    logger.debug("_save_and_send_review() DB 저장 중...")
+    result = await db.submit_review(
+        user_id=author_id,
+        username=author_name,
         title=title,
         category=db_category,
+        score=score_float,
+        one_line_review=line_comment,
+        additional_comment=comment,
         year_or_platform=year,
         creator=director,
         img_url=img_url,
@@ -1450,20 +1705,20 @@ async def _save_and_send_review(
         musicbrainz_id=movie_info.get('musicbrainz_id'),
         musicbrainz_type=movie_info.get('musicbrainz_type'),
         igdb_id=movie_info.get('igdb_id'),
-        steam_appid=movie_info.get('steam_appid')
+        steam_appid=movie_info.get('steam_appid'),
+        unit_to=unit_to,
+        season=season,
+        latest_units=latest_units,
+        source_url=source_url
     )
 
-    if not content_id:
-        print(f"[ERROR] _save_and_send_review() content_id 생성 실패")
+    if not result:
+        logger.error("_save_and_send_review() 리뷰 저장 실패")
         await interaction.followup.send("❌ 작품 정보 저장에 실패했습니다.", ephemeral=True)
         return
 
-    print(f"[DEBUG] _save_and_send_review() content_id: {content_id}")
-
-    # 2단계: 중복 확인 (v2 메서드 사용)
-    print(f"[DEBUG] _save_and_send_review() 중복 확인 중...")
-    if db.has_review_v2(author_id, content_id, unit_to, season=season):
-        print(f"[DEBUG] _save_and_send_review() 중복 발견")
+    if result['status'] in ('duplicate', 'retro'):
+        logger.debug("_save_and_send_review() 중복 발견 - status: %s", result['status'])
         season_text = format_season(db_category, season)
         await interaction.followup.send(
             f"❌ 이미 '{title}{season_text}'에 대한 리뷰를 작성하셨습니다.\n"
@@ -1472,21 +1727,8 @@ async def _save_and_send_review(
         )
         return
 
-    # 3단계: DB 저장 (v2 메서드 사용)
-    print(f"[DEBUG] _save_and_send_review() DB 저장 중...")
-    review_id = db.save_review_v2(
-        user_id=author_id,
-        username=author_name,
-        content_id=content_id,
-        score=score_float,
-        one_line_review=line_comment,
-        additional_comment=comment,
-        unit_to=unit_to,
-        season=season,
-        latest_units=latest_units,
-        source_url=source_url
-    )
-    print(f"[DEBUG] _save_and_send_review() DB 저장 완료 - review_id: {review_id}")
+    review_id = result['review_id']
+    logger.debug("_save_and_send_review() DB 저장 완료 - review_id: %s", review_id)
 
     # 카테고리별 출력 형식
     emoji = CATEGORY_EMOJI.get(db_category, "🎬")
@@ -1566,50 +1808,25 @@ async def _save_and_send_review(
     if comment:
         filled_form += f"\n\n📝추가 코멘트 : {comment}"
 
-    # 이미지 다운로드 및 전송
-    print(f"[DEBUG] _save_and_send_review() 이미지 처리 - img_url: {img_url}")
-    img_data = None
-
-    if img_url:
-        print(f"[DEBUG] _save_and_send_review() 이미지 다운로드 시작 - URL: {img_url}")
-        timeout = aiohttp.ClientTimeout(total=30)
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-            'Referer': source_url or img_url
-        }
-
-        for attempt in range(3):
-            try:
-                async with aiohttp.ClientSession(timeout=timeout, headers=headers) as session:
-                    async with session.get(img_url) as img_response:
-                        print(f"[DEBUG] _save_and_send_review() 이미지 응답 상태: {img_response.status} (시도 {attempt + 1})")
-                        if img_response.status == 200:
-                            img_data = await img_response.read()
-                            print(f"[DEBUG] _save_and_send_review() 이미지 다운로드 성공 (크기: {len(img_data)} bytes)")
-                            break
-                        else:
-                            print(f"[DEBUG] _save_and_send_review() 이미지 다운로드 실패 (상태: {img_response.status})")
-            except Exception as e:
-                print(f"[ERROR] _save_and_send_review() 이미지 다운로드 중 오류 (시도 {attempt + 1}): {e}")
-
-            if attempt < 2:
-                await asyncio.sleep(1)
-
-    view = ReviewReactionView()
-    if img_data:
-        file = discord.File(io.BytesIO(img_data), filename="image.jpg")
-        sent_message = await interaction.followup.send(filled_form, file=file, view=view, wait=True)
-        print(f"[DEBUG] _save_and_send_review() 이미지 포함 메시지 전송 완료")
-    else:
-        print(f"[DEBUG] _save_and_send_review() 이미지 없이 텍스트만 전송")
-        sent_message = await interaction.followup.send(filled_form, view=view, wait=True)
+    # 이미지 처리 및 전송
+    logger.debug("_save_and_send_review() 이미지 처리 - img_url: %s", img_url)
+    sent_message = await send_review_message(
+        interaction,
+        db,
+        filled_form,
+        ReviewReactionView(),
+        img_url=img_url,
+        content_id=result.get('content_id'),
+        referer=source_url,
+        log_prefix="_save_and_send_review()"
+    )
 
     # message_id 저장
     if review_id and sent_message:
-        db.update_message_id(review_id, sent_message.id, interaction.channel_id)
-        print(f"[DEBUG] _save_and_send_review() message_id 저장 완료 - {sent_message.id}")
+        await db.update_message_id(review_id, sent_message.id, interaction.channel_id)
+        logger.debug("_save_and_send_review() message_id 저장 완료 - %s", sent_message.id)
 
-    print(f"[DEBUG] _save_and_send_review() 완료")
+    logger.debug("_save_and_send_review() 완료")
 
 
 # ==================== 통합 Modal ====================
@@ -1647,26 +1864,27 @@ class MovieSelectMenu(discord.ui.Select):
         self.movies = movies
         self.form = form  # ReviewForm 인스턴스 직접 참조
 
+    @traced("MovieSelectMenu.callback")
     async def callback(self, interaction: discord.Interaction):
-        print(f"[DEBUG] MovieSelectMenu.callback() 시작 - 작성자: {self.form.author_name}")
+        logger.debug("MovieSelectMenu.callback() 시작 - 작성자: %s", self.form.author_name)
 
         selected_idx = int(self.values[0])
         movie = self.movies[selected_idx]
 
-        print(f"[DEBUG] MovieSelectMenu.callback() 선택됨 - title: {movie['title']}, idx: {selected_idx}")
+        logger.debug("MovieSelectMenu.callback() 선택됨 - title: %s, idx: %s", movie['title'], selected_idx)
 
-        await interaction.response.defer()
+        with span("discord.defer"):
+            await interaction.response.defer()
 
+        session = interaction.client.http_session
         if movie.get('category') in MUSIC_CATEGORIES:
-            async with aiohttp.ClientSession() as session:
-                movie = await ContentSearcher.hydrate_music_result(session, movie)
+            movie = await ContentSearcher.hydrate_music_result(session, movie)
         # 감독 정보 지연 로딩
         elif not movie.get('director'):
-            print(f"[DEBUG] MovieSelectMenu.callback() 감독 정보 로딩 중...")
-            async with aiohttp.ClientSession() as session:
-                movie['director'] = await ContentSearcher._fetch_director_info(
-                    session, movie['tmdb_id'], movie['media_type']
-                )
+            logger.debug("MovieSelectMenu.callback() 감독 정보 로딩 중...")
+            movie['director'] = await ContentSearcher._fetch_director_info(
+                session, movie['tmdb_id'], movie['media_type']
+            )
 
         movie['season'] = None if movie['category'] in ('movie', 'music_track', 'game') else self.form.season
         movie['latest_units'] = self.form.latest_units
@@ -1687,7 +1905,7 @@ class MovieSelectMenu(discord.ui.Select):
             latest_units=self.form.latest_units
         )
 
-        print(f"[DEBUG] MovieSelectMenu.callback() 완료")
+        logger.debug("MovieSelectMenu.callback() 완료")
 
 
 class MovieSelectView(discord.ui.View):
@@ -1700,7 +1918,7 @@ class MovieSelectView(discord.ui.View):
         self.add_item(select_menu)
 
     async def on_timeout(self):
-        print(f"[DEBUG] MovieSelectView.on_timeout() - 60초 타임아웃")
+        logger.debug("MovieSelectView.on_timeout() - 60초 타임아웃")
         for item in self.children:
             item.disabled = True
 
@@ -1708,6 +1926,15 @@ class MovieSelectView(discord.ui.View):
 OTT_TYPE_NAME = {'flatrate': '🎬 구독 스트리밍', 'rent': '🏷️ 대여', 'buy': '💰 구매'}
 
 
+async def get_watch_providers(session, movie):
+    """검색 단계에서 채워진 OTT 정보가 있으면 재사용, 없으면 조회."""
+    if 'watch_providers' in movie:
+        return movie['watch_providers']
+    return await ContentSearcher.fetch_watch_providers(
+        session, movie['tmdb_id'], movie['media_type']
+    )
+
+
 def _build_ott_embed(movie, providers):
     emoji = CATEGORY_EMOJI.get(movie['category'], '🎬')
     cat_name = CATEGORY_NAME.get(movie['category'], '영화')
@@ -1751,16 +1978,15 @@ class OTTSelectMenu(discord.ui.Select):
 
         self.movies = movies
 
+    @traced("OTTSelectMenu.callback")
     async def callback(self, interaction: discord.Interaction):
         selected_idx = int(self.values[0])
         movie = self.movies[selected_idx]
 
-        await interaction.response.defer(ephemeral=True)
+        with span("discord.defer"):
+            await interaction.response.defer(ephemeral=True)
 
-        async with aiohttp.ClientSession() as session:
-            providers = await ContentSearcher.fetch_watch_providers(
-                session, movie['tmdb_id'], movie['media_type']
-            )
+        providers = await get_watch_providers(interaction.client.http_session, movie)
 
         embed = _build_ott_embed(movie, providers)
         await interaction.followup.send(embed=embed, ephemeral=True)
@@ -1908,8 +2134,9 @@ class ReviewForm(discord.ui.Modal, title="한줄평 작성"):
                 required=False
             ))
 
+    @traced("ReviewForm.on_submit")
     async def on_submit(self, interaction: discord.Interaction):
-        print(f"[DEBUG] ReviewForm.on_submit() 시작 - 카테고리: {self.category}, 작성자: {self.author_name}")
+        logger.debug("ReviewForm.on_submit() 시작 - 카테고리: %s, 작성자: %s", self.category, self.author_name)
 
         is_manual_webnovel = self.category == 'webnovel'
         is_music = self.category in MUSIC_CATEGORIES
@@ -1925,9 +2152,9 @@ class ReviewForm(discord.ui.Modal, title="한줄평 작성"):
                 year = self.prefetched_info[1] or "N/A"
                 director = self.music_artist_query or self.prefetched_info[2] or "미상"
                 img_url = self.prefetched_info[3] if len(self.prefetched_info) > 3 else None
-            print(
-                f"[DEBUG] ReviewForm.on_submit() 음악 입력 - "
-                f"title: {title}, artist: {self.music_artist_query}, score: {score}"
+            logger.debug(
+                "ReviewForm.on_submit() 음악 입력 - title: %s, artist: %s, score: %s",
+                title, self.music_artist_query, score
             )
         elif is_manual_webnovel:
             title = self.children[0].value.strip()
@@ -1941,20 +2168,20 @@ class ReviewForm(discord.ui.Modal, title="한줄평 작성"):
             score = self.children[3].value
             self.line_comment = self.children[4].value
             self.comment = None
-            print(f"[DEBUG] ReviewForm.on_submit() 웹소설 수동 입력 - title: {title}, score: {score}")
+            logger.debug("ReviewForm.on_submit() 웹소설 수동 입력 - title: %s, score: %s", title, score)
         elif self.prefetched_info:
             _, year, director, img_url = self.prefetched_info  # 자동 추출 제목 무시
             title = self.children[0].value.strip()
             score = self.children[1].value  # 별점
             self.line_comment = self.children[2].value
             self.comment = self.children[3].value
-            print(f"[DEBUG] ReviewForm.on_submit() prefetched_info 사용 - title: {title}, score: {score}")
+            logger.debug("ReviewForm.on_submit() prefetched_info 사용 - title: %s, score: %s", title, score)
         else:
             title = self.children[0].value.strip()
             score = self.children[1].value
             self.line_comment = self.children[2].value
             self.comment = self.children[3].value
-            print(f"[DEBUG] ReviewForm.on_submit() 입력값 - title: {title}, score: {score}")
+            logger.debug("ReviewForm.on_submit() 입력값 - title: %s, score: %s", title, score)
 
         try:
             self.score = float(score)
@@ -2005,11 +2232,12 @@ class ReviewForm(discord.ui.Modal, title="한줄평 작성"):
 
         self.unit_to = unit_to
 
-        await interaction.response.defer()
+        with span("discord.defer"):
+            await interaction.response.defer()
 
         # prefetched_info가 있으면 검색 없이 바로 저장
         if self.prefetched_info and not is_manual_webnovel:
-            print(f"[DEBUG] ReviewForm.on_submit() prefetched_info로 바로 저장")
+            logger.debug("ReviewForm.on_submit() prefetched_info로 바로 저장")
             prefetched_db_category = self.prefetched_category or ('movie' if self.category == 'tmdb' else self.category)
             movie_info = {
                 'title': title,
@@ -2056,12 +2284,12 @@ class ReviewForm(discord.ui.Modal, title="한줄평 작성"):
             return
 
         if is_manual_webnovel:
-            print(f"[DEBUG] ReviewForm.on_submit() 웹소설 수동 정보로 바로 저장")
+            logger.debug("ReviewForm.on_submit() 웹소설 수동 정보로 바로 저장")
             img_url = self.prefetched_info[3] if self.prefetched_info else None
             fetched_title = None
             if self.source_url:
-                async with aiohttp.ClientSession() as session:
-                    fetched_info = await fetch_webnovel_by_url(session, self.source_url)
+                session = interaction.client.http_session
+                fetched_info = await fetch_webnovel_by_url(session, self.source_url)
                 if fetched_info:
                     fetched_title, fetched_platform, fetched_author, fetched_img_url, _ = fetched_info
                     if year == "웹소설" and fetched_platform:
@@ -2107,211 +2335,214 @@ class ReviewForm(discord.ui.Modal, title="한줄평 작성"):
 
         original_title = title
 
-        async with aiohttp.ClientSession() as session:
-            # 카테고리별 검색
-            print(f"[DEBUG] ReviewForm.on_submit() 검색 시작 - 카테고리: {self.category}")
-            if self.category == 'tmdb':
-                # TMDB: 다중 결과 검색
-                movies = await ContentSearcher.search_tmdb_multiple(session, title)
-
-                # 결과 없음
-                if not movies:
-                    print(f"[DEBUG] ReviewForm.on_submit() TMDB 검색 실패 - 결과 없음")
-                    await interaction.followup.send(f"❌ '{original_title}'를 찾을 수 없습니다. 정확한 제목으로 다시 시도해주세요.", ephemeral=True)
-                    return
+        session = interaction.client.http_session
+        # 카테고리별 검색
+        logger.debug("ReviewForm.on_submit() 검색 시작 - 카테고리: %s", self.category)
+        if self.category == 'tmdb':
+            # TMDB: 다중 결과 검색
+            movies = await ContentSearcher.search_tmdb_multiple(session, title)
 
-                # 단일 결과 → 자동 선택
-                if len(movies) == 1:
-                    print(f"[DEBUG] ReviewForm.on_submit() TMDB 단일 결과 - 자동 선택")
-                    movie = movies[0]
-
-                    # 감독 정보 로딩
-                    if not movie.get('director'):
-                        movie['director'] = await ContentSearcher._fetch_director_info(
-                            session, movie['tmdb_id'], movie['media_type']
-                        )
-
-                    movie['season'] = None if movie['category'] == 'movie' else self.season
-                    movie['latest_units'] = self.latest_units
-
-                    # 기존 로직 계속
-                    await _save_and_send_review(
-                        interaction,
-                        self.db,
-                        movie,
-                        self.category,
-                        self.score,
-                        self.line_comment,
-                        self.comment,
-                        self.author_id,
-                        self.author_name,
-                        self.display_name,
-                        unit_to=unit_to,
-                        latest_units=self.latest_units
-                    )
-                    return
+            # 결과 없음
+            if not movies:
+                logger.debug("ReviewForm.on_submit() TMDB 검색 실패 - 결과 없음")
+                await interaction.followup.send(f"❌ '{original_title}'를 찾을 수 없습니다. 정확한 제목으로 다시 시도해주세요.", ephemeral=True)
+                return
 
-                # 다중 결과 → Select Menu 표시
-                print(f"[DEBUG] ReviewForm.on_submit() TMDB 다중 결과 - Select Menu 표시 ({len(movies)}개)")
+            # 단일 결과 → 자동 선택
+            if len(movies) == 1:
+                logger.debug("ReviewForm.on_submit() TMDB 단일 결과 - 자동 선택")
+                movie = movies[0]
 
-                view = MovieSelectView(movies, self)
+                # 감독 정보 로딩
+                if not movie.get('director'):
+                    movie['director'] = await ContentSearcher._fetch_director_info(
+                        session, movie['tmdb_id'], movie['media_type']
+                    )
 
-                await interaction.followup.send(
-                    f"🔍 '{original_title}' 검색 결과 {len(movies)}개입니다. 작품을 선택하세요:",
-                    view=view,
-                    ephemeral=True
+                movie['season'] = None if movie['category'] == 'movie' else self.season
+                movie['latest_units'] = self.latest_units
+
+                # 기존 로직 계속
+                await _save_and_send_review(
+                    interaction,
+                    self.db,
+                    movie,
+                    self.category,
+                    self.score,
+                    self.line_comment,
+                    self.comment,
+                    self.author_id,
+                    self.author_name,
+                    self.display_name,
+                    unit_to=unit_to,
+                    latest_units=self.latest_units
                 )
                 return
 
-            elif self.category in MUSIC_CATEGORIES:
-                music_results = await ContentSearcher.search_music_track_multiple(
-                    session,
-                    title,
-                    artist=self.music_artist_query
-                )
+            # 다중 결과 → Select Menu 표시
+            logger.debug("ReviewForm.on_submit() TMDB 다중 결과 - Select Menu 표시 (%s개)", len(movies))
 
-                if not music_results:
-                    print(f"[DEBUG] ReviewForm.on_submit() 음악 검색 실패 - 결과 없음")
-                    artist_hint = " 아티스트명을 같이 입력해서" if not self.music_artist_query else ""
-                    await interaction.followup.send(
-                        f"❌ '{original_title}'를 찾을 수 없습니다.{artist_hint} 다시 시도해주세요.",
-                        ephemeral=True
-                    )
-                    return
+            view = MovieSelectView(movies, self)
 
-                if len(music_results) == 1:
-                    print(f"[DEBUG] ReviewForm.on_submit() 음악 단일 결과 - 자동 선택")
-                    music = await ContentSearcher.hydrate_music_result(session, music_results[0])
-                    music['season'] = None
-                    music['latest_units'] = self.latest_units
-
-                    await _save_and_send_review(
-                        interaction,
-                        self.db,
-                        music,
-                        self.category,
-                        self.score,
-                        self.line_comment,
-                        self.comment,
-                        self.author_id,
-                        self.author_name,
-                        self.display_name,
-                        unit_to=unit_to,
-                        latest_units=self.latest_units
-                    )
-                    return
+            await interaction.followup.send(
+                f"🔍 '{original_title}' 검색 결과 {len(movies)}개입니다. 작품을 선택하세요:",
+                view=view,
+                ephemeral=True
+            )
+            return
+
+        elif self.category in MUSIC_CATEGORIES:
+            music_results = await ContentSearcher.search_music_track_multiple(
+                session,
+                title,
+                artist=self.music_artist_query
+            )
 
-                print(f"[DEBUG] ReviewForm.on_submit() 음악 다중 결과 - Select Menu 표시 ({len(music_results)}개)")
-                view = MovieSelectView(music_results, self)
+            if not music_results:
+                logger.debug("ReviewForm.on_submit() 음악 검색 실패 - 결과 없음")
+                artist_hint = " 아티스트명을 같이 입력해서" if not self.music_artist_query else ""
                 await interaction.followup.send(
-                    f"🔍 '{original_title}' 검색 결과 {len(music_results)}개입니다. 음악을 선택하세요:",
-                    view=view,
+                    f"❌ '{original_title}'를 찾을 수 없습니다.{artist_hint} 다시 시도해주세요.",
                     ephemeral=True
                 )
                 return
 
-            elif self.category == 'game':
-                game_results = await search_game_candidates(session, title)
+            if len(music_results) == 1:
+                logger.debug("ReviewForm.on_submit() 음악 단일 결과 - 자동 선택")
+                music = await ContentSearcher.hydrate_music_result(session, music_results[0])
+                music['season'] = None
+                music['latest_units'] = self.latest_units
 
-                if not game_results:
-                    print(f"[DEBUG] ReviewForm.on_submit() 게임 검색 실패 - 결과 없음")
-                    await interaction.followup.send(
-                        f"❌ '{original_title}'를 찾을 수 없습니다. 영문 제목이나 Steam 링크로 다시 시도해주세요.",
-                        ephemeral=True
-                    )
-                    return
+                await _save_and_send_review(
+                    interaction,
+                    self.db,
+                    music,
+                    self.category,
+                    self.score,
+                    self.line_comment,
+                    self.comment,
+                    self.author_id,
+                    self.author_name,
+                    self.display_name,
+                    unit_to=unit_to,
+                    latest_units=self.latest_units
+                )
+                return
 
-                if len(game_results) == 1:
-                    print(f"[DEBUG] ReviewForm.on_submit() 게임 단일 결과 - 자동 선택")
-                    game = game_results[0]
-                    game['season'] = None
-                    game['latest_units'] = self.latest_units
-
-                    await _save_and_send_review(
-                        interaction,
-                        self.db,
-                        game,
-                        self.category,
-                        self.score,
-                        self.line_comment,
-                        self.comment,
-                        self.author_id,
-                        self.author_name,
-                        self.display_name,
-                        unit_to=unit_to,
-                        latest_units=self.latest_units
-                    )
-                    return
+            logger.debug("ReviewForm.on_submit() 음악 다중 결과 - Select Menu 표시 (%s개)", len(music_results))
+            view = MovieSelectView(music_results, self)
+            await interaction.followup.send(
+                f"🔍 '{original_title}' 검색 결과 {len(music_results)}개입니다. 음악을 선택하세요:",
+                view=view,
+                ephemeral=True
+            )
+            return
 
-                print(f"[DEBUG] ReviewForm.on_submit() 게임 다중 결과 - Select Menu 표시 ({len(game_results)}개)")
-                view = MovieSelectView(game_results, self)
+        elif self.category == 'game':
+            game_results = await search_game_candidates(session, title)
+
+            if not game_results:
+                logger.debug("ReviewForm.on_submit() 게임 검색 실패 - 결과 없음")
                 await interaction.followup.send(
-                    f"🔍 '{original_title}' 검색 결과 {len(game_results)}개입니다. 게임을 선택하세요:",
-                    view=view,
+                    f"❌ '{original_title}'를 찾을 수 없습니다. 영문 제목이나 Steam 링크로 다시 시도해주세요.",
                     ephemeral=True
                 )
                 return
 
-            elif self.category == 'manga':
-                if self.source_url:
-                    manga_info = await ContentSearcher.fetch_manga_by_url(session, self.source_url)
-                    if not manga_info:
-                        await interaction.followup.send("❌ 유효하지 않은 MangaDex URL입니다.", ephemeral=True)
-                        return
+            if len(game_results) == 1:
+                logger.debug("ReviewForm.on_submit() 게임 단일 결과 - 자동 선택")
+                game = game_results[0]
+                game['season'] = None
+                game['latest_units'] = self.latest_units
 
-                    fetched_title, year, director, img_url, mangadex_id = manga_info
-                    title = title or fetched_title
-                    print(
-                        f"[DEBUG] ReviewForm.on_submit() MangaDex 링크 조회 성공 - "
-                        f"title: {title}, id: {mangadex_id}"
-                    )
-                else:
-                    title, year, director, img_url, mangadex_id = await ContentSearcher.search_manga(session, title)
-                db_category = 'manga'
-            else:  # webtoon
-                title, year, director, img_url, naver_title_id = await ContentSearcher.search_webtoon(session, title)
-                db_category = 'webtoon'
-
-            print(f"[DEBUG] ReviewForm.on_submit() 검색 결과 - title: {title}, year: {year}, director: {director}, img_url: {img_url}")
-
-            # 검색 결과 없음 확인 (만화/웹툰만 해당)
-            if title == None or director == None or year == None:
-                print(f"[DEBUG] ReviewForm.on_submit() 검색 실패 - 결과 없음")
-                await interaction.followup.send(f"❌ '{original_title}'를 찾을 수 없습니다. 정확한 제목으로 다시 시도해주세요.", ephemeral=True)
+                await _save_and_send_review(
+                    interaction,
+                    self.db,
+                    game,
+                    self.category,
+                    self.score,
+                    self.line_comment,
+                    self.comment,
+                    self.author_id,
+                    self.author_name,
+                    self.display_name,
+                    unit_to=unit_to,
+                    latest_units=self.latest_units
+                )
                 return
 
-            # 만화/웹툰: 기존 방식 + 외부 ID 추가
-            movie_info = {
-                'title': title,
-                'year': year,
-                'director': director,
-                'img_url': img_url,
-                'category': db_category,
-                'season': self.season,
-                'latest_units': self.latest_units,
-                'source_url': self.source_url
-            }
+            logger.debug("ReviewForm.on_submit() 게임 다중 결과 - Select Menu 표시 (%s개)", len(game_results))
+            view = MovieSelectView(game_results, self)
+            await interaction.followup.send(
+                f"🔍 '{original_title}' 검색 결과 {len(game_results)}개입니다. 게임을 선택하세요:",
+                view=view,
+                ephemeral=True
+            )
+            return
 
-            # 외부 ID 추가
-            if db_category == 'manga':
-                movie_info['mangadex_id'] = mangadex_id
-            elif db_category == 'webtoon':
-                movie_info['naver_title_id'] = naver_title_id
+        elif self.category == 'manga':
+            if self.source_url:
+                manga_info = await ContentSearcher.fetch_manga_by_url(session, self.source_url)
+                if not manga_info:
+                    await interaction.followup.send("❌ 유효하지 않은 MangaDex URL입니다.", ephemeral=True)
+                    return
 
-            await _save_and_send_review(
-                interaction,
-                self.db,
-                movie_info,
-                self.category,
-                self.score,
-                self.line_comment,
-                self.comment,
-                self.author_id,
-                self.author_name,
-                self.display_name,
-                unit_to=unit_to,
-                latest_units=self.latest_units
-            )
+                fetched_title, year, director, img_url, mangadex_id = manga_info
+                title = title or fetched_title
+                logger.debug(
+                    "ReviewForm.on_submit() MangaDex 링크 조회 성공 - title: %s, id: %s",
+                    title, mangadex_id
+                )
+            else:
+                title, year, director, img_url, mangadex_id = await ContentSearcher.search_manga(session, title)
+            db_category = 'manga'
+        else:  # webtoon
+            title, year, director, img_url, naver_title_id = await ContentSearcher.search_webtoon(session, title)
+            db_category = 'webtoon'
+
+        logger.debug(
+            "ReviewForm.on_submit() 검색 결과 - title: %s, year: %s, director: %s, img_url: %s",
+            title, year, director, img_url
+        )
+
+        # 검색 결과 없음 확인 (만화/웹툰만 해당)
+        if title == None or director == None or year == None:
+            logger.debug("ReviewForm.on_submit() 검색 실패 - 결과 없음")
+            await interaction.followup.send(f"❌ '{original_title}'를 찾을 수 없습니다. 정확한 제목으로 다시 시도해주세요.", ephemeral=True)
+            return
+
+        # 만화/웹툰: 기존 방식 + 외부 ID 추가
+        movie_info = {
+            'title': title,
+            'year': year,
+            'director': director,
+            'img_url': img_url,
+            'category': db_category,
+            'season': self.season,
+            'latest_units': self.latest_units,
+            'source_url': self.source_url
+        }
+
+        # 외부 ID 추가
+        if db_category == 'manga':
+            movie_info['mangadex_id'] = mangadex_id
+        elif db_category == 'webtoon':
+            movie_info['naver_title_id'] = naver_title_id
+
+        await _save_and_send_review(
+            interaction,
+            self.db,
+            movie_info,
+            self.category,
+            self.score,
+            self.line_comment,
+            self.comment,
+            self.author_id,
+            self.author_name,
+            self.display_name,
+            unit_to=unit_to,
+            latest_units=self.latest_units
+        )
 
 
 class ReviewLaunchView(discord.ui.View):
@@ -2339,6 +2570,7 @@ class ReviewLaunchView(discord.ui.View):
         self.latest_units = latest_units
 
     @discord.ui.button(label="입력창 열기", style=discord.ButtonStyle.primary)
+    @traced("ReviewLaunchView.open_review_modal")
     async def open_review_modal(self, interaction: discord.Interaction, button: discord.ui.Button):
         if interaction.user.id != self.author_id:
             await interaction.response.send_message("❌ 이 입력창은 명령을 실행한 사람만 열 수 있습니다.", ephemeral=True)
@@ -2348,10 +2580,9 @@ class ReviewLaunchView(discord.ui.View):
         if self.category == 'webnovel' and self.source_url:
             platform = detect_webnovel_platform_from_url(self.source_url) or "웹소설"
             prefetched_info = (None, platform, "미상", None, self.source_url)
-            print(
-                f"[DEBUG] ReviewLaunchView.open_review_modal() 웹소설 링크 입력 - "
-                f"platform={platform}, url={self.source_url}",
-                flush=True
+            logger.debug(
+                "ReviewLaunchView.open_review_modal() 웹소설 링크 입력 - platform=%s, url=%s",
+                platform, self.source_url
             )
 
         modal = ReviewForm(
@@ -2366,22 +2597,21 @@ class ReviewLaunchView(discord.ui.View):
             source_url=self.source_url
         )
 
-        print(
-            f"[DEBUG] ReviewLaunchView.open_review_modal() 모달 전송 직전 - "
-            f"category={self.category}, has_link={bool(self.source_url)}, "
-            f"source_url={self.source_url}, response_done={interaction.response.is_done()}",
-            flush=True
+        logger.debug(
+            "ReviewLaunchView.open_review_modal() 모달 전송 직전 - category=%s, has_link=%s, "
+            "source_url=%s, response_done=%s",
+            self.category, bool(self.source_url), self.source_url, interaction.response.is_done()
         )
 
         try:
-            await interaction.response.send_modal(modal)
+            with span("discord.send_modal"):
+                await interaction.response.send_modal(modal)
         except discord.HTTPException as e:
             if getattr(e, "code", None) in (40060, 10062):
-                print(
-                    f"[ERROR] ReviewLaunchView.open_review_modal() Discord interaction 응답 실패 "
-                    f"(code={getattr(e, 'code', None)}, category={self.category}, "
-                    f"source_url={self.source_url}, response_done={interaction.response.is_done()})",
-                    flush=True
+                logger.error(
+                    "ReviewLaunchView.open_review_modal() Discord interaction 응답 실패 (code=%s, "
+                    "category=%s, source_url=%s, response_done=%s)",
+                    getattr(e, 'code', None), self.category, self.source_url, interaction.response.is_done()
                 )
                 try:
                     await interaction.followup.send(
@@ -2427,6 +2657,7 @@ class EditReviewForm(discord.ui.Modal, title="리뷰 수정"):
             required=False
         ))
 
+    @traced("EditReviewForm.on_submit")
     async def on_submit(self, interaction: discord.Interaction):
         score_str = self.children[0].value
         one_line_review = self.children[1].value
@@ -2442,14 +2673,15 @@ class EditReviewForm(discord.ui.Modal, title="리뷰 수정"):
             await interaction.response.send_message("❌ 별점은 숫자만 입력해주세요!", ephemeral=True)
             return
 
-        await interaction.response.defer(ephemeral=True)
+        with span("discord.defer"):
+            await interaction.response.defer(ephemeral=True)
 
         title = self.review_data['movie_title']
         category = self.review_data['category']
         season = self.review_data.get('season')
 
         # DB 업데이트
-        updated = self.db.update_review(
+        updated = await self.db.update_review(
             self.user_id, title, category,
             score, one_line_review, additional_comment,
             season=season
@@ -2460,7 +2692,7 @@ class EditReviewForm(discord.ui.Modal, title="리뷰 수정"):
             return
 
         # 수정 로그 기록
-        self.db.log_review_action(
+        await self.db.log_review_action(
             user_id=self.user_id,
             username=self.display_name,
             action='edit',
@@ -2585,7 +2817,7 @@ class EditReviewForm(discord.ui.Modal, title="리뷰 수정"):
         # 1단계: context menu에서 전달된 target_message
         if self.target_message:
             target_msg = self.target_message
-            print(f"[DEBUG] EditReviewForm.on_submit() target_message 사용")
+            logger.debug("EditReviewForm.on_submit() target_message 사용")
 
         # 2단계: DB에 저장된 message_id로 fetch
         if not target_msg:
@@ -2595,9 +2827,9 @@ class EditReviewForm(discord.ui.Modal, title="리뷰 수정"):
                 try:
                     channel = interaction.client.get_channel(ch_id) or await interaction.client.fetch_channel(ch_id)
                     target_msg = await channel.fetch_message(msg_id)
-                    print(f"[DEBUG] EditReviewForm.on_submit() DB message_id로 메시지 fetch 성공")
+                    logger.debug("EditReviewForm.on_submit() DB message_id로 메시지 fetch 성공")
                 except Exception as e:
-                    print(f"[DEBUG] EditReviewForm.on_submit() DB message_id로 메시지 fetch 실패: {e}")
+                    logger.debug("EditReviewForm.on_submit() DB message_id로 메시지 fetch 실패: %s", e)
 
         # 3단계: channel history scan
         if not target_msg:
@@ -2606,10 +2838,10 @@ class EditReviewForm(discord.ui.Modal, title="리뷰 수정"):
                     if message.author == interaction.client.user:
                         if f"{emoji}제목: {title}{season_text}" in message.content:
                             target_msg = message
-                            print(f"[DEBUG] EditReviewForm.on_submit() channel history scan으로 메시지 발견")
+                            logger.debug("EditReviewForm.on_submit() channel history scan으로 메시지 발견")
                             break
             except Exception as e:
-                print(f"[DEBUG] EditReviewForm.on_submit() channel history scan 실패: {e}")
+                logger.debug("EditReviewForm.on_submit() channel history scan 실패: %s", e)
 
         # 메시지를 찾은 경우: in-place edit (첨부파일 자동 보존)
         if target_msg:
@@ -2617,11 +2849,11 @@ class EditReviewForm(discord.ui.Modal, title="리뷰 수정"):
                 # 기존 반응 카운트 유지
                 edit_view = ReviewReactionView()
                 if self.review_data.get('id'):
-                    reaction_counts = self.db.get_reaction_counts(self.review_data['id'])
+                    reaction_counts = await self.db.get_reaction_counts(self.review_data['id'])
                     edit_view.update_counts(reaction_counts)
                 await target_msg.edit(content=filled_form, view=edit_view)
                 if self.review_data.get('id'):
-                    self.db.update_message_id(
+                    await self.db.update_message_id(
                         self.review_data['id'],
                         target_msg.id,
                         target_msg.channel.id
@@ -2629,83 +2861,69 @@ class EditReviewForm(discord.ui.Modal, title="리뷰 수정"):
                 await interaction.followup.send(
                     f"✅ '{title}{season_text}' ({cat_name}) 리뷰가 수정되었습니다.", ephemeral=True
                 )
-                print(f"[DEBUG] EditReviewForm.on_submit() in-place edit 성공")
+                logger.debug("EditReviewForm.on_submit() in-place edit 성공")
                 return
             except Exception as e:
-                print(f"[ERROR] EditReviewForm.on_submit() in-place edit 실패: {e}")
+                logger.error("EditReviewForm.on_submit() in-place edit 실패: %s", e)
 
         # 최종 fallback: 새 메시지로 전송 (이미지 다운로드 포함)
-        print(f"[DEBUG] EditReviewForm.on_submit() 최종 fallback - 새 메시지로 전송")
+        logger.debug("EditReviewForm.on_submit() 최종 fallback - 새 메시지로 전송")
         img_url = self.review_data.get('img_url')
 
         # img_url이 없으면 API 재검색
         if not img_url:
-            async with aiohttp.ClientSession() as session:
-                if search_category == 'tmdb':
-                    _, _, _, img_url, _ = await ContentSearcher._search_tmdb_direct(session, title)
-                elif search_category == 'manga':
-                    _, _, _, img_url, _ = await ContentSearcher.search_manga(session, title)
-                elif search_category == 'webtoon':
-                    _, _, _, img_url, _ = await ContentSearcher.search_webtoon(session, title)
-                elif search_category == 'webnovel' and self.review_data.get('source_url'):
-                    fetched_info = await fetch_webnovel_by_url(session, self.review_data['source_url'])
-                    if fetched_info:
-                        _, _, _, img_url, _ = fetched_info
-                elif search_category == 'music_track':
-                    music_results = await ContentSearcher.search_music_track_multiple(
-                        session,
-                        title,
-                        artist=director
-                    )
-                    if music_results:
-                        music = await ContentSearcher.hydrate_music_result(session, music_results[0])
-                        img_url = music.get('img_url')
-                elif search_category == 'game':
-                    game_results = await search_game_candidates(session, title, limit=1)
-                    if game_results:
-                        img_url = game_results[0].get('img_url')
+            session = interaction.client.http_session
+            if search_category == 'tmdb':
+                _, _, _, img_url, _ = await ContentSearcher._search_tmdb_direct(session, title)
+            elif search_category == 'manga':
+                _, _, _, img_url, _ = await ContentSearcher.search_manga(session, title)
+            elif search_category == 'webtoon':
+                _, _, _, img_url, _ = await ContentSearcher.search_webtoon(session, title)
+            elif search_category == 'webnovel' and self.review_data.get('source_url'):
+                fetched_info = await fetch_webnovel_by_url(session, self.review_data['source_url'])
+                if fetched_info:
+                    _, _, _, img_url, _ = fetched_info
+            elif search_category == 'music_track':
+                music_results = await ContentSearcher.search_music_track_multiple(
+                    session,
+                    title,
+                    artist=director
+                )
+                if music_results:
+                    music = await ContentSearcher.hydrate_music_result(session, music_results[0])
+                    img_url = music.get('img_url')
+            elif search_category == 'game':
+                game_results = await search_game_candidates(session, title, limit=1)
+                if game_results:
+                    img_url = game_results[0].get('img_url')
 
             if img_url:
-                self.db.update_review(
+                await self.db.update_review(
                     self.user_id, title, category,
                     score, one_line_review, additional_comment,
                     img_url=img_url,
                     season=season
                 )
 
-        # 이미지 다운로드 및 전송
-        img_data = None
-        if img_url:
-            timeout = aiohttp.ClientTimeout(total=30)
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-                'Referer': self.review_data.get('source_url') or img_url
-            }
-            for attempt in range(3):
-                try:
-                    async with aiohttp.ClientSession(timeout=timeout, headers=headers) as session:
-                        async with session.get(img_url) as img_response:
-                            if img_response.status == 200:
-                                img_data = await img_response.read()
-                                break
-                except Exception as e:
-                    print(f"[ERROR] EditReviewForm fallback 이미지 다운로드 오류 (시도 {attempt + 1}): {e}")
-                if attempt < 2:
-                    await asyncio.sleep(1)
-
         fallback_view = ReviewReactionView()
         if self.review_data.get('id'):
-            fb_counts = self.db.get_reaction_counts(self.review_data['id'])
+            fb_counts = await self.db.get_reaction_counts(self.review_data['id'])
             fallback_view.update_counts(fb_counts)
 
-        if img_data:
-            file = discord.File(io.BytesIO(img_data), filename="image.jpg")
-            sent_message = await interaction.followup.send(filled_form, file=file, view=fallback_view, wait=True)
-        else:
-            sent_message = await interaction.followup.send(filled_form, view=fallback_view, wait=True)
+        # 이미지 처리 및 전송
+        sent_message = await send_review_message(
+            interaction,
+            self.db,
+            filled_form,
+            fallback_view,
+            img_url=img_url,
+            content_id=self.review_data.get('content_id'),
+            referer=self.review_data.get('source_url'),
+            log_prefix="EditReviewForm fallback"
+        )
 
         if self.review_data.get('id') and sent_message:
-            self.db.update_message_id(
+            await self.db.update_message_id(
                 self.review_data['id'],
                 sent_message.id,
                 interaction.channel_id
@@ -2722,13 +2940,35 @@ class EditReviewForm(discord.ui.Modal, title="리뷰 수정"):
 class MyBot(commands.Bot):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
-        self.db = Database()
+        self.db = AsyncDatabase(Database())
+        self.http_session = None
+        self.metrics_runner = None
         self.assistant_service = None
 
     async def on_ready(self):
-        print(f'Logged in as {self.user}')
+        logger.info("Logged in as %s", self.user)
+
+    async def close(self):
+        await super().close()
+        if self.metrics_runner is not None:
+            await self.metrics_runner.cleanup()
+        if self.http_session is not None:
+            await self.http_session.close()
+        await asyncio.to_thread(self.db.shutdown)
 
     async def setup_hook(self):
+        # 봇 전체 공유 HTTP 세션 (ContentSearcher / fetch_* 헬퍼에서 사용)
+        self.http_session = create_http_session()
+        # 메타데이터 캐시가 재시작 후에도 유지되도록 DB 영구 캐시 연결
+        metadata_cache.attach_store(self.db)
+        # /마이그레이션을 다시 실행할 때 이미 파싱한 메시지는 Grok에 다시 묻지 않도록
+        GrokSearcher.attach_store(self.db)
+        # /통계, /리뷰수정 등 제목 자동완성 인덱스
+        await self.db.load_title_index()
+
+        # METRICS_PORT가 설정되어 있으면 Prometheus /metrics 엔드포인트 시작
+        self.metrics_runner = await start_metrics_server(self.collect_gauges)
+
         # Persistent view 등록 (봇 재시작 후에도 기존 버튼 동작)
         self.add_view(ReviewReactionView())
 
@@ -2748,8 +2988,34 @@ class MyBot(commands.Bot):
         self.tree.add_command(delete_review_context)
         self.tree.add_command(ranking_command)
         self.tree.add_command(migration_command)
+        self.tree.add_command(bot_status_command)
+        self.tree.add_command(trace_command)
         await self.tree.sync()
 
+    def collect_gauges(self):
+        """/metrics에 함께 내보낼 연결 풀/메타데이터 캐시 상태"""
+        gauges = {}
+        pool_stats = self.db.sync.get_pool_stats()
+        for key in ('in_use', 'max_size', 'checkouts', 'waits', 'timeouts', 'recycled'):
+            if key in pool_stats:
+                gauges[f"bot_db_pool_{key}"] = pool_stats[key]
+        cache_stats = metadata_cache.stats()
+        gauges['bot_metadata_cache_entries'] = cache_stats['entries']
+        gauges['bot_metadata_cache_bytes'] = cache_stats['size_bytes']
+        image_stats = image_cache.stats()
+        gauges['bot_image_cache_entries'] = image_stats['entries']
+        gauges['bot_image_cache_bytes'] = image_stats['size_bytes']
+        gauges['bot_image_cache_hits'] = image_stats['hits']
+        gauges['bot_image_cache_misses'] = image_stats['misses']
+        gauges['bot_title_index_contents'] = self.db.title_index.stats()['contents']
+        grok_stats = GrokSearcher.cache_stats()
+        gauges['bot_grok_parse_cache_hits'] = grok_stats['hits']
+        gauges['bot_grok_parse_cache_misses'] = grok_stats['misses']
+        trace_stats = trace_store.stats()
+        gauges['bot_interaction_traces_total'] = trace_stats['total']
+        gauges['bot_interaction_near_deadline_total'] = trace_stats['flagged_total']
+        return gauges
+
     async def on_message(self, message: discord.Message):
         # 봇 메시지 무시
         if message.author.bot:
@@ -2787,6 +3053,7 @@ bot = MyBot(command_prefix="/", intents=intents)
     discord.app_commands.Choice(name="🎮 게임", value="game"),
     discord.app_commands.Choice(name="🎵 곡", value="music_track"),
 ])
+@traced("/한줄평")
 async def review_command(
     interaction: discord.Interaction,
     카테고리: str,
@@ -2804,11 +3071,13 @@ async def review_command(
 
     if source_url and should_handle_as_music_link(source_url, 카테고리):
         try:
-            timeout = aiohttp.ClientTimeout(total=2.8)
-            async with aiohttp.ClientSession(timeout=timeout) as session:
-                music_info = await fetch_music_by_url(session, source_url, 카테고리)
+            with span("link.music_lookup"):
+                music_info = await asyncio.wait_for(
+                    fetch_music_by_url(interaction.client.http_session, source_url, 카테고리),
+                    timeout=LINK_LOOKUP_TIMEOUT
+                )
         except Exception as e:
-            print(f"[WARN] review_command() 음악 링크 메타데이터 조회 실패: {e}")
+            logger.warning("review_command() 음악 링크 메타데이터 조회 실패: %s", e)
             music_info = None
 
         if not music_info:
@@ -2833,11 +3102,12 @@ async def review_command(
                 music_info.get('img_url'),
                 music_info.get('musicbrainz_id')
             )
-        print(
-            f"[DEBUG] review_command() 음악 링크 조회 성공 - "
-            f"provider={music_info.get('provider')}, title={music_info.get('title')}, "
-            f"artist={music_info.get('director')}, year={music_info.get('year')}",
-            flush=True
+        logger.debug(
+            "review_command() 음악 링크 조회 성공 - provider=%s, title=%s, artist=%s, year=%s",
+            music_info.get('provider'),
+            music_info.get('title'),
+            music_info.get('director'),
+            music_info.get('year')
         )
         modal = ReviewForm(
             bot.db,
@@ -2850,12 +3120,13 @@ async def review_command(
             source_url=source_url
         )
         try:
-            await interaction.response.send_modal(modal)
+            with span("discord.send_modal"):
+                await interaction.response.send_modal(modal)
+            start_prefetch(interaction.client.http_session, img_url=music_info.get('img_url'), source_url=source_url)
         except discord.HTTPException as e:
-            print(
-                f"[ERROR] review_command() 음악 링크 모달 전송 실패 "
-                f"(code={getattr(e, 'code', None)}, source_url={source_url})",
-                flush=True
+            logger.error(
+                "review_command() 음악 링크 모달 전송 실패 (code=%s, source_url=%s)",
+                getattr(e, 'code', None), source_url
             )
             if not interaction.response.is_done():
                 await send_ephemeral_interaction(
@@ -2880,11 +3151,13 @@ async def review_command(
             return
 
         try:
-            timeout = aiohttp.ClientTimeout(total=2.8)
-            async with aiohttp.ClientSession(timeout=timeout) as session:
-                game_info = await fetch_game_by_url(session, source_url)
+            with span("link.game_lookup"):
+                game_info = await asyncio.wait_for(
+                    fetch_game_by_url(interaction.client.http_session, source_url),
+                    timeout=LINK_LOOKUP_TIMEOUT
+                )
         except Exception as e:
-            print(f"[WARN] review_command() 게임 링크 메타데이터 조회 실패: {e}")
+            logger.warning("review_command() 게임 링크 메타데이터 조회 실패: %s", e)
             game_info = None
 
         if not game_info:
@@ -2904,11 +3177,12 @@ async def review_command(
                 'steam_appid': game_info.get('steam_appid')
             }
         )
-        print(
-            f"[DEBUG] review_command() 게임 링크 조회 성공 - "
-            f"provider={game_info.get('provider')}, title={game_info.get('title')}, "
-            f"developer={game_info.get('director')}, year={game_info.get('year')}",
-            flush=True
+        logger.debug(
+            "review_command() 게임 링크 조회 성공 - provider=%s, title=%s, developer=%s, year=%s",
+            game_info.get('provider'),
+            game_info.get('title'),
+            game_info.get('director'),
+            game_info.get('year')
         )
         modal = ReviewForm(
             bot.db,
@@ -2921,12 +3195,13 @@ async def review_command(
             source_url=source_url
         )
         try:
-            await interaction.response.send_modal(modal)
+            with span("discord.send_modal"):
+                await interaction.response.send_modal(modal)
+            start_prefetch(interaction.client.http_session, img_url=game_info.get('img_url'), source_url=source_url)
         except discord.HTTPException as e:
-            print(
-                f"[ERROR] review_command() 게임 링크 모달 전송 실패 "
-                f"(code={getattr(e, 'code', None)}, source_url={source_url})",
-                flush=True
+            logger.error(
+                "review_command() 게임 링크 모달 전송 실패 (code=%s, source_url=%s)",
+                getattr(e, 'code', None), source_url
             )
             if not interaction.response.is_done():
                 await send_ephemeral_interaction(
@@ -2937,9 +3212,9 @@ async def review_command(
 
     detected_webnovel_platform = detect_webnovel_platform_from_url(source_url) if source_url else None
     if detected_webnovel_platform and 카테고리 != 'webnovel':
-        print(
-            f"[DEBUG] review_command() 웹소설 링크 도메인 감지로 카테고리 보정: "
-            f"{카테고리} -> webnovel ({detected_webnovel_platform})"
+        logger.debug(
+            "review_command() 웹소설 링크 도메인 감지로 카테고리 보정: %s -> webnovel (%s)",
+            카테고리, detected_webnovel_platform
         )
         카테고리 = 'webnovel'
 
@@ -2963,11 +3238,10 @@ async def review_command(
 
     category_text = CATEGORY_NAME.get(카테고리, 카테고리)
     emoji = CATEGORY_EMOJI.get(카테고리, "🎬")
-    print(
-        f"[DEBUG] review_command() 모달 버튼 followup 전송 - "
-        f"category={카테고리}, has_link={bool(링크)}, "
-        f"source_url={source_url}, response_done={interaction.response.is_done()}",
-        flush=True
+    logger.debug(
+        "review_command() 모달 버튼 followup 전송 - category=%s, has_link=%s, source_url=%s, "
+        "response_done=%s",
+        카테고리, bool(링크), source_url, interaction.response.is_done()
     )
 
     sent = await send_ephemeral_interaction(
@@ -2976,12 +3250,16 @@ async def review_command(
         view=view
     )
     if not sent:
-        print(
-            f"[ERROR] review_command() 모달 버튼 followup 전송 실패 "
-            f"(category={카테고리}, has_link={bool(링크)}, source_url={source_url}, "
-            f"response_done={interaction.response.is_done()})",
-            flush=True
+        logger.error(
+            "review_command() 모달 버튼 followup 전송 실패 (category=%s, has_link=%s, source_url=%s, "
+            "response_done=%s)",
+            카테고리, bool(링크), source_url, interaction.response.is_done()
         )
+        return
+
+    # 버튼을 누르고 입력창을 채우는 동안 링크 메타데이터와 표지를 미리 받아둔다
+    if source_url:
+        start_prefetch(interaction.client.http_session, source_url=source_url, category=카테고리)
 
 
 @discord.app_commands.command(name="내리뷰", description="내가 작성한 리뷰 목록을 조회합니다.")
@@ -2997,9 +3275,10 @@ async def review_command(
     discord.app_commands.Choice(name="게임", value="game"),
     discord.app_commands.Choice(name="곡", value="music_track"),
 ])
+@traced("/내리뷰")
 async def my_reviews_command(interaction: discord.Interaction, 카테고리: str = "all"):
     category = None if 카테고리 == "all" else 카테고리
-    reviews = bot.db.get_user_reviews(interaction.user.id, limit=5, category=category)
+    reviews = await bot.db.get_user_reviews(interaction.user.id, limit=5, category=category)
 
     if not reviews:
         await interaction.response.send_message("❌ 작성한 리뷰가 없습니다.", ephemeral=True)
@@ -3063,9 +3342,10 @@ async def my_reviews_command(interaction: discord.Interaction, 카테고리: str
     discord.app_commands.Choice(name="게임", value="game"),
     discord.app_commands.Choice(name="곡", value="music_track"),
 ])
+@traced("/통계")
 async def stats_command(interaction: discord.Interaction, 제목: str, 카테고리: str = "all"):
     category = None if 카테고리 == "all" else 카테고리
-    stats = bot.db.get_content_stats(제목, category)
+    stats = await bot.db.get_content_stats(제목, category)
 
     if not stats or stats['review_count'] == 0:
         await interaction.response.send_message(f"❌ '{제목}'에 대한 리뷰가 없습니다.", ephemeral=True)
@@ -3099,6 +3379,7 @@ async def stats_command(interaction: discord.Interaction, 제목: str, 카테고
     discord.app_commands.Choice(name="🎮 게임", value="game"),
     discord.app_commands.Choice(name="🎵 곡", value="music_track"),
 ])
+@traced("/리뷰히스토리")
 async def review_history_command(
     interaction: discord.Interaction,
     제목: str,
@@ -3113,14 +3394,14 @@ async def review_history_command(
     limit = max(1, min(개수 or 10, 20))
     season_kwargs = {} if 기수 is None else {'season': None if 기수 == 0 else 기수}
 
-    history = bot.db.get_review_history(
+    history = await bot.db.get_review_history(
         interaction.user.id,
         제목,
         카테고리,
         limit=limit,
         **season_kwargs
     )
-    logs = bot.db.get_review_logs(
+    logs = await bot.db.get_review_logs(
         interaction.user.id,
         title=제목,
         category=카테고리,
@@ -3192,17 +3473,19 @@ async def review_history_command(
     discord.app_commands.Choice(name="게임", value="game"),
     discord.app_commands.Choice(name="곡", value="music_track"),
 ])
+@traced("/리뷰삭제")
 async def delete_review_command(interaction: discord.Interaction, 제목: str, 카테고리: str = None, 기수: int = None):
-    await interaction.response.defer(ephemeral=True)
+    with span("discord.defer"):
+        await interaction.response.defer(ephemeral=True)
 
-    season_value, season_message = resolve_review_season(bot.db, interaction.user.id, 제목, 카테고리, 기수)
+    season_value, season_message = await resolve_review_season(bot.db, interaction.user.id, 제목, 카테고리, 기수)
     if season_message:
         await interaction.followup.send(season_message, ephemeral=True)
         return
     season_kwargs = {} if 기수 is None and 카테고리 is None else {'season': season_value}
 
     # 삭제 전 기존 데이터 조회 (로그용 + 메시지 삭제용)
-    review = bot.db.get_user_review(interaction.user.id, 제목, 카테고리, **season_kwargs)
+    review = await bot.db.get_user_review(interaction.user.id, 제목, 카테고리, **season_kwargs)
 
     if not review:
         season_text = format_season(카테고리, season_value) if 카테고리 else ""
@@ -3225,7 +3508,7 @@ async def delete_review_command(interaction: discord.Interaction, 제목: str, 
                             await message.thread.delete()
                             thread_deleted = True
                         except Exception as e:
-                            print(f"[WARN] Failed to delete thread: {e}")
+                            logger.warning("Failed to delete thread: %s", e)
 
                     # 메시지 삭제
                     await message.delete()
@@ -3233,14 +3516,14 @@ async def delete_review_command(interaction: discord.Interaction, 제목: str, 
         except discord.NotFound:
             pass  # 메시지가 이미 삭제됨
         except Exception as e:
-            print(f"[WARN] Failed to delete review message: {e}")
+            logger.warning("Failed to delete review message: %s", e)
 
     # DB에서 삭제 (CASCADE로 reactions, comments도 자동 삭제)
-    deleted = bot.db.delete_review(interaction.user.id, 제목, 카테고리, **season_kwargs)
+    deleted = await bot.db.delete_review(interaction.user.id, 제목, 카테고리, **season_kwargs)
 
     if deleted:
         # 삭제 로그 기록
-        bot.db.log_review_action(
+        await bot.db.log_review_action(
             user_id=interaction.user.id,
             username=interaction.user.display_name,
             action='delete',
@@ -3286,15 +3569,16 @@ async def delete_review_command(interaction: discord.Interaction, 제목: str, 
     discord.app_commands.Choice(name="게임", value="game"),
     discord.app_commands.Choice(name="곡", value="music_track"),
 ])
+@traced("/리뷰수정")
 async def edit_review_command(interaction: discord.Interaction, 제목: str, 카테고리: str = None, 기수: int = None):
-    season_value, season_message = resolve_review_season(bot.db, interaction.user.id, 제목, 카테고리, 기수)
+    season_value, season_message = await resolve_review_season(bot.db, interaction.user.id, 제목, 카테고리, 기수)
     if season_message:
         await interaction.response.send_message(season_message, ephemeral=True)
         return
     season_kwargs = {} if 기수 is None and 카테고리 is None else {'season': season_value}
 
     # DB에서 리뷰 조회
-    review = bot.db.get_user_review(interaction.user.id, 제목, 카테고리, **season_kwargs)
+    review = await bot.db.get_user_review(interaction.user.id, 제목, 카테고리, **season_kwargs)
 
     if not review:
         cat_text = f" ({CATEGORY_NAME.get(카테고리, '')})" if 카테고리 else ""
@@ -3319,29 +3603,71 @@ async def edit_review_command(interaction: discord.Interaction, 제목: str, 카
         interaction.user.id,
         interaction.user.display_name
     )
-    await interaction.response.send_modal(modal)
+    with span("discord.send_modal"):
+        await interaction.response.send_modal(modal)
+
+
+def title_choices(interaction: discord.Interaction, current: str, own_reviews: bool):
+    """제목 자동완성 선택지. 같은 제목이 여러 카테고리에 있으면 하나로 묶는다."""
+    start = time.perf_counter()
+    category = getattr(interaction.namespace, '카테고리', None)
+    if category == "all":
+        category = None
+
+    matches = bot.db.title_index.search(
+        current,
+        user_id=interaction.user.id if own_reviews else None,
+        category=category,
+        limit=TITLE_AUTOCOMPLETE_LIMIT
+    )
+    categories_by_title = {}
+    for title, title_category in matches:
+        # 선택지 value는 100자 제한
+        if len(title) <= 100:
+            categories_by_title.setdefault(title, []).append(CATEGORY_NAME.get(title_category, title_category))
+
+    choices = [
+        discord.app_commands.Choice(name=short_text(f"{title} ({'·'.join(names)})", 100), value=title)
+        for title, names in categories_by_title.items()
+    ]
+    elapsed = time.perf_counter() - start
+    if elapsed > TITLE_AUTOCOMPLETE_WARN:
+        logger.warning("title_choices() 느린 자동완성 %s - query=%r", format_seconds(elapsed), current)
+    return choices
+
+
+@stats_command.autocomplete('제목')
+async def stats_title_autocomplete(interaction: discord.Interaction, current: str):
+    return title_choices(interaction, current, own_reviews=False)
+
+
+@review_history_command.autocomplete('제목')
+@delete_review_command.autocomplete('제목')
+@edit_review_command.autocomplete('제목')
+async def own_title_autocomplete(interaction: discord.Interaction, current: str):
+    return title_choices(interaction, current, own_reviews=True)
 
 
 @discord.app_commands.command(name="어디서봐", description="작품의 OTT/스트리밍 정보를 조회합니다.")
 @discord.app_commands.describe(제목="검색할 작품 제목")
+@traced("/어디서봐")
 async def ott_command(interaction: discord.Interaction, 제목: str):
-    await interaction.response.defer(ephemeral=True)
+    with span("discord.defer"):
+        await interaction.response.defer(ephemeral=True)
 
-    async with aiohttp.ClientSession() as session:
-        movies = await ContentSearcher.search_tmdb_multiple(session, 제목)
+    session = interaction.client.http_session
+    movies = await ContentSearcher.search_tmdb_multiple(session, 제목)
 
-        if not movies:
-            await interaction.followup.send(f"❌ '{제목}'를 찾을 수 없습니다. 정확한 제목으로 다시 시도해주세요.", ephemeral=True)
-            return
+    if not movies:
+        await interaction.followup.send(f"❌ '{제목}'를 찾을 수 없습니다. 정확한 제목으로 다시 시도해주세요.", ephemeral=True)
+        return
 
-        if len(movies) == 1:
-            movie = movies[0]
-            providers = await ContentSearcher.fetch_watch_providers(
-                session, movie['tmdb_id'], movie['media_type']
-            )
-            embed = _build_ott_embed(movie, providers)
-            await interaction.followup.send(embed=embed, ephemeral=True)
-            return
+    if len(movies) == 1:
+        movie = movies[0]
+        providers = await get_watch_providers(session, movie)
+        embed = _build_ott_embed(movie, providers)
+        await interaction.followup.send(embed=embed, ephemeral=True)
+        return
 
     view = OTTSelectView(movies)
     await interaction.followup.send(
@@ -3354,6 +3680,7 @@ async def ott_command(interaction: discord.Interaction, 제목: str):
 # ==================== Context Menu Commands ====================
 
 @discord.app_commands.context_menu(name="리뷰 수정")
+@traced("메뉴:리뷰 수정")
 async def edit_review_context(interaction: discord.Interaction, message: discord.Message):
     # 봇이 보낸 메시지인지 확인
     if message.author != interaction.client.user:
@@ -3361,7 +3688,7 @@ async def edit_review_context(interaction: discord.Interaction, message: discord
         return
 
     # 메시지에서 title, category, season 파싱 (message_id 우선)
-    title, category, season, message_review = resolve_review_message(bot.db, message)
+    title, category, season, message_review = await resolve_review_message(bot.db, message)
     if not title or not category:
         await interaction.response.send_message("❌ 리뷰 메시지를 인식할 수 없습니다.", ephemeral=True)
         return
@@ -3373,7 +3700,7 @@ async def edit_review_context(interaction: discord.Interaction, message: discord
         return
 
     # DB에서 리뷰 조회 (소유권 확인)
-    review = bot.db.get_user_review(interaction.user.id, title, category, season=season)
+    review = await bot.db.get_user_review(interaction.user.id, title, category, season=season)
     if not review:
         await interaction.response.send_message(
             f"❌ '{title}' 리뷰를 찾을 수 없거나 본인의 리뷰가 아닙니다.", ephemeral=True
@@ -3402,7 +3729,8 @@ async def edit_review_context(interaction: discord.Interaction, message: discord
         interaction.user.display_name,
         target_message=message
     )
-    await interaction.response.send_modal(modal)
+    with span("discord.send_modal"):
+        await interaction.response.send_modal(modal)
 
 
 # DB category → search category 매핑
@@ -3419,6 +3747,7 @@ CATEGORY_TO_SEARCH = {
 
 
 @discord.app_commands.context_menu(name="나도 쓰기")
+@traced("메뉴:나도 쓰기")
 async def write_review_context(interaction: discord.Interaction, message: discord.Message):
     # 봇이 보낸 메시지인지 확인
     if message.author != interaction.client.user:
@@ -3426,7 +3755,7 @@ async def write_review_context(interaction: discord.Interaction, message: discor
         return
 
     # 메시지에서 title, category, season 파싱 (message_id 우선)
-    title, db_category, season, message_review = resolve_review_message(bot.db, message)
+    title, db_category, season, message_review = await resolve_review_message(bot.db, message)
     if not title or not db_category:
         await interaction.response.send_message("❌ 리뷰 메시지를 인식할 수 없습니다.", ephemeral=True)
         return
@@ -3441,7 +3770,10 @@ async def write_review_context(interaction: discord.Interaction, message: discor
     # 포스터 이미지 URL 획득
     img_url = message_review.get('img_url') if message_review else None
     if not img_url:
-        img_url = message.attachments[0].url if message.attachments else None
+        if message.attachments:
+            img_url = message.attachments[0].url
+        elif message.embeds and message.embeds[0].image:
+            img_url = message.embeds[0].image.url
 
     search_category = CATEGORY_TO_SEARCH.get(db_category)
     if not search_category:
@@ -3462,13 +3794,21 @@ async def write_review_context(interaction: discord.Interaction, message: discor
         prefetched_category=db_category,
         default_season=season
     )
-    await interaction.response.send_modal(modal)
+    with span("discord.send_modal"):
+        await interaction.response.send_modal(modal)
+    start_prefetch(
+        interaction.client.http_session,
+        img_url=img_url,
+        content_id=message_review.get('content_id') if message_review else None
+    )
 
 
 @discord.app_commands.context_menu(name="리뷰 삭제")
+@traced("메뉴:리뷰 삭제")
 async def delete_review_context(interaction: discord.Interaction, message: discord.Message):
     # 먼저 defer로 응답 시간 연장
-    await interaction.response.defer(ephemeral=True)
+    with span("discord.defer"):
+        await interaction.response.defer(ephemeral=True)
 
     # 봇이 보낸 메시지인지 확인
     if message.author != interaction.client.user:
@@ -3476,7 +3816,7 @@ async def delete_review_context(interaction: discord.Interaction, message: disco
         return
 
     # 메시지에서 title, category, season 파싱 (message_id 우선)
-    title, category, season, message_review = resolve_review_message(bot.db, message)
+    title, category, season, message_review = await resolve_review_message(bot.db, message)
     if not title or not category:
         await interaction.followup.send("❌ 리뷰 메시지를 인식할 수 없습니다.", ephemeral=True)
         return
@@ -3488,7 +3828,7 @@ async def delete_review_context(interaction: discord.Interaction, message: disco
         return
 
     # DB에서 리뷰 조회 (소유권 확인)
-    review = message_review or bot.db.get_user_review(interaction.user.id, title, category, season=season)
+    review = message_review or await bot.db.get_user_review(interaction.user.id, title, category, season=season)
     if not review:
         await interaction.followup.send(
             f"❌ '{title}' 리뷰를 찾을 수 없거나 본인의 리뷰가 아닙니다.", ephemeral=True
@@ -3504,15 +3844,15 @@ async def delete_review_context(interaction: discord.Interaction, message: disco
 
     # DB 삭제
     if message_review:
-        deleted = bot.db.delete_review_by_id(interaction.user.id, message_review['id'])
+        deleted = await bot.db.delete_review_by_id(interaction.user.id, message_review['id'])
     else:
-        deleted = bot.db.delete_review(interaction.user.id, title, category, season=season)
+        deleted = await bot.db.delete_review(interaction.user.id, title, category, season=season)
     if not deleted:
         await interaction.followup.send("❌ 리뷰 삭제에 실패했습니다.", ephemeral=True)
         return
 
     # 삭제 로그 기록
-    bot.db.log_review_action(
+    await bot.db.log_review_action(
         user_id=interaction.user.id,
         username=interaction.user.display_name,
         action='delete',
@@ -3532,7 +3872,7 @@ async def delete_review_context(interaction: discord.Interaction, message: disco
     try:
         await message.delete()
     except Exception as e:
-        print(f"[ERROR] delete_review_context() 메시지 삭제 실패: {e}")
+        logger.error("delete_review_context() 메시지 삭제 실패: %s", e)
 
     cat_name = CATEGORY_NAME.get(category, "")
     season_text = format_season(category, season)
@@ -3545,121 +3885,322 @@ async def delete_review_context(interaction: discord.Interaction, message: disco
 
 from review_interaction import REACTION_TYPES
 
-@discord.app_commands.command(name="마이그레이션", description="[관리자] 채널의 레거시 리뷰 메시지를 DB로 마이그레이션합니다.")
-@discord.app_commands.default_permissions(administrator=True)
-@discord.app_commands.describe(채널="마이그레이션할 채널", 메시지수="스캔할 메시지 수 (기본 100)")
-async def migration_command(interaction: discord.Interaction, 채널: discord.TextChannel, 메시지수: int = 100):
-    await interaction.response.defer()
+def is_migration_candidate(message):
+    """LLM으로 파싱해 볼 만한 레거시 리뷰 메시지인지 (봇/짧은 메시지/현재 형식은 제외)"""
+    if message.author.bot:
+        return False
+    if not message.content or len(message.content) < 10:
+        return False
+    # 이미 현재 형식인지 확인 (이모지로 시작하면 스킵)
+    first_line = message.content.split('\n')[0]
+    return not any(first_line.startswith(f"{emoji}제목:") for emoji in CATEGORY_EMOJI.values())
 
-    progress_msg = await interaction.followup.send(
-        f"🔄 {채널.mention} 채널에서 최근 {메시지수}개 메시지를 스캔 중...",
-        wait=True
-    )
 
-    migrated = 0
-    skipped = 0
-    failed = 0
-    processed = 0
+def build_migrated_review(message, parsed):
+    """LLM 파싱 결과를 save_migrated_reviews_bulk 행으로 변환. 필수 값이 없으면 None."""
+    if not parsed:
+        return None
+
+    title, parsed_season = split_title_season(parsed.get('title'))
+    score = parsed.get('score')
+    one_line = parsed.get('one_line_review')
+    category = parsed.get('category', 'movie')
+    season = parse_season_number(parsed.get('season')) or parsed_season
+
+    if not title or score is None or not one_line:
+        return None
 
+    # score를 float로 변환 및 범위 확인
     try:
-        async for message in 채널.history(limit=메시지수):
-            processed += 1
+        score = max(0, min(5, float(score)))
+    except (ValueError, TypeError):
+        return None
 
-            # 봇 메시지는 스킵
-            if message.author.bot:
-                skipped += 1
-                continue
+    # 카테고리 검증
+    if category not in CATEGORY_EMOJI:
+        category = 'movie'
 
-            # 메시지 내용이 없으면 스킵
-            if not message.content or len(message.content) < 10:
-                skipped += 1
-                continue
+    return {
+        'user_id': message.author.id,
+        'username': str(message.author),
+        'movie_title': title,
+        'movie_year': parsed.get('year'),
+        'director': parsed.get('director'),
+        'score': score,
+        'one_line_review': one_line,
+        'category': category,
+        'created_at': message.created_at,
+        'message_id': message.id,
+        'channel_id': message.channel.id,
+        'season': season,
+    }
 
-            # 이미 현재 형식인지 확인 (이모지로 시작하면 스킵)
-            first_line = message.content.split('\n')[0]
-            if any(first_line.startswith(f"{emoji}제목:") for emoji in CATEGORY_EMOJI.values()):
-                skipped += 1
+
+def chunk_migration_messages(messages):
+    """LLM 한 번에 보낼 메시지 묶음 (개수와 총 글자 수 제한)"""
+    chunk = []
+    chunk_chars = 0
+    for message in messages:
+        if chunk and (len(chunk) >= MIGRATION_LLM_BATCH_SIZE
+                      or chunk_chars + len(message.content) > MIGRATION_LLM_BATCH_CHARS):
+            yield chunk
+            chunk = []
+            chunk_chars = 0
+        chunk.append(message)
+        chunk_chars += len(message.content)
+    if chunk:
+        yield chunk
+
+
+async def parse_migration_batch(messages, semaphore):
+    """메시지 묶음을 동시에 LLM으로 파싱 (동시 호출 수는 semaphore로 제한).
+
+    규칙 파서(legacy_parser)로 확실하게 읽히는 메시지는 LLM을 거치지 않는다.
+    이전에 파싱한 메시지는 GrokSearcher가 캐시된 결과를 돌려준다.
+    나머지는 여러 메시지를 한 요청에 묶어 보내고, 응답에서 빠지거나 형식이 잘못된 메시지만 단건으로 다시 파싱한다.
+    Grok 요청 오류로 파싱하지 못한 메시지는 스킵이 아니라 실패로 센다.
+
+    Returns:
+        (reviews, skipped, failed_ids, rule_parsed): failed_ids는 파싱에 실패한 message_id 목록
+    """
+    async def parse_one(message):
+        async with semaphore:
+            return await GrokSearcher.parse_legacy_review(message.content, message.author.display_name)
+
+    async def parse_chunk(chunk):
+        """[파싱 결과 dict, None(리뷰 아님) 또는 예외]"""
+        if len(chunk) == 1:
+            return await asyncio.gather(parse_one(chunk[0]), return_exceptions=True)
+
+        async with semaphore:
+            parsed = await GrokSearcher.parse_legacy_reviews_batch(
+                [(message.content, message.author.display_name) for message in chunk]
+            )
+        missing = [index for index in range(len(chunk)) if index not in parsed]
+        if missing:
+            retried = await asyncio.gather(*(parse_one(chunk[index]) for index in missing), return_exceptions=True)
+            parsed.update(zip(missing, retried))
+        return [parsed[index] for index in range(len(chunk))]
+
+    reviews = []
+    skipped = 0
+    failed_ids = []
+    llm_messages = []
+    for message in messages:
+        parsed, confidence = parse_legacy_review_rules(message.content)
+        review = build_migrated_review(message, parsed) if confidence >= LEGACY_PARSE_MIN_CONFIDENCE else None
+        if review is None:
+            llm_messages.append(message)
+        else:
+            reviews.append(review)
+    rule_parsed = len(reviews)
+
+    chunks = list(chunk_migration_messages(llm_messages))
+    results = await asyncio.gather(*(parse_chunk(chunk) for chunk in chunks), return_exceptions=True)
+
+    for chunk, chunk_result in zip(chunks, results):
+        if isinstance(chunk_result, Exception):
+            logger.info("[MIGRATION] ❌ 파싱 오류 (message_id=%s~): %s", chunk[0].id, chunk_result)
+            failed_ids.extend(message.id for message in chunk)
+            continue
+        for message, parsed in zip(chunk, chunk_result):
+            if isinstance(parsed, Exception):
+                logger.info("[MIGRATION] ❌ 파싱 오류 (message_id=%s): %s", message.id, parsed)
+                failed_ids.append(message.id)
                 continue
+            review = build_migrated_review(message, parsed)
+            if review is None:
+                skipped += 1
+            else:
+                reviews.append(review)
+    return reviews, skipped, failed_ids, rule_parsed
+
+
+def format_failed_migration_messages(channel, failed_ids):
+    """관리자에게 보여줄 실패 메시지 링크 목록 (MIGRATION_FAILED_REPORT_LIMIT개까지)"""
+    links = [
+        f"https://discord.com/channels/{channel.guild.id}/{channel.id}/{message_id}"
+        for message_id in failed_ids[:MIGRATION_FAILED_REPORT_LIMIT]
+    ]
+    if len(failed_ids) > len(links):
+        links.append(f"외 {len(failed_ids) - len(links)}개")
+    return "\n".join(links)
+
+
+@discord.app_commands.command(name="마이그레이션", description="[관리자] 채널의 레거시 리뷰 메시지를 DB로 마이그레이션합니다.")
+@discord.app_commands.default_permissions(administrator=True)
+@discord.app_commands.describe(
+    채널="마이그레이션할 채널",
+    메시지수="스캔할 메시지 수 (기본 100)",
+    처음부터="중단된 마이그레이션을 이어하지 않고 최신 메시지부터 다시 시작"
+)
+@traced("/마이그레이션")
+async def migration_command(
+    interaction: discord.Interaction,
+    채널: discord.TextChannel,
+    메시지수: int = 100,
+    처음부터: bool = False
+):
+    with span("discord.defer"):
+        await interaction.response.defer()
 
-            # LLM으로 파싱 시도
+    checkpoint = await bot.db.get_migration_checkpoint(채널.id)
+    resume = bool(checkpoint and checkpoint['status'] == 'running' and not 처음부터)
+
+    if resume:
+        # 이전 실행이 끝까지 가지 못했으면 마지막으로 저장된 메시지 다음부터 이어한다
+        target = checkpoint['target_count']
+        processed = checkpoint['processed']
+        rule_parsed = 0
+        migrated = checkpoint['migrated']
+        skipped = checkpoint['skipped']
+        failed_ids = list(checkpoint['failed_message_ids'] or [])
+        last_message_id = checkpoint['last_message_id']
+        start_text = f"⏩ {채널.mention} 채널 마이그레이션을 이어서 진행합니다. ({processed}/{target})"
+        if 메시지수 != target:
+            start_text += (
+                f"\nℹ️ 이어하기는 처음 실행한 메시지수({target})를 사용합니다. "
+                f"{메시지수}개로 바꾸려면 `처음부터`를 켜고 다시 실행하세요."
+            )
+    else:
+        target = 메시지수
+        processed = rule_parsed = migrated = skipped = 0
+        failed_ids = []
+        last_message_id = None
+        start_text = f"🔄 {채널.mention} 채널에서 최근 {메시지수}개 메시지를 스캔 중..."
+
+    progress_msg = await interaction.followup.send(start_text, wait=True)
+
+    semaphore = asyncio.Semaphore(MIGRATION_CONCURRENCY)
+    # 이번 실행에서 캐시로 재사용한 Grok 파싱 결과 수 (봇 전체 카운터 기준)
+    cache_hits_at_start = GrokSearcher.cache_stats()['hits']
+    before = discord.Object(id=last_message_id) if last_message_id else None
+    last_progress_at = 0.0
+
+    async def parse(batch):
+        candidates = [message for message in batch if is_migration_candidate(message)]
+        reviews, batch_skipped, batch_failed_ids, batch_rule_parsed = await parse_migration_batch(
+            candidates, semaphore
+        )
+        return reviews, batch_skipped + len(batch) - len(candidates), batch_failed_ids, batch_rule_parsed
+
+    async def retry_failed():
+        """이전 실행에서 실패한 메시지를 다시 파싱 (여전히 실패하면 목록에 남긴다)"""
+        nonlocal failed_ids
+        messages = []
+        still_failed = []
+        for message_id in failed_ids:
             try:
-                parsed = await GrokSearcher.parse_legacy_review(
-                    message.content,
-                    message.author.display_name
-                )
+                messages.append(await 채널.fetch_message(message_id))
+            except discord.NotFound:
+                # 지워진 메시지는 더 시도하지 않는다
+                continue
+            except discord.HTTPException as e:
+                logger.info("[MIGRATION] ❌ 실패 메시지 조회 오류 (message_id=%s): %s", message_id, e)
+                still_failed.append(message_id)
+        failed_ids = still_failed
+        if messages:
+            await commit(messages, processed, parse(messages), advance=False)
+
+    async def commit(batch, batch_processed, parsing, advance=True):
+        """파싱이 끝난 배치를 읽은 순서대로 저장하고 체크포인트를 남긴다.
+
+        파싱에 실패한 메시지는 failed_message_ids에 남기고 체크포인트는 계속 옮긴다
+        (이어하기에서 다시 시도하고, 끝나면 관리자에게 목록을 보여준다).
+        advance=False면 마지막 처리 위치는 그대로 둔다 (실패 메시지 재시도).
+        """
+        nonlocal rule_parsed, migrated, skipped, last_progress_at, last_message_id
+        reviews, batch_skipped, batch_failed_ids, batch_rule_parsed = await parsing
+        rule_parsed += batch_rule_parsed
+        skipped += batch_skipped
+        failed_ids.extend(batch_failed_ids)
+
+        saved = await bot.db.save_migrated_reviews_bulk(reviews)
+        if saved is None:
+            # 체크포인트를 남겨 두었으므로 다음 실행에서 이 배치부터 다시 시도
+            raise RuntimeError("리뷰 저장 실패")
+        migrated += saved
+        # 이미 저장된 message_id라 건너뛴 행
+        skipped += len(reviews) - saved
+        for review in reviews:
+            logger.info(
+                "[MIGRATION] ✅ %s (%s) - %s", review['movie_title'], review['category'], review['username']
+            )
 
-                if not parsed:
-                    skipped += 1
-                    continue
+        # history는 최신 → 과거 순이므로 배치의 마지막 메시지가 가장 오래된 메시지
+        if advance:
+            last_message_id = batch[-1].id
+        await bot.db.save_migration_checkpoint(
+            채널.id, last_message_id, target, batch_processed, migrated, skipped, len(failed_ids),
+            failed_message_ids=failed_ids
+        )
 
-                # 필수 필드 확인
-                title, parsed_season = split_title_season(parsed.get('title'))
-                score = parsed.get('score')
-                one_line = parsed.get('one_line_review')
-                category = parsed.get('category', 'movie')
-                season = parse_season_number(parsed.get('season')) or parsed_season
+        if time.monotonic() - last_progress_at >= MIGRATION_PROGRESS_INTERVAL:
+            last_progress_at = time.monotonic()
+            await progress_msg.edit(
+                content=f"🔄 스캔 중... ({batch_processed}/{target})\n"
+                        f"✅ 마이그레이션: {migrated} | ⏭️ 스킵: {skipped} | ❌ 실패: {len(failed_ids)}\n"
+                        f"⚡ 규칙 파싱(LLM 생략): {rule_parsed} | "
+                        f"💾 캐시: {GrokSearcher.cache_stats()['hits'] - cache_hits_at_start}"
+            )
 
-                if not title or score is None or not one_line:
-                    skipped += 1
-                    continue
+    # (배치, 배치까지 읽은 메시지 수, 파싱 task) - 파싱은 동시에, 저장은 읽은 순서대로
+    pending = deque()
 
-                # score를 float로 변환 및 범위 확인
-                try:
-                    score = float(score)
-                    score = max(0, min(5, score))
-                except (ValueError, TypeError):
-                    skipped += 1
-                    continue
-
-                # 카테고리 검증
-                if category not in CATEGORY_EMOJI:
-                    category = 'movie'
-
-                # DB 저장
-                review_id = bot.db.save_migrated_review(
-                    user_id=message.author.id,
-                    username=str(message.author),
-                    movie_title=title,
-                    movie_year=parsed.get('year'),
-                    director=parsed.get('director'),
-                    score=score,
-                    one_line_review=one_line,
-                    category=category,
-                    created_at=message.created_at,
-                    message_id=message.id,
-                    channel_id=message.channel.id,
-                    season=season
-                )
+    def start_parse(batch):
+        pending.append((batch, processed, asyncio.create_task(parse(batch))))
 
-                if review_id:
-                    migrated += 1
-                    print(f"[MIGRATION] ✅ {title} ({category}) - {message.author.display_name}")
-                else:
-                    failed += 1
+    try:
+        if not resume:
+            await bot.db.save_migration_checkpoint(채널.id, None, target, 0, 0, 0, 0)
+        elif failed_ids:
+            await retry_failed()
 
-            except Exception as e:
-                print(f"[MIGRATION] ❌ 파싱 오류: {e}")
-                failed += 1
-
-            # 10개마다 진행 상황 업데이트
-            if processed % 10 == 0:
-                await progress_msg.edit(
-                    content=f"🔄 스캔 중... ({processed}/{메시지수})\n"
-                            f"✅ 마이그레이션: {migrated} | ⏭️ 스킵: {skipped} | ❌ 실패: {failed}"
-                )
+        batch = []
+        async for message in 채널.history(limit=max(0, target - processed), before=before):
+            processed += 1
+            batch.append(message)
+            if len(batch) >= MIGRATION_BATCH_SIZE:
+                start_parse(batch)
+                batch = []
+                if len(pending) >= MIGRATION_PARSE_AHEAD:
+                    await commit(*pending.popleft())
+        if batch:
+            start_parse(batch)
+        while pending:
+            await commit(*pending.popleft())
 
     except Exception as e:
-        await interaction.followup.send(f"❌ 마이그레이션 중 오류 발생: {e}")
+        for _, _, parsing in pending:
+            parsing.cancel()
+        logger.error("[MIGRATION] 중단 (%s/%s): %s", processed, target, e)
+        await interaction.followup.send(
+            f"❌ 마이그레이션 중 오류 발생: {e}\n다시 실행하면 마지막으로 저장된 위치부터 이어합니다."
+        )
         return
 
+    await bot.db.save_migration_checkpoint(
+        채널.id, None, target, processed, migrated, skipped, len(failed_ids),
+        status='done', failed_message_ids=failed_ids
+    )
+
     # 최종 결과
     await progress_msg.edit(
         content=f"✅ **마이그레이션 완료**\n\n"
                 f"📊 총 스캔: {processed}개\n"
                 f"✅ 마이그레이션: {migrated}개\n"
                 f"⏭️ 스킵: {skipped}개\n"
-                f"❌ 실패: {failed}개"
+                f"❌ 실패: {len(failed_ids)}개\n"
+                f"⚡ 규칙 파싱(LLM 생략): {rule_parsed}개\n"
+                f"💾 이전 파싱 결과 재사용: {GrokSearcher.cache_stats()['hits'] - cache_hits_at_start}개"
     )
+    if failed_ids:
+        # 다시 실행하면 (캐시된 결과는 재사용하고) 실패한 메시지만 Grok에 다시 묻는다
+        await interaction.followup.send(
+            f"❌ 파싱에 실패한 메시지 {len(failed_ids)}개 (다시 실행하면 재시도합니다):\n"
+            f"{format_failed_migration_messages(채널, failed_ids)}",
+            ephemeral=True
+        )
 
 
 @discord.app_commands.command(name="리뷰랭킹", description="반응이 많은 인기 리뷰 TOP 10을 조회합니다.")
@@ -3674,11 +4215,13 @@ async def migration_command(interaction: discord.Interaction, 채널: discord.Te
     discord.app_commands.Choice(name="🎮 게임", value="game"),
     discord.app_commands.Choice(name="🎵 곡", value="music_track"),
 ])
+@traced("/리뷰랭킹")
 async def ranking_command(interaction: discord.Interaction, 카테고리: discord.app_commands.Choice[str] = None):
-    await interaction.response.defer()
+    with span("discord.defer"):
+        await interaction.response.defer()
 
     category = 카테고리.value if 카테고리 else None
-    rankings = bot.db.get_review_ranking(limit=10, category=category)
+    rankings = await bot.db.get_review_ranking(limit=10, category=category)
 
     if not rankings:
         await interaction.followup.send("📊 아직 반응이 달린 리뷰가 없습니다.", ephemeral=True)
@@ -3694,8 +4237,8 @@ async def ranking_command(interaction: discord.Interaction, 카테고리: discor
         emoji = CATEGORY_EMOJI.get(review['category'], '🎬')
         cat_name = CATEGORY_NAME.get(review['category'], '영화')
 
-        # Reaction breakdown
-        counts = bot.db.get_reaction_counts(review['id'])
+        # Reaction breakdown (get_review_ranking 쿼리에서 함께 조회)
+        counts = review.get('reaction_breakdown') or {}
         breakdown = " ".join(
             f"{REACTION_TYPES[rt]['emoji']}{cnt}"
             for rt, cnt in counts.items() if cnt > 0
@@ -3714,4 +4257,115 @@ async def ranking_command(interaction: discord.Interaction, 카테고리: discor
     await interaction.followup.send(embed=embed)
 
 
-bot.run(Token)
+# ==================== 봇 상태 ====================
+
+@discord.app_commands.command(name="봇상태", description="[관리자] DB 쿼리 지연 시간과 캐시 상태를 조회합니다.")
+@discord.app_commands.default_permissions(administrator=True)
+async def bot_status_command(interaction: discord.Interaction):
+    with span("discord.defer"):
+        await interaction.response.defer(ephemeral=True)
+
+    embed = discord.Embed(title="🩺 봇 상태", color=discord.Color.blurple())
+
+    # 느린 DB 메서드 (p95 기준 상위 8개)
+    snapshot = metrics.snapshot()
+    slow_methods = sorted(snapshot.items(), key=lambda item: item[1]['p95'], reverse=True)[:8]
+    if slow_methods:
+        lines = [
+            f"`{name}` {stats['calls']}회 | p50 {format_duration(stats['p50'])} "
+            f"p95 {format_duration(stats['p95'])} p99 {format_duration(stats['p99'])} | "
+            f"{stats['rows']}행" + (f" | ❌ {stats['errors']}회" if stats['errors'] else "")
+            for name, stats in slow_methods
+        ]
+        embed.add_field(name="🐢 DB 메서드 (p95 순)", value="\n".join(lines)[:1024], inline=False)
+
+    acquire = metrics.pool_acquire_summary()
+    pool_stats = await bot.db.get_pool_stats()
+    embed.add_field(
+        name="🔌 연결 풀",
+        value=(
+            f"사용 중 {pool_stats.get('in_use', 0)}/{pool_stats.get('max_size', 0)} | "
+            f"대기 {pool_stats.get('waits', 0)}회 | 타임아웃 {pool_stats.get('timeouts', 0)}회\n"
+            f"연결 획득 p50 {format_duration(acquire['p50'])} "
+            f"p95 {format_duration(acquire['p95'])} max {format_duration(acquire['max'])}"
+        ),
+        inline=False
+    )
+
+    cache_stats = metadata_cache.stats()
+    cache_lines = [
+        f"`{provider}` 적중률 {stats['hit_rate'] * 100:.0f}% "
+        f"({stats['hits'] + stats['coalesced'] + stats['l2_hits'] + stats['stale_hits']}/"
+        f"{stats['hits'] + stats['coalesced'] + stats['l2_hits'] + stats['stale_hits'] + stats['misses']})"
+        for provider, stats in sorted(cache_stats['providers'].items())
+    ]
+    embed.add_field(
+        name=f"🗂️ 메타데이터 캐시 ({cache_stats['entries']}개, {cache_stats['size_bytes'] // 1024}KB)",
+        value="\n".join(cache_lines)[:1024] or "기록 없음",
+        inline=False
+    )
+
+    image_stats = image_cache.stats()
+    embed.add_field(
+        name=f"🖼️ 이미지 캐시 ({image_stats['entries']}개, {image_stats['size_bytes'] // (1024 * 1024)}MB)",
+        value=(
+            f"적중률 {image_stats['hit_rate'] * 100:.0f}% | 다운로드 {image_stats['misses']}회 | "
+            f"정리 {image_stats['evictions']}개 | 오류 {image_stats['errors']}회"
+        ),
+        inline=False
+    )
+
+    await interaction.followup.send(embed=embed, ephemeral=True)
+
+
+
+@discord.app_commands.command(name="트레이스", description="[관리자] 최근 interaction 처리 구간별 소요 시간을 조회합니다.")
+@discord.app_commands.default_permissions(administrator=True)
+@discord.app_commands.describe(보기="조회할 trace 종류", 번호="상세 구간을 볼 trace 번호 (목록 기준, 기본 1)")
+@discord.app_commands.choices(보기=[
+    discord.app_commands.Choice(name="응답 지연/오류", value="flagged"),
+    discord.app_commands.Choice(name="느린 순", value="slow"),
+    discord.app_commands.Choice(name="최근", value="recent"),
+])
+async def trace_command(interaction: discord.Interaction, 보기: str = "flagged", 번호: int = 1):
+    await interaction.response.defer(ephemeral=True)
+
+    traces = trace_store.list(보기)
+    if 보기 != "slow":
+        traces = list(reversed(traces))
+    stats = trace_store.stats()
+
+    embed = discord.Embed(
+        title="🧭 Interaction Trace",
+        description=(
+            f"전체 {stats['total']}건 | 응답 지연/오류 {stats['flagged_total']}건 | "
+            f"보관 중: 샘플 {stats['recent']}건, 경고 {stats['flagged']}건"
+        ),
+        color=discord.Color.blurple()
+    )
+
+    if not traces:
+        embed.add_field(name="목록", value="기록된 trace가 없습니다.", inline=False)
+        await interaction.followup.send(embed=embed, ephemeral=True)
+        return
+
+    lines = []
+    for index, trace in enumerate(traces[:10], start=1):
+        flag = "⚠️" if trace.near_deadline else ("❌" if trace.error else "•")
+        lines.append(
+            f"{flag} `{index}` {trace.name} | 총 {format_seconds(trace.duration)} | "
+            f"응답 {format_seconds(trace.ack_latency)} | <t:{int(trace.started_at)}:R>"
+        )
+    embed.add_field(name="목록", value="\n".join(lines)[:1024], inline=False)
+
+    selected = traces[min(max(번호, 1), len(traces)) - 1]
+    detail = format_trace_waterfall(selected)
+    if selected.error:
+        detail += f"\n오류: {selected.error}"
+    embed.add_field(name="구간 상세", value=f"```\n{detail[:1000]}\n```", inline=False)
+
+    await interaction.followup.send(embed=embed, ephemeral=True)
+
+
+# 로깅은 setup_logging()에서 설정했으므로 discord.py 기본 핸들러는 붙이지 않는다
+bot.run(Token, log_handler=None)
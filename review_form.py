@@ -1,3 +1,5 @@
+import re
+
 SEASON_LABEL = {
     'drama': '시즌',
     'anime': '기',
@@ -15,6 +17,27 @@ def format_season(category, season):
     return f" {season}{label}"
 
 
+SEASON_NUMBER_PATTERN = re.compile(r'^\s*(\d+)\s*(시즌|기|부)?\s*$')
+TITLE_SEASON_PATTERN = re.compile(r'^(.+?)\s+(\d+)(시즌|기|부)$')
+
+
+def parse_season_number(value):
+    """'2', '2기', '2시즌', '2부' 값을 season 정수로 파싱."""
+    if value is None:
+        return None
+    match = SEASON_NUMBER_PATTERN.match(str(value))
+    return int(match.group(1)) if match else None
+
+
+def split_title_season(title, default_season=None):
+    """제목 끝의 시즌 표기를 분리."""
+    title = (title or "").strip()
+    match = TITLE_SEASON_PATTERN.match(title)
+    if match:
+        return match.group(1).strip(), int(match.group(2))
+    return title, default_season
+
+
 MOVIE_FORM = (
     "🎬제목: {title}{season_text}\n"
     "🎥감독: {director_name}\n"
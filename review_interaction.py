@@ -1,6 +1,10 @@
+import logging
+
 import discord
 from database import Database
 
+logger = logging.getLogger("bot.reactions")
+
 REACTION_TYPES = {
     'fire':     {'emoji': '\U0001f525', 'label': '존나 잘썼노', 'row': 0},
     'clap':     {'emoji': '\U0001f44f', 'label': '잘썼노', 'row': 0},
@@ -53,7 +57,7 @@ class ReviewReactionView(discord.ui.View):
     def _make_reaction_callback(self, rtype):
         async def callback(interaction: discord.Interaction):
             db = interaction.client.db
-            review = db.get_review_by_message_id(interaction.message.id)
+            review = await db.get_review_by_message_id(interaction.message.id)
             if not review:
                 await interaction.response.send_message(
                     "❌ 이 메시지에 연결된 리뷰를 찾을 수 없습니다.", ephemeral=True
@@ -97,13 +101,13 @@ class ReactionCommentModal(discord.ui.Modal):
 
         if comment:
             # Comment provided: ensure reaction (keep/add, no toggle)
-            action, _ = db.ensure_reaction(
+            action, _ = await db.ensure_reaction(
                 self.review['id'], interaction.user.id,
                 interaction.user.display_name, self.rtype
             )
         else:
             # No comment: toggle reaction (existing behavior)
-            action, _ = db.toggle_reaction(
+            action, _ = await db.toggle_reaction(
                 self.review['id'], interaction.user.id,
                 interaction.user.display_name, self.rtype
             )
@@ -115,7 +119,7 @@ class ReactionCommentModal(discord.ui.Modal):
             return
 
         # Update button counts
-        counts = db.get_reaction_counts(self.review['id'])
+        counts = await db.get_reaction_counts(self.review['id'])
         view = ReviewReactionView()
         view.update_counts(counts)
         await self.message.edit(view=view)
@@ -123,13 +127,13 @@ class ReactionCommentModal(discord.ui.Modal):
         # Handle comment if provided
         if comment:
             # Check if user already has a comment on this review
-            is_edit = db.has_user_comment(self.review['id'], interaction.user.id)
+            is_edit = await db.has_user_comment(self.review['id'], interaction.user.id)
             old_message_id = None
             if is_edit:
                 # Get old message id before deleting
-                old_message_id = db.get_user_comment_message_id(self.review['id'], interaction.user.id)
+                old_message_id = await db.get_user_comment_message_id(self.review['id'], interaction.user.id)
                 # Delete old comment from DB
-                db.delete_user_comment(self.review['id'], interaction.user.id)
+                await db.delete_user_comment(self.review['id'], interaction.user.id)
 
             try:
                 # Check if thread already exists
@@ -157,7 +161,7 @@ class ReactionCommentModal(discord.ui.Modal):
                     except discord.NotFound:
                         pass  # Message already deleted
                     except Exception as e:
-                        print(f"[WARN] Failed to delete old comment message: {e}")
+                        logger.warning("Failed to delete old comment message: %s", e)
 
                 # Send the comment with reaction info
                 sent_msg = await thread.send(
@@ -165,7 +169,7 @@ class ReactionCommentModal(discord.ui.Modal):
                 )
 
                 # Save comment to DB with thread_message_id
-                db.add_comment(
+                await db.add_comment(
                     self.review['id'], interaction.user.id,
                     interaction.user.display_name, comment, sent_msg.id
                 )
@@ -189,7 +193,7 @@ class ReactionCommentModal(discord.ui.Modal):
                     ephemeral=True
                 )
             except Exception as e:
-                print(f"[ERROR] ReactionCommentModal thread: {e}")
+                logger.error("ReactionCommentModal thread: %s", e)
                 action_msgs = {'added': '추가', 'kept': '유지', 'changed': '변경'}
                 action_msg = action_msgs.get(action, '처리')
                 await interaction.followup.send(
@@ -0,0 +1,208 @@
+import logging
+import re
+import threading
+import unicodedata
+from bisect import bisect_left, insort
+
+logger = logging.getLogger("bot.titles")
+
+# trigram 유사도가 이 값보다 낮으면 후보에서 제외
+TITLE_MIN_SIMILARITY = 0.3
+
+_SEPARATORS = re.compile(r"[\W_]+")
+
+
+def normalize_title(title):
+    """검색 키: 대소문자/전각/공백/구두점 차이를 무시한다. ('귀멸의 칼날: 무한열차' → '귀멸의칼날무한열차')"""
+    if not title:
+        return ""
+    return _SEPARATORS.sub("", unicodedata.normalize("NFKC", title).lower())
+
+
+def trigrams(key):
+    if len(key) < 3:
+        return {key} if key else set()
+    return {key[i:i + 3] for i in range(len(key) - 2)}
+
+
+class TitleIndex:
+    """contents.title 자동완성용 메모리 인덱스 (prefix + trigram).
+
+    시작할 때 Database.load_title_index()로 채우고, 이후에는 작품/리뷰 쓰기 메서드가
+    바로 갱신한다. 쓰기는 DB 스레드, 검색은 이벤트 루프에서 일어나므로 락으로 보호한다.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._contents = {}       # content_id -> (title, category, key, trigram 수)
+        self._keys = []           # (key, content_id) 정렬 목록 (prefix 검색용)
+        self._grams = {}          # trigram -> {content_id}
+        self._user_reviews = {}   # user_id -> {content_id: 리뷰 수} (최근 리뷰한 작품이 뒤)
+        self.loaded = False
+
+    def __len__(self):
+        return len(self._contents)
+
+    def load(self, contents, user_reviews):
+        """
+        Args:
+            contents: (content_id, title, category) 목록
+            user_reviews: (user_id, content_id, 리뷰 수) 목록 (오래된 순)
+        """
+        with self._lock:
+            self._contents = {}
+            self._keys = []
+            self._grams = {}
+            self._user_reviews = {}
+            for content_id, title, category in contents:
+                self._add_content(content_id, title, category, sort=False)
+            self._keys.sort()
+            for user_id, content_id, count in user_reviews:
+                self._user_reviews.setdefault(user_id, {})[content_id] = count
+            self.loaded = True
+        logger.info("제목 인덱스 로드 - 작품 %s개, 유저 %s명", len(self._contents), len(self._user_reviews))
+
+    def add_content(self, content_id, title, category):
+        if content_id is None or not title:
+            return
+        with self._lock:
+            self._add_content(content_id, title, category)
+
+    def _add_content(self, content_id, title, category, sort=True):
+        """락을 잡은 상태에서 호출. 이미 있는 작품은 무시한다."""
+        if content_id in self._contents:
+            return
+        key = normalize_title(title)
+        grams = trigrams(key)
+        self._contents[content_id] = (title, category, key, len(grams))
+        if sort:
+            insort(self._keys, (key, content_id))
+        else:
+            self._keys.append((key, content_id))
+        for gram in grams:
+            self._grams.setdefault(gram, set()).add(content_id)
+
+    def add_review(self, user_id, content_id, title=None, category=None):
+        if content_id is None:
+            return
+        with self._lock:
+            if title:
+                self._add_content(content_id, title, category)
+            reviews = self._user_reviews.setdefault(user_id, {})
+            reviews[content_id] = reviews.pop(content_id, 0) + 1
+
+    def remove_review(self, user_id, content_id):
+        if content_id is None:
+            return
+        with self._lock:
+            reviews = self._user_reviews.get(user_id)
+            if not reviews or content_id not in reviews:
+                return
+            reviews[content_id] -= 1
+            if reviews[content_id] <= 0:
+                del reviews[content_id]
+
+    def search(self, query, user_id=None, category=None, limit=25):
+        """입력 중인 제목과 비슷한 작품 목록.
+
+        Args:
+            user_id: 주어지면 해당 유저가 리뷰한 작품만
+            category: 주어지면 해당 카테고리만
+
+        Returns:
+            list: [(title, category)] 정확히 일치 > 앞부분 일치 > 포함 > trigram 유사도 순
+        """
+        key = normalize_title(query)
+        with self._lock:
+            pool = None
+            if user_id is not None:
+                pool = self._user_reviews.get(user_id, {})
+                if not pool:
+                    return []
+
+            def allowed(content_id):
+                if pool is not None and content_id not in pool:
+                    return False
+                # 제목 없이 add_review된 작품은 인덱스에 없으므로 건너뛴다
+                content = self._contents.get(content_id)
+                if content is None:
+                    return False
+                return category is None or content[1] == category
+
+            if not key:
+                # 입력 전: 유저는 최근 리뷰한 작품, 전체는 가나다순
+                ids = reversed(list(pool)) if pool is not None else (cid for _, cid in self._keys)
+                results = []
+                for content_id in ids:
+                    if len(results) >= limit:
+                        break
+                    if allowed(content_id):
+                        results.append(self._contents[content_id][:2])
+                return results
+
+            scores = {}
+            start = bisect_left(self._keys, (key,))
+            for other_key, content_id in self._keys[start:]:
+                if not other_key.startswith(key):
+                    break
+                if allowed(content_id):
+                    scores[content_id] = 3.0 if other_key == key else 2.0
+
+            query_grams = trigrams(key)
+            if len(key) < 3:
+                # trigram이 없는 짧은 입력은 포함 여부로만 판단
+                candidates = pool if pool is not None else self._contents
+                for content_id in candidates:
+                    if content_id not in scores and allowed(content_id) and key in self._contents[content_id][2]:
+                        scores[content_id] = 1.5
+            else:
+                shared = {}
+                for gram in query_grams:
+                    for content_id in self._grams.get(gram, ()):
+                        shared[content_id] = shared.get(content_id, 0) + 1
+                for content_id, count in shared.items():
+                    if content_id in scores or not allowed(content_id):
+                        continue
+                    _, _, other_key, other_grams = self._contents[content_id]
+                    if key in other_key:
+                        scores[content_id] = 1.5
+                        continue
+                    similarity = count / (len(query_grams) + other_grams - count)
+                    if similarity >= TITLE_MIN_SIMILARITY:
+                        scores[content_id] = similarity
+
+            ranked = sorted(
+                scores.items(),
+                key=lambda item: (-item[1], len(self._contents[item[0]][0]), self._contents[item[0]][0])
+            )
+            return [self._contents[content_id][:2] for content_id, _ in ranked[:limit]]
+
+    def stats(self):
+        with self._lock:
+            return {
+                'contents': len(self._contents),
+                'users': len(self._user_reviews),
+                'loaded': self.loaded,
+            }
+
+
+def _self_test():
+    """마이그레이션 직후 유저 자동완성 확인: python title_index.py (실패하면 AssertionError)"""
+    index = TitleIndex()
+    index.load([(1, "인터스텔라", "movie"), (2, "기생충", "movie")], [(10, 1, 1)])
+
+    # save_migrated_reviews_bulk: 연결된 작품은 제목/카테고리와 함께, 예전 호출처럼 제목 없이 들어온 작품도 섞음
+    index.add_review(10, 2, "기생충", "movie")
+    index.add_review(10, 3, "귀멸의 칼날", "anime")
+    index.add_review(10, 4)
+
+    assert index.search("", user_id=10) == [("귀멸의 칼날", "anime"), ("기생충", "movie"), ("인터스텔라", "movie")]
+    assert index.search("기", user_id=10) == [("기생충", "movie")]
+    assert index.search("귀멸의", user_id=10, category="anime") == [("귀멸의 칼날", "anime")]
+    assert index.search("인터스텔라", user_id=10, category="drama") == []
+    assert index.search("", user_id=99) == []
+    print("✅ 제목 인덱스 확인 완료")
+
+
+if __name__ == "__main__":
+    _self_test()
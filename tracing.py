@@ -0,0 +1,306 @@
+import contextvars
+import functools
+import logging
+import os
+import random
+import threading
+import time
+from collections import deque
+
+logger = logging.getLogger("bot.trace")
+
+TRACE_SAMPLE_RATE = float(os.getenv("TRACE_SAMPLE_RATE", "0.2"))
+TRACE_BUFFER_SIZE = int(os.getenv("TRACE_BUFFER_SIZE", "100"))
+# Discord는 3초 안에 응답(defer/send_message/send_modal)하지 않으면 interaction을 만료시킨다
+INTERACTION_DEADLINE = 3.0
+TRACE_DEADLINE_WARN = float(os.getenv("TRACE_DEADLINE_WARN", "2.5"))
+# 한 trace에 기록할 최대 span 수 (마이그레이션처럼 긴 작업 보호용)
+MAX_SPANS_PER_TRACE = 500
+
+_current_trace = contextvars.ContextVar("current_trace", default=None)
+_current_depth = contextvars.ContextVar("current_span_depth", default=0)
+
+
+class Span:
+    __slots__ = ("name", "start", "duration", "depth", "attrs", "error")
+
+    def __init__(self, name, start, depth, attrs):
+        self.name = name
+        self.start = start
+        self.duration = None
+        self.depth = depth
+        self.attrs = attrs
+        self.error = None
+
+
+class Trace:
+    """interaction 하나의 처리 과정 (span 목록 + 응답 시점)."""
+
+    def __init__(self, name, interaction=None):
+        self.name = name
+        self.interaction = interaction
+        self.user = str(interaction.user) if interaction is not None else None
+        self.started_at = time.time()
+        self._start = time.perf_counter()
+        # interaction 생성(Discord 서버 기준)부터 봇이 처리를 시작하기까지의 지연
+        self.received_lag = 0.0
+        if interaction is not None:
+            self.received_lag = max(0.0, self.started_at - interaction.created_at.timestamp())
+        self.ack_offset = None
+        self.duration = None
+        self.error = None
+        self.spans = []
+        self.dropped_spans = 0
+        self.finished = False
+        self._lock = threading.Lock()
+
+    def elapsed(self):
+        return time.perf_counter() - self._start
+
+    def check_ack(self):
+        """interaction 응답이 끝났으면 그 시점을 기록 (span 경계마다 확인)."""
+        if self.ack_offset is not None or self.interaction is None:
+            return
+        try:
+            if self.interaction.response.is_done():
+                self.ack_offset = self.elapsed()
+        except Exception:
+            pass
+
+    def add_span(self, span):
+        with self._lock:
+            if self.finished:
+                return False
+            if len(self.spans) >= MAX_SPANS_PER_TRACE:
+                self.dropped_spans += 1
+                return False
+            self.spans.append(span)
+            return True
+
+    @property
+    def ack_latency(self):
+        """interaction 생성부터 첫 응답까지 걸린 시간 (응답 시점을 모르면 None)."""
+        if self.ack_offset is None:
+            return None
+        return self.received_lag + self.ack_offset
+
+    @property
+    def near_deadline(self):
+        latency = self.ack_latency
+        return latency is not None and latency >= TRACE_DEADLINE_WARN
+
+    def summary(self):
+        return {
+            'name': self.name,
+            'user': self.user,
+            'started_at': self.started_at,
+            'duration': self.duration,
+            'received_lag': self.received_lag,
+            'ack_latency': self.ack_latency,
+            'near_deadline': self.near_deadline,
+            'error': self.error,
+            'span_count': len(self.spans),
+        }
+
+
+class TraceStore:
+    """완료된 trace 링 버퍼. 샘플링된 trace와 경고 trace를 따로 보관한다."""
+
+    def __init__(self, size=TRACE_BUFFER_SIZE):
+        self._lock = threading.Lock()
+        self.recent = deque(maxlen=size)
+        self.flagged = deque(maxlen=size)
+        self.total = 0
+        self.flagged_total = 0
+
+    def add(self, trace, sampled):
+        with self._lock:
+            self.total += 1
+            if trace.near_deadline or trace.error:
+                self.flagged_total += 1
+                self.flagged.append(trace)
+            if sampled:
+                self.recent.append(trace)
+
+    def list(self, kind="recent"):
+        with self._lock:
+            if kind == "flagged":
+                return list(self.flagged)
+            if kind == "slow":
+                traces = {id(t): t for t in list(self.recent) + list(self.flagged)}
+                return sorted(traces.values(), key=lambda t: t.duration or 0, reverse=True)
+            return list(self.recent)
+
+    def stats(self):
+        with self._lock:
+            return {
+                'total': self.total,
+                'flagged_total': self.flagged_total,
+                'recent': len(self.recent),
+                'flagged': len(self.flagged),
+            }
+
+
+trace_store = TraceStore()
+
+
+def current_trace():
+    return _current_trace.get()
+
+
+class span:
+    """현재 trace에 구간을 기록하는 컨텍스트 매니저 (with / async with 모두 가능).
+
+    진행 중인 trace가 없으면 아무것도 하지 않는다.
+    """
+
+    def __init__(self, name, **attrs):
+        self.name = name
+        self.attrs = attrs
+        self._trace = None
+        self._span = None
+        self._depth_token = None
+
+    def set(self, **attrs):
+        if self._span is not None:
+            self._span.attrs.update(attrs)
+
+    def __enter__(self):
+        trace = _current_trace.get()
+        if trace is None or trace.finished:
+            return self
+        trace.check_ack()
+        depth = _current_depth.get()
+        self._span = Span(self.name, trace.elapsed(), depth, self.attrs)
+        if not trace.add_span(self._span):
+            self._span = None
+            return self
+        self._trace = trace
+        self._depth_token = _current_depth.set(depth + 1)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if self._span is None:
+            return False
+        self._span.duration = self._trace.elapsed() - self._span.start
+        if exc_type is not None:
+            self._span.error = exc_type.__name__
+        try:
+            _current_depth.reset(self._depth_token)
+        except ValueError:
+            # aiohttp trace 콜백처럼 다른 컨텍스트에서 끝나는 경우
+            pass
+        self._trace.check_ack()
+        return False
+
+    async def __aenter__(self):
+        return self.__enter__()
+
+    async def __aexit__(self, exc_type, exc, tb):
+        return self.__exit__(exc_type, exc, tb)
+
+
+def _find_interaction(args):
+    for arg in args:
+        # discord.Interaction (database 등에서 discord를 import하지 않도록 속성으로 판별)
+        if hasattr(arg, 'response') and hasattr(arg, 'created_at'):
+            return arg
+    return None
+
+
+def traced(name):
+    """slash command / modal / 버튼 콜백 전체를 하나의 trace로 기록하는 데코레이터."""
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            parent = _current_trace.get()
+            if parent is not None and not parent.finished:
+                return await func(*args, **kwargs)
+
+            trace = Trace(name, _find_interaction(args))
+            token = _current_trace.set(trace)
+            depth_token = _current_depth.set(0)
+            try:
+                return await func(*args, **kwargs)
+            except Exception as e:
+                trace.error = f"{type(e).__name__}: {e}"
+                raise
+            finally:
+                trace.check_ack()
+                trace.duration = trace.elapsed()
+                with trace._lock:
+                    trace.finished = True
+                # 링 버퍼가 discord 객체를 붙잡고 있지 않도록
+                trace.interaction = None
+                _current_depth.reset(depth_token)
+                _current_trace.reset(token)
+                _finish_trace(trace)
+        return wrapper
+    return decorator
+
+
+def _finish_trace(trace):
+    sampled = random.random() < TRACE_SAMPLE_RATE
+    trace_store.add(trace, sampled)
+    if trace.near_deadline:
+        slowest = sorted(trace.spans, key=lambda s: s.duration or 0, reverse=True)[:3]
+        slowest_text = ", ".join(f"{s.name}={format_seconds(s.duration)}" for s in slowest)
+        logger.warning(
+            "%s 응답 지연 %s (수신 지연 %s, 마감 %.0fs) - %s",
+            trace.name,
+            format_seconds(trace.ack_latency),
+            format_seconds(trace.received_lag),
+            INTERACTION_DEADLINE,
+            slowest_text or 'span 없음'
+        )
+
+
+def format_seconds(seconds):
+    if seconds is None:
+        return "-"
+    if seconds >= 1:
+        return f"{seconds:.2f}s"
+    return f"{seconds * 1000:.0f}ms"
+
+
+def format_trace_waterfall(trace, limit=25):
+    """span 목록을 시작 시각 순 텍스트로 변환 (관리자 명령어 출력용)."""
+    lines = [
+        f"{trace.name} 총 {format_seconds(trace.duration)} | "
+        f"수신 지연 {format_seconds(trace.received_lag)} | "
+        f"응답 {format_seconds(trace.ack_latency)}"
+    ]
+    spans = sorted(trace.spans, key=lambda s: s.start)
+    for s in spans[:limit]:
+        attrs = " ".join(f"{k}={v}" for k, v in s.attrs.items())
+        error = f" !{s.error}" if s.error else ""
+        lines.append(
+            f"{format_seconds(s.start):>7} +{format_seconds(s.duration):>6} "
+            f"{'  ' * s.depth}{s.name} {attrs}{error}".rstrip()
+        )
+    hidden = len(spans) - limit + trace.dropped_spans
+    if hidden > 0:
+        lines.append(f"... span {hidden}개 생략")
+    return "\n".join(lines)
+
+
+def http_trace_config():
+    """aiohttp 요청마다 span을 남기는 TraceConfig."""
+    import aiohttp
+
+    async def on_request_start(session, ctx, params):
+        ctx.span = span("http", method=params.method, host=params.url.host)
+        ctx.span.__enter__()
+
+    async def on_request_end(session, ctx, params):
+        ctx.span.set(status=params.response.status)
+        ctx.span.__exit__(None, None, None)
+
+    async def on_request_exception(session, ctx, params):
+        ctx.span.__exit__(type(params.exception), params.exception, None)
+
+    config = aiohttp.TraceConfig()
+    config.on_request_start.append(on_request_start)
+    config.on_request_end.append(on_request_end)
+    config.on_request_exception.append(on_request_exception)
+    return config